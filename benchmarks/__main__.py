@@ -0,0 +1,83 @@
+"""Run the benchmark suite, optionally saving and comparing its results.
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline main.json --tolerance 1.5
+
+Only the median timings are compared, and the suite fails when one of them
+got slower than the baseline by more than the tolerance factor.
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from .utils import RESULTS
+
+BENCHMARKS = [
+    "script_cache",
+    "codegen",
+    "registry_backend",
+    "import_time",
+    "engine_startup",
+    "config_loading",
+    "config_layers",
+    "task_index",
+    "registry_paths",
+    "schema",
+    "daemon",
+    "engine",
+]
+# differences below this are noise, whatever their ratio
+MIN_REGRESSION_MS = 0.05
+
+
+def medians(results: dict[str, Any], prefix: str = "") -> Iterator[tuple[str, float]]:
+    for key, value in results.items():
+        if isinstance(value, dict):
+            if "median_ms" in value:
+                yield f"{prefix}{key}", value["median_ms"]
+            else:
+                yield from medians(value, f"{prefix}{key}.")
+
+
+def regressions(
+    baseline: dict[str, Any], results: dict[str, Any], tolerance: float
+) -> list[str]:
+    baseline_medians = dict(medians(baseline))
+    return [
+        f"{name}: {baseline_medians[name]} ms -> {median} ms"
+        for name, median in medians(results)
+        if name in baseline_medians
+        and median > baseline_medians[name] * tolerance
+        and median - baseline_medians[name] > MIN_REGRESSION_MS
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("names", nargs="*", help=f"any of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--output", type=Path, help="save the results as JSON")
+    parser.add_argument("--baseline", type=Path, help="results to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    args = parser.parse_args()
+    if unknown := set(args.names) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    for name in args.names or BENCHMARKS:
+        importlib.import_module(f"{__package__}.{name}").main()
+    if args.output:
+        args.output.write_text(json.dumps(RESULTS, indent=2) + "\n")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if slower := regressions(baseline, RESULTS, args.tolerance):
+            print(f"Slower than {args.baseline} by more than {args.tolerance}x:")
+            print("\n".join(f"  {line}" for line in slower))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import sys
+import tempfile
+from pathlib import Path
+
+from winconfig.config.action import ActionMode, ExecutableActionMode
+from winconfig.config.definition import HELPERS_PRELUDE
+from winconfig.engine import Engine
+from winconfig.engine.batch import BatchEntry, generate_batch_script
+from winconfig.engine.task import Task
+
+from .utils import measure, report
+
+MODES: list[ExecutableActionMode] = [ActionMode.APPLY, ActionMode.REVERT]
+
+
+def batch_script(tasks: list[Task], *, compact: bool) -> str:
+    return generate_batch_script(
+        [
+            BatchEntry(
+                name=f"{task.full_name}[{mode}]",
+                script=task.generate_script(mode, compact=compact),
+            )
+            for task in tasks
+            for mode in MODES
+        ],
+        prelude=HELPERS_PRELUDE if compact else "",
+    )
+
+
+def parse_time(script: str) -> float | None:
+    """Milliseconds PowerShell takes to parse the script, if it is available."""
+    if sys.platform != "win32":
+        return None
+    from winconfig.engine.executor import create_powershell_executor  # noqa: PLC0415
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "script.ps1"
+        path.write_text(script, encoding="utf-8-sig")
+        output = create_powershell_executor().run(f"""
+            $elapsed = Measure-Command {{
+                [System.Management.Automation.Language.Parser]::ParseFile('{path}', [ref]$null, [ref]$null) | Out-Null
+            }}
+            $elapsed.TotalMilliseconds
+        """)
+    return round(float(output), 4)
+
+
+def main() -> None:
+    tasks = [task for task_group in Engine().task_groups for task in task_group.tasks]
+    results = {}
+    for name, compact in (("full", False), ("compact", True)):
+        script = batch_script(tasks, compact=compact)
+        results[name] = {
+            "bytes": len(script.encode()),
+            "item_bytes": sum(
+                len(
+                    item.generate_compact_script(mode)
+                    if compact
+                    else item.generate_set_script(mode)
+                )
+                for task in tasks
+                for item in task.items
+                for mode in MODES
+            ),
+            "lines": len(script.splitlines()),
+            "generate": measure(lambda c=compact: batch_script(tasks, compact=c)),
+            "parse_ms": parse_time(script),
+        }
+    report("codegen", results)
+
+
+if __name__ == "__main__":
+    main()
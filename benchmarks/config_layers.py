@@ -0,0 +1,53 @@
+import itertools
+from pathlib import Path
+
+from winconfig.config.action import ActionMode
+from winconfig.config.config import Config
+from winconfig.config.layers import LayeredConfig
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+from .utils import measure, report
+
+LAYERS = 30
+
+
+def layer_configs(builtin: Config) -> list[tuple[Path, Config]]:
+    modes = itertools.cycle([ActionMode.APPLY, ActionMode.REVERT])
+    return [
+        (
+            Path(f"layer{i:02}.yaml"),
+            Config.model_validate(
+                {
+                    "Actions": {
+                        group_name: {name: next(modes) for name in group}
+                        for group_name, group in builtin.definition_config.root.items()
+                    }
+                }
+            ),
+        )
+        for i in range(LAYERS)
+    ]
+
+
+def main() -> None:
+    builtin = Config.from_yaml(BUILTIN_DEFINITION_PATH)
+    layers = [(BUILTIN_DEFINITION_PATH, builtin), *layer_configs(builtin)]
+    configs = [config for _, config in layers]
+    layered = LayeredConfig(layers)
+    edited_path, edited = layers[LAYERS // 2]
+    report(
+        "config_layers",
+        {
+            "layers": LAYERS,
+            "full_merge": measure(lambda: configs[0].merge(*configs[1:])),
+            "layered_build": measure(lambda: LayeredConfig(layers)),
+            "edit_one_layer": measure(lambda: layered.set_layer(edited_path, edited)),
+            "sources_lookup": measure(
+                lambda: layered.action_sources("Taskbar", "HideSearch"), number=1000
+            ),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import json
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from winconfig.config.config import Config
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+from .utils import measure, report
+
+LARGE_COPIES = 20
+LAYERS = 100
+
+
+def write_configs(directory: Path) -> tuple[Path, list[Path]]:
+    builtin = yaml.safe_load(BUILTIN_DEFINITION_PATH.read_text())
+    # copied so the dump repeats them instead of using aliases
+    definitions = {
+        f"{group_name}{i}": json.loads(json.dumps(group))
+        for i in range(LARGE_COPIES)
+        for group_name, group in builtin["Definitions"].items()
+    }
+    large_path = directory / "large.yaml"
+    large_path.write_text(yaml.safe_dump({"Definitions": definitions}))
+
+    layer_paths = []
+    for i, (group_name, group) in enumerate(list(definitions.items())[:LAYERS]):
+        path = directory / f"layer{i:03}.yaml"
+        actions = {group_name: dict.fromkeys(group, "apply")}
+        path.write_text(yaml.safe_dump({"Actions": actions}))
+        layer_paths.append(path)
+    return large_path, layer_paths
+
+
+def load_pure_python(paths: list[Path]) -> list[Config]:
+    return [
+        Config.model_validate(yaml.load(path.read_text(), Loader=yaml.SafeLoader))
+        for path in paths
+    ]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        large_path, layer_paths = write_configs(Path(directory))
+        results = {}
+        for name, paths in (("large_file", [large_path]), ("layers", layer_paths)):
+            results[name] = {
+                "files": len(paths),
+                "bytes": sum(path.stat().st_size for path in paths),
+                "pure_python": measure(lambda p=paths: load_pure_python(p), repeat=5),
+                "loader": measure(lambda p=paths: Config.from_yaml_files(p), repeat=5),
+            }
+        report("config_loading", results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from winconfig.daemon.client import DaemonClient
+from winconfig.daemon.server import DaemonServer
+from winconfig.engine import Engine
+from winconfig.exceptions import DaemonNotRunningError
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+from .utils import measure, report
+
+
+def cold_plan() -> None:
+    # a new interpreter, as every `winconfig plan` invocation starts one
+    subprocess.run(  # noqa: S603
+        [sys.executable, "-m", "winconfig.cli.main", "plan", BUILTIN_DEFINITION_PATH],
+        check=True,
+        capture_output=True,
+    )
+
+
+def remote_plan(address: str) -> None:
+    subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            *("-m", "winconfig.cli.main", "remote", "plan", "--address", address),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        address = str(Path(directory) / "daemon.sock")
+        server = DaemonServer(
+            Engine(BUILTIN_DEFINITION_PATH), [BUILTIN_DEFINITION_PATH], address=address
+        )
+        thread = threading.Thread(target=server.serve)
+        thread.start()
+        client = DaemonClient(address)
+        while True:
+            try:
+                client.request("ping")
+                break
+            except DaemonNotRunningError:
+                time.sleep(0.01)
+        try:
+            report(
+                "daemon",
+                {
+                    "cold_cli_plan": measure(cold_plan, repeat=5),
+                    "remote_cli_plan": measure(lambda: remote_plan(address), repeat=5),
+                    "client_plan_request": measure(lambda: client.request("plan")),
+                },
+            )
+        finally:
+            client.request("stop")
+            thread.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from winconfig.config.action import ActionMode
+from winconfig.config.config import Config
+from winconfig.engine import Engine
+from winconfig.engine.script_cache import ScriptCache
+from winconfig.engine.selection import TaskSelection
+from winconfig.engine.task import Task
+
+from .simulated import SimulatedExecutor
+from .task_index import rebuilt_task_groups
+from .utils import measure, report
+
+JOBS = 4
+# a targeted rollout of a few tasks, against running all of them
+SELECTION = TaskSelection(tags=["privacy"])
+
+
+def apply_everything(engine: Engine) -> None:
+    """Add a layer applying every task, as the builtin definitions set none."""
+    actions = {
+        task_group.name: dict.fromkeys(
+            (task.name for task in task_group.tasks), ActionMode.APPLY
+        )
+        for task_group in engine.task_groups
+    }
+    engine.layers.set_layer(
+        Path("apply-everything.yaml"), Config.model_validate({"Actions": actions})
+    )
+
+
+def generate_all(tasks: list[Task]) -> None:
+    for task in tasks:
+        for mode in (ActionMode.APPLY, ActionMode.REVERT):
+            task.generate_script(mode)
+
+
+def run(engine: Engine, **options: object) -> None:
+    # a new cache per run, so generating the scripts is part of it
+    engine.script_cache = ScriptCache()
+    engine.run(reverse=False, **options)  # ty:ignore[invalid-argument-type]
+
+
+def main() -> None:
+    engine = Engine(executor_factory=SimulatedExecutor, hooks=[], config_cache=None)
+    apply_everything(engine)
+    tasks = [task for task_group in engine.task_groups for task in task_group.tasks]
+    invocations = SimulatedExecutor()
+    engine.executor_factory = lambda: invocations
+    run(engine)
+    engine.executor_factory = SimulatedExecutor
+    selected = engine.select(SELECTION)
+
+    report(
+        "engine",
+        {
+            "tasks": len(tasks),
+            "invocations_sequential": invocations.invocations,
+            "selected_tasks": len(selected),
+            "config_load": measure(lambda: Engine(config_cache=None, hooks=[])),
+            # built anew every time, as the engine keeps them until the config changes
+            "task_groups": measure(lambda: rebuilt_task_groups(engine)),
+            "generate_all": measure(lambda: generate_all(tasks)),
+            "select": measure(lambda: engine.select(SELECTION), number=100),
+            "run_sequential": measure(lambda: run(engine), repeat=3),
+            "run_selected": measure(lambda: run(engine, tasks=selected), repeat=3),
+            "run_batch": measure(lambda: run(engine, batch=True), repeat=3),
+            "run_parallel": measure(lambda: run(engine, jobs=JOBS), repeat=3),
+            "run_parallel_batch": measure(
+                lambda: run(engine, jobs=JOBS, batch=True), repeat=3
+            ),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import tempfile
+from pathlib import Path
+
+from winconfig.config.cache import ConfigCache
+from winconfig.engine import Engine
+
+from .utils import measure, report
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        warm_cache = ConfigCache(Path(directory) / "warm")
+        Engine(config_cache=warm_cache)
+        report(
+            "engine_startup",
+            {
+                "uncached": measure(lambda: Engine(config_cache=None)),
+                "cold_cache": measure(
+                    lambda: Engine(
+                        config_cache=ConfigCache(Path(tempfile.mkdtemp(dir=directory)))
+                    )
+                ),
+                "warm_cache": measure(lambda: Engine(config_cache=warm_cache)),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
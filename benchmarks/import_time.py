@@ -0,0 +1,42 @@
+import re
+import statistics
+import subprocess
+import sys
+
+from .utils import report
+
+MODULES = ["winconfig.cli.main", "winconfig.engine", "winconfig.gui.app"]
+REPEAT = 5
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module, like -X importtime."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)", line)
+        if match:
+            times[match[2]] = int(match[1])
+    return times
+
+
+def main() -> None:
+    results = {}
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(REPEAT)]
+        totals = [times[module] / 1000 for times in runs]
+        results[module] = {
+            "min_ms": round(min(totals), 4),
+            "median_ms": round(statistics.median(totals), 4),
+            "modules": len(runs[-1]),
+        }
+    report("import_time", results)
+
+
+if __name__ == "__main__":
+    main()
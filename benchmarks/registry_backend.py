@@ -0,0 +1,42 @@
+from winconfig.config.action import ActionMode, ExecutableActionMode
+from winconfig.engine import Engine
+from winconfig.engine.registry import (
+    InMemoryRegistry,
+    is_registry_item,
+    registry_states,
+    registry_writes,
+)
+
+from .utils import measure, report
+
+
+def main() -> None:
+    tasks = [task for task_group in Engine().task_groups for task in task_group.tasks]
+    items = [item for task in tasks for item in task.items if is_registry_item(item)]
+    registry = InMemoryRegistry()
+
+    def write(mode: ExecutableActionMode) -> None:
+        for task in tasks:
+            registry.write_keys(
+                registry_writes([e for e in task.items if is_registry_item(e)], mode)
+            )
+
+    def generate_scripts(mode: ExecutableActionMode) -> None:
+        for item in items:
+            item.generate_set_script(mode)
+
+    report(
+        "registry_backend",
+        {
+            "items": len(items),
+            "keys": len(registry_writes(items, ActionMode.APPLY)),
+            "generate_scripts": measure(lambda: generate_scripts(ActionMode.APPLY)),
+            "apply": measure(lambda: write(ActionMode.APPLY)),
+            "revert": measure(lambda: write(ActionMode.REVERT)),
+            "read": measure(lambda: registry_states(registry, items)),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
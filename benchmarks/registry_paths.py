@@ -0,0 +1,86 @@
+import random
+import re
+
+from winconfig.config.definition import (
+    normalize_registry_path,
+    registry_path_key,
+)
+
+from .utils import measure, report
+
+PATHS = 100_000
+# inventories list the same keys many times, under different spellings
+UNIQUE_KEYS = 20_000
+HIVE_SPELLINGS = [
+    ["HKCU", "HKEY_CURRENT_USER", "HKCU:", "Registry::HKEY_CURRENT_USER"],
+    ["HKLM", "HKEY_LOCAL_MACHINE", "HKLM:", "Registry::hklm"],
+    ["HKCR", "HKEY_CLASSES_ROOT", "Registry::HKCR"],
+    ["HKU", "HKEY_USERS"],
+]
+SEGMENTS = ["Software", "Microsoft", "Windows", "CurrentVersion", "Explorer"]
+
+
+def inventory_paths(seed: int = 0) -> list[str]:
+    rng = random.Random(seed)  # noqa: S311
+    keys = [
+        (
+            rng.randrange(len(HIVE_SPELLINGS)),
+            "\\".join(
+                [*rng.sample(SEGMENTS, rng.randint(1, 4)), f"Key{i}"],
+            ),
+        )
+        for i in range(UNIQUE_KEYS)
+    ]
+    paths = []
+    for _ in range(PATHS):
+        hive, subkey = rng.choice(keys)
+        paths.append(f"{rng.choice(HIVE_SPELLINGS[hive])}\\{subkey}")
+    return paths
+
+
+def separate_subs(value: str) -> str:
+    """The normalization as it was, one substitution per hive."""
+    mapping = {
+        r"(HKEY_CLASSES_ROOT|HKCR):?\\": r"HKCR\\",
+        r"(HKEY_CURRENT_CONFIG|HKCC):?\\": r"HKCC\\",
+        r"(HKEY_CURRENT_USER|HKCU):?\\": r"HKCU\\",
+        r"(HKEY_LOCAL_MACHINE|HKLM):?\\": r"HKLM\\",
+        r"(HKEY_USERS|HKU):?\\": r"HKU\\",
+    }
+    for pattern, repl in mapping.items():
+        value = re.sub("^(?:Registry::)?" + pattern, repl, value, flags=re.IGNORECASE)
+    return value
+
+
+def uncached(paths: list[str]) -> None:
+    normalize_registry_path.cache_clear()
+    for path in paths:
+        normalize_registry_path(path)
+    normalize_registry_path.cache_clear()
+
+
+def main() -> None:
+    paths = inventory_paths()
+    # the cache only helps with paths seen before, so cold runs clear it
+    normalize_registry_path.cache_clear()
+    report(
+        "registry_paths",
+        {
+            "paths": PATHS,
+            "unique_paths": len(set(paths)),
+            "separate_subs": measure(
+                lambda: [separate_subs(p) for p in paths], repeat=3
+            ),
+            "combined_pattern": measure(lambda: uncached(paths), repeat=3),
+            "memoized": measure(
+                lambda: [normalize_registry_path(p) for p in paths], repeat=3
+            ),
+            "path_key": measure(
+                lambda: [registry_path_key(p) for p in paths], repeat=3
+            ),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
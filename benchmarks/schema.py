@@ -0,0 +1,47 @@
+import tempfile
+from pathlib import Path
+
+from winconfig.cli.schema import actions_schema, config_schema, generate_schema
+from winconfig.config.cache import default_config_cache
+from winconfig.config.config import Config
+from winconfig.engine import Engine
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+from .utils import measure, report
+
+
+def engine_actions() -> dict[str, list[str]]:
+    """The definition names as the schema command used to list them."""
+    engine = Engine(validate=False)
+    return {
+        task_group.name: [task.name for task in task_group.tasks]
+        for task_group in engine.task_groups
+    }
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        config_schema(Path(directory))
+        report(
+            "schema",
+            {
+                "generate": measure(lambda: generate_schema(Config)),
+                "cached": measure(lambda: config_schema(Path(directory))),
+                "engine_actions": measure(engine_actions),
+                "definition_actions": measure(
+                    lambda: actions_schema(
+                        (
+                            config.definition_config
+                            for config in default_config_cache.load_many(
+                                [BUILTIN_DEFINITION_PATH]
+                            )
+                        ),
+                        strict=True,
+                    )
+                ),
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
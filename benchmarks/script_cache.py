@@ -0,0 +1,39 @@
+from winconfig.config.action import ActionMode, ExecutableActionMode
+from winconfig.engine import Engine
+from winconfig.engine.script_cache import ScriptCache
+from winconfig.engine.task import Task
+
+from .utils import measure, report
+
+MODES: list[ExecutableActionMode] = [ActionMode.APPLY, ActionMode.REVERT]
+
+
+def generate(tasks: list[Task]) -> None:
+    for task in tasks:
+        for mode in MODES:
+            task.generate_script(mode).strip()
+
+
+def read_cache(cache: ScriptCache, tasks: list[Task]) -> None:
+    for task in tasks:
+        for mode in MODES:
+            cache.get(task, mode)
+
+
+def main() -> None:
+    tasks = [task for task_group in Engine().task_groups for task in task_group.tasks]
+    warm_cache = ScriptCache()
+    read_cache(warm_cache, tasks)
+    report(
+        "script_cache",
+        {
+            "scripts": len(tasks) * len(MODES),
+            "uncached": measure(lambda: generate(tasks)),
+            "cold_cache": measure(lambda: read_cache(ScriptCache(), tasks)),
+            "warm_cache": measure(lambda: read_cache(warm_cache, tasks)),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
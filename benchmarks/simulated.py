@@ -0,0 +1,32 @@
+import re
+import time
+
+from winconfig.engine.batch import BatchResult
+
+# a local runspace answers an empty script in about this time
+INVOKE_LATENCY_MS = 5.0
+LINE_COST_MS = 0.01
+
+
+class SimulatedExecutor:
+    """Stands in for a PowerShell runspace, taking time like one would.
+
+    Every invocation costs a fixed latency plus a cost per script line, and
+    batches are answered with a successful result per section.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = INVOKE_LATENCY_MS,
+        line_cost_ms: float = LINE_COST_MS,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.line_cost_ms = line_cost_ms
+        self.invocations = 0
+
+    def run(self, script: str) -> str:
+        self.invocations += 1
+        cost_ms = self.latency_ms + self.line_cost_ms * script.count("\n")
+        time.sleep(cost_ms / 1000)
+        sections = re.findall(r"^#region (.+?)$", script, flags=re.MULTILINE)
+        return "\n".join(BatchResult(name=name).model_dump_json() for name in sections)
@@ -0,0 +1,57 @@
+from winconfig.config.action import ActionMode
+from winconfig.engine import Engine
+from winconfig.engine.task import Task, TaskGroup
+
+from .utils import measure, report
+
+
+def copied_task_groups(engine: Engine) -> list[TaskGroup]:
+    """The task groups built the way every access used to, copying each body."""
+    actions = engine.config.action_config.root
+    return [
+        TaskGroup(
+            name=group_name,
+            tasks=[
+                Task(
+                    group_name=group_name,
+                    name=name,
+                    mode=actions.get(group_name, {}).get(name),
+                    **definition_body.model_dump(),
+                )
+                for name, definition_body in definition_group.items()
+            ],
+        )
+        for group_name, definition_group in engine.config.definition_config.root.items()
+    ]
+
+
+def rebuilt_task_groups(engine: Engine) -> list[TaskGroup]:
+    """The task groups of the engine, built again as after a config change."""
+    engine.layers.version += 1
+    return engine.task_groups
+
+
+def main() -> None:
+    engine = Engine(config_cache=None)
+    task_group = engine.task_groups[0]
+    task = task_group.tasks[0]
+    report(
+        "task_index",
+        {
+            "tasks": sum(len(group.tasks) for group in engine.task_groups),
+            "copied_build": measure(lambda: copied_task_groups(engine)),
+            "shared_build": measure(lambda: rebuilt_task_groups(engine)),
+            "cached_access": measure(lambda: engine.task_groups, number=1000),
+            "task_lookup": measure(
+                lambda: engine.task(task_group.name, task.name), number=1000
+            ),
+            "set_mode": measure(
+                lambda: engine.set_mode(task_group.name, task.name, ActionMode.SKIP),
+                number=1000,
+            ),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
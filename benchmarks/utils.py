@@ -0,0 +1,31 @@
+import json
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def measure(
+    func: Callable[[], object], *, repeat: int = 20, number: int = 1
+) -> dict[str, float]:
+    """Time func and summarize the per-call duration in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number * 1000)
+    return {
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+    }
+
+
+# every reported result of this process, for the suite to save at once
+RESULTS: dict[str, dict[str, Any]] = {}
+
+
+def report(name: str, results: dict[str, Any]) -> None:
+    RESULTS[name] = results
+    print(json.dumps({"benchmark": name, "results": results}, indent=2))
@@ -0,0 +1,11 @@
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = "WINCONFIG_CACHE_DIR"
+
+
+def default_cache_dir() -> Path:
+    if directory := os.environ.get(CACHE_DIR_ENV):
+        return Path(directory)
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / "winconfig"
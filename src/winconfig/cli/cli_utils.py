@@ -1,18 +1,17 @@
+import json
 import sys
 from collections.abc import Generator
-from contextlib import contextmanager
+from contextlib import contextmanager, suppress
 from pathlib import Path
 from typing import Annotated, Any, Literal
 
 import typer
 from loguru import logger
-from pydantic import BaseModel, ConfigDict, RootModel
-from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
 
 OutputParam = Annotated[
     str | None,
     typer.Option(
-        help="Path to the file where the schema will be saved.",
+        help="Path to the file where the output will be saved.",
     ),
 ]
 ConfigPathsParam = Annotated[
@@ -28,6 +27,17 @@ ConfigPathsParam = Annotated[
         resolve_path=True,
     ),
 ]
+SnapshotPathParam = Annotated[
+    Path,
+    typer.Argument(
+        help="Path to the snapshot file (.json or YAML).",
+        exists=True,
+        file_okay=True,
+        dir_okay=False,
+        readable=True,
+        resolve_path=True,
+    ),
+]
 DryRunParam = Annotated[
     bool,
     typer.Option(
@@ -35,6 +45,137 @@ DryRunParam = Annotated[
         help="Do not apply any changes. Useful for validating the config file without executing them.",
     ),
 ]
+BatchParam = Annotated[
+    bool,
+    typer.Option(
+        "--batch",
+        help="Run all tasks in a single PowerShell invocation.",
+    ),
+]
+OnlyChangedParam = Annotated[
+    bool,
+    typer.Option(
+        "--only-changed",
+        help="Read the current state first and only change the items that differ.",
+    ),
+]
+SaveSnapshotParam = Annotated[
+    Path | None,
+    typer.Option(
+        "--snapshot",
+        dir_okay=False,
+        help="Save the prior state of the items about to change to this file, for use with rollback.",
+    ),
+]
+ScriptCacheParam = Annotated[
+    bool,
+    typer.Option(
+        "--script-cache",
+        help="Keep generated scripts in a cache file next to the config to skip generating them again.",
+    ),
+]
+CompactParam = Annotated[
+    bool,
+    typer.Option(
+        "--compact",
+        help="Generate one-line calls to shared helper functions instead of a full script per item.",
+    ),
+]
+NativeRegistryParam = Annotated[
+    bool,
+    typer.Option(
+        "--native-registry",
+        help="Read and write registry items through the .NET registry API instead of PowerShell cmdlets.",
+    ),
+]
+IntervalParam = Annotated[
+    float,
+    typer.Option(
+        "--interval",
+        min=0.1,
+        help="Seconds between checks of the config files for changes.",
+    ),
+]
+SourcesParam = Annotated[
+    bool,
+    typer.Option(
+        "--sources",
+        help="Show which config file decided the mode and the definition of each task.",
+    ),
+]
+ReportParam = Annotated[
+    Path | None,
+    typer.Option(
+        "--report",
+        dir_okay=False,
+        help="Save the timings and outcome of every task to this file (.json, or .jsonl for JSON lines).",
+    ),
+]
+SlowestParam = Annotated[
+    int,
+    typer.Option(
+        "--slowest",
+        min=0,
+        help="Show a table of the given number of slowest tasks after the run.",
+    ),
+]
+AddressParam = Annotated[
+    str | None,
+    typer.Option(
+        "--address",
+        help="Socket path or named pipe of the daemon. Defaults to one per user.",
+    ),
+]
+GroupParam = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--group",
+        help="Only run the tasks of this definition group. Can be repeated.",
+    ),
+]
+TaskParam = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--task",
+        help="Only run the tasks whose name matches this glob pattern, e.g. 'Hide*'. Can be repeated.",
+    ),
+]
+TagParam = Annotated[
+    list[str] | None,
+    typer.Option(
+        "--tag",
+        help="Only run the tasks with this tag. Can be repeated.",
+    ),
+]
+JobsParam = Annotated[
+    int,
+    typer.Option(
+        "--jobs",
+        "-j",
+        min=1,
+        help="Number of PowerShell runspaces to run independent tasks on concurrently.",
+    ),
+]
+
+
+class StderrHandler:
+    """The loguru handler logging to stderr, replaced without the other handlers."""
+
+    # loguru starts with a handler of id 0 on stderr
+    handler_id: int | None = 0
+
+    @classmethod
+    def set_level(cls, level: str) -> None:
+        if cls.handler_id is not None:
+            with suppress(ValueError):
+                logger.remove(cls.handler_id)
+            cls.handler_id = None
+        if level != "SILENT":
+            cls.handler_id = logger.add(
+                sys.stderr,
+                format="<green>{time:HH:mm:ss.SSS}</green> | <level>{message}</level>",
+                level=level,
+            )
 
 
 def loglevel_callback(
@@ -43,18 +184,7 @@ def loglevel_callback(
         typer.Option(help="Set the logging level"),
     ] = "INFO",
 ) -> None:
-    if loglevel == "SILENT":
-        logger.remove()
-    else:
-        logger.configure(
-            handlers=[
-                {
-                    "sink": sys.stderr,
-                    "format": "<green>{time:HH:mm:ss.SSS}</green> | <level>{message}</level>",
-                    "level": loglevel,
-                }
-            ]  # ty:ignore[invalid-argument-type]  # loguru not having runtime type
-        )
+    StderrHandler.set_level(loglevel)
     logger.debug(f"Log level: {loglevel}")
 
 
@@ -72,23 +202,29 @@ def handle_cli_error() -> Generator[None, Any, None]:
         logger.error(str(e))
 
 
+def is_unchanged(path: Path, content: str) -> bool:
+    """Whether the file already holds the content, however its JSON is formatted."""
+    if not path.is_file():
+        return False
+    current = path.read_text(encoding="utf-8")
+    if current == content:
+        return True
+    if path.suffix.lower() != ".json":
+        return False
+    try:
+        # a formatter may have rewritten the previous output
+        return json.loads(current) == json.loads(content)
+    except ValueError:
+        return False
+
+
 def handle_output(content: str, output_path: str | None) -> None:
     if output_path:
-        Path(output_path).write_text(content, encoding="utf-8")
+        path = Path(output_path)
+        # rewriting the same content would only wake up whatever watches the file
+        if is_unchanged(path, content):
+            logger.info(f"Unchanged: {path}")
+            return
+        path.write_text(content, encoding="utf-8")
     else:
         typer.echo(content)
-
-
-class GenerateJsonSchemaNoTitles(GenerateJsonSchema):
-    def field_title_should_be_set(self, schema: Any) -> bool:  # noqa: ANN401, ARG002
-        return False
-
-    def _update_class_schema(
-        self, json_schema: JsonSchemaValue, cls: type[Any], config: ConfigDict
-    ) -> None:
-        super()._update_class_schema(json_schema, cls, config)
-        json_schema.pop("title", None)
-
-
-def generate_schema(model_type: type[BaseModel | RootModel]) -> dict[str, Any]:
-    return model_type.model_json_schema(schema_generator=GenerateJsonSchemaNoTitles)
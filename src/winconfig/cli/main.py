@@ -1,24 +1,42 @@
 import json
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
 
 import typer
+from loguru import logger
 
+from winconfig.cli import remote
 from winconfig.cli.cli_utils import (
+    AddressParam,
+    BatchParam,
+    CompactParam,
     ConfigPathsParam,
     DryRunParam,
+    GroupParam,
+    IntervalParam,
+    JobsParam,
     LogLevelParam,
+    NativeRegistryParam,
+    OnlyChangedParam,
     OutputParam,
-    generate_schema,
+    ReportParam,
+    SaveSnapshotParam,
+    ScriptCacheParam,
+    SlowestParam,
+    SnapshotPathParam,
+    SourcesParam,
+    TagParam,
+    TaskParam,
     handle_cli_error,
     handle_output,
 )
-from winconfig.config.config import Config
-from winconfig.engine import Engine
-from winconfig.gui.app import app as gui_app
 
 app = typer.Typer(
     context_settings={"help_option_names": ["-h", "--help"]},
     pretty_exceptions_show_locals=False,
 )
+app.add_typer(remote.app, name="remote")
 
 
 @app.callback(invoke_without_command=True)
@@ -32,6 +50,8 @@ def callback(ctx: typer.Context) -> None:
     help="Open the GUI.",
 )
 def gui() -> None:
+    from winconfig.gui.app import app as gui_app
+
     gui_app.run()
 
 
@@ -39,17 +59,225 @@ def gui() -> None:
     no_args_is_help=True,
     help="Run the configured actions.",
 )
-def run(
+def run(  # noqa: PLR0913
     config_paths: ConfigPathsParam,
     *,
     reverse: bool = False,
     dry_run: DryRunParam = False,
+    batch: BatchParam = False,
+    jobs: JobsParam = 1,
+    only_changed: OnlyChangedParam = False,
+    snapshot: SaveSnapshotParam = None,
+    script_cache: ScriptCacheParam = False,
+    compact: CompactParam = False,
+    native_registry: NativeRegistryParam = False,
+    report: ReportParam = None,
+    slowest: SlowestParam = 0,
+    group: GroupParam = None,
+    task: TaskParam = None,
+    tag: TagParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    from winconfig.engine import Engine
+    from winconfig.engine.registry import DotnetRegistry
+    from winconfig.engine.report import RunReport
+    from winconfig.engine.script_cache import (
+        default_script_cache,
+        persistent_script_cache,
+    )
+    from winconfig.engine.selection import TaskSelection
+
+    selection = TaskSelection(groups=group or [], names=task or [], tags=tag or [])
+
+    run_report = RunReport(
+        started_at=datetime.now(UTC),
+        options={
+            "config_paths": [str(path) for path in config_paths],
+            "reverse": reverse,
+            "batch": batch,
+            "jobs": jobs,
+            "only_changed": only_changed,
+            "compact": compact,
+            "native_registry": native_registry,
+            "selection": selection.model_dump(),
+        },
+    )
+    with handle_cli_error():
+        engine = Engine(
+            *config_paths,
+            script_cache=(
+                persistent_script_cache(*config_paths)
+                if script_cache
+                else default_script_cache
+            ),
+            registry_backend=DotnetRegistry() if native_registry else None,
+        )
+        tasks = engine.select(selection) if selection else None
+        if tasks is not None:
+            logger.info(f"Selected: {len(tasks)} tasks")
+        if dry_run:
+            return
+        try:
+            engine.run(
+                reverse=reverse,
+                batch=batch,
+                jobs=jobs,
+                only_changed=only_changed,
+                snapshot_path=snapshot,
+                compact=compact,
+                tasks=tasks,
+                report=run_report,
+            )
+        finally:
+            if report is not None:
+                run_report.write(report)
+                logger.info(f"Report: saved to {report}")
+            if slowest:
+                typer.echo(run_report.describe_slowest(slowest), err=True)
+
+
+@app.command(
+    no_args_is_help=True,
+    help="Run the configured actions, then watch the config files and run again only the tasks whose mode or definition changed.",
+)
+def watch(  # noqa: PLR0913
+    config_paths: ConfigPathsParam,
+    *,
+    reverse: bool = False,
+    batch: BatchParam = False,
+    only_changed: OnlyChangedParam = False,
+    compact: CompactParam = False,
+    native_registry: NativeRegistryParam = False,
+    interval: IntervalParam = 1.0,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    from winconfig.engine import Engine
+    from winconfig.engine.registry import DotnetRegistry
+    from winconfig.engine.watch import ConfigWatch
+
+    with handle_cli_error():
+        config_watch = ConfigWatch(
+            Engine(
+                *config_paths,
+                registry_backend=DotnetRegistry() if native_registry else None,
+            ),
+            config_paths,
+            reverse=reverse,
+            batch=batch,
+            only_changed=only_changed,
+            compact=compact,
+            interval=interval,
+        )
+        try:
+            config_watch.watch()
+        except KeyboardInterrupt:
+            config_watch.stop()
+
+
+@app.command(
+    no_args_is_help=True,
+    help="Keep one engine and its PowerShell runspaces running to serve `winconfig remote` requests.",
+)
+def daemon(
+    config_paths: ConfigPathsParam,
+    *,
+    jobs: JobsParam = 1,
+    native_registry: NativeRegistryParam = False,
+    address: AddressParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    from winconfig.daemon.server import DaemonServer
+    from winconfig.engine import Engine
+    from winconfig.engine.registry import DotnetRegistry
+
+    with handle_cli_error():
+        server = DaemonServer(
+            Engine(
+                *config_paths,
+                registry_backend=DotnetRegistry() if native_registry else None,
+            ),
+            config_paths,
+            address=address,
+            jobs=jobs,
+        )
+        try:
+            server.serve()
+        except KeyboardInterrupt:
+            logger.info("Stopped")
+
+
+@app.command(
+    no_args_is_help=True,
+    help="Show the tasks a run would execute. Use --graph to show which of them can run concurrently.",
+)
+def plan(  # noqa: PLR0913
+    config_paths: ConfigPathsParam,
+    *,
+    reverse: bool = False,
+    graph: bool = False,
+    sources: SourcesParam = False,
+    output: OutputParam = None,
     loglevel: LogLevelParam = "INFO",  # noqa: ARG001
 ) -> None:
+    from winconfig.engine import Engine
+
     with handle_cli_error():
-        engine = Engine(*config_paths)
-        if not dry_run:
-            engine.run(reverse=reverse)
+        content = Engine(*config_paths).describe_plan(
+            reverse=reverse, graph=graph, sources=sources
+        )
+        handle_output(content=content, output_path=output)
+
+
+@app.command(
+    help="Record the current state of every registry entry, service and scheduled task the definitions cover. The format follows the output extension (.json or YAML).",
+)
+def snapshot(
+    config_paths: ConfigPathsParam,
+    *,
+    output: OutputParam = None,
+    native_registry: NativeRegistryParam = False,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    from winconfig.engine import Engine
+    from winconfig.engine.registry import DotnetRegistry
+    from winconfig.engine.snapshot import open_atomic, snapshot_format
+
+    with handle_cli_error():
+        engine = Engine(
+            *config_paths,
+            registry_backend=DotnetRegistry() if native_registry else None,
+        )
+        fmt = snapshot_format(output)
+        if output:
+            with open_atomic(Path(output)) as stream:
+                count = engine.snapshot(stream, fmt)
+        else:
+            count = engine.snapshot(sys.stdout, fmt)
+        logger.info(f"Snapshot: {count} items")
+
+
+@app.command(
+    no_args_is_help=True,
+    help="Restore the values recorded in a snapshot, such as one saved by run --snapshot.",
+)
+def rollback(
+    snapshot_path: SnapshotPathParam,
+    *,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    from winconfig.engine.executor import create_powershell_executor
+    from winconfig.engine.snapshot import (
+        load_snapshot,
+        restore_snapshot,
+        snapshot_format,
+    )
+
+    with handle_cli_error():
+        snapshot_items = load_snapshot(
+            snapshot_path.read_text(encoding="utf-8"),
+            snapshot_format(str(snapshot_path)),
+        )
+        restore_snapshot(create_powershell_executor(), snapshot_items)
 
 
 @app.command(
@@ -62,27 +290,26 @@ def schema(
     strict: bool = False,
     loglevel: LogLevelParam = "INFO",  # noqa: ARG001
 ) -> None:
+    from winconfig.cli.schema import actions_schema, config_schema
+    from winconfig.config.cache import default_config_cache
+    from winconfig.resources import BUILTIN_DEFINITION_PATH
+
     with handle_cli_error():
-        schema_dict = generate_schema(Config)
-        engine = Engine(*config_paths, validate=False)
-        additional_props = not strict
-        schema_dict["properties"]["Actions"] = {
-            "properties": {
-                task_group.name: {
-                    "type": "object",
-                    "properties": {
-                        task.name: {"$ref": "#/$defs/ActionMode"}
-                        for task in task_group.tasks
-                    },
-                    "additionalProperties": additional_props,
-                }
-                for task_group in engine.task_groups
-            },
-            "additionalProperties": additional_props,
-        }
+        schema_dict = config_schema()
+        configs = default_config_cache.load_many(
+            [BUILTIN_DEFINITION_PATH, *config_paths]
+        )
+        schema_dict["properties"]["Actions"] = actions_schema(
+            (config.definition_config for config in configs), strict=strict
+        )
         schema = json.dumps(schema_dict, ensure_ascii=False, indent=2)
         handle_output(content=schema, output_path=output)
 
 
 if __name__ == "__main__":
+    import multiprocessing
+
+    # a frozen exe starts its worker processes by running itself again, which
+    # must run the worker instead of the CLI
+    multiprocessing.freeze_support()
     app()
@@ -0,0 +1,93 @@
+import typer
+
+from winconfig.cli.cli_utils import (
+    AddressParam,
+    BatchParam,
+    CompactParam,
+    LogLevelParam,
+    OnlyChangedParam,
+    OutputParam,
+    SourcesParam,
+    handle_cli_error,
+    handle_output,
+)
+from winconfig.daemon.client import DaemonClient
+
+app = typer.Typer(
+    no_args_is_help=True,
+    help="Send requests to a running `winconfig daemon` instead of starting an engine.",
+)
+
+
+@app.command(help="Run the configured actions on the daemon.")
+def apply(
+    *,
+    batch: BatchParam = False,
+    only_changed: OnlyChangedParam = False,
+    compact: CompactParam = False,
+    address: AddressParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    with handle_cli_error():
+        DaemonClient(address).request(
+            "apply", batch=batch, only_changed=only_changed, compact=compact
+        )
+
+
+@app.command(help="Revert the configured actions on the daemon.")
+def revert(
+    *,
+    batch: BatchParam = False,
+    only_changed: OnlyChangedParam = False,
+    compact: CompactParam = False,
+    address: AddressParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    with handle_cli_error():
+        DaemonClient(address).request(
+            "revert", batch=batch, only_changed=only_changed, compact=compact
+        )
+
+
+@app.command(help="Show the tasks a run on the daemon would execute.")
+def plan(  # noqa: PLR0913
+    *,
+    reverse: bool = False,
+    graph: bool = False,
+    sources: SourcesParam = False,
+    output: OutputParam = None,
+    address: AddressParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    with handle_cli_error():
+        content = DaemonClient(address).request(
+            "plan", reverse=reverse, graph=graph, sources=sources
+        )
+        handle_output(content=content, output_path=output)
+
+
+@app.command(
+    help="Record the current state of every defined item on the daemon. The format follows the output extension (.json or YAML).",
+)
+def snapshot(
+    *,
+    output: OutputParam = None,
+    address: AddressParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    with handle_cli_error():
+        content = DaemonClient(address).request(
+            "snapshot",
+            format="json" if output and output.lower().endswith(".json") else "yaml",
+        )
+        handle_output(content=content, output_path=output)
+
+
+@app.command(help="Stop the daemon.")
+def stop(
+    *,
+    address: AddressParam = None,
+    loglevel: LogLevelParam = "INFO",  # noqa: ARG001
+) -> None:
+    with handle_cli_error():
+        DaemonClient(address).request("stop")
@@ -0,0 +1,90 @@
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pydantic
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, RootModel
+from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
+
+from winconfig.cache_dir import default_cache_dir
+from winconfig.config.cache import MODEL_VERSION, PACKAGE_VERSION
+from winconfig.config.config import Config
+from winconfig.config.definition import DefinitionConfig
+
+# the models and pydantic decide the schema, unlike the Python version that
+# pickles depend on
+SCHEMA_VERSION = f"{PACKAGE_VERSION}/{MODEL_VERSION}/{pydantic.VERSION}"
+
+
+class GenerateJsonSchemaNoTitles(GenerateJsonSchema):
+    def field_title_should_be_set(self, schema: Any) -> bool:  # noqa: ANN401, ARG002
+        return False
+
+    def _update_class_schema(
+        self, json_schema: JsonSchemaValue, cls: type[Any], config: ConfigDict
+    ) -> None:
+        super()._update_class_schema(json_schema, cls, config)
+        json_schema.pop("title", None)
+
+
+def generate_schema(model_type: type[BaseModel | RootModel]) -> dict[str, Any]:
+    return model_type.model_json_schema(schema_generator=GenerateJsonSchemaNoTitles)
+
+
+def config_schema(directory: Path | None = None) -> dict[str, Any]:
+    """The JSON schema of Config, generated once per version of the models.
+
+    It is kept in the cache directory, as it only changes with the code.
+    """
+    path = (directory or default_cache_dir()) / "config.schema.json"
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        if entry.get("version") == SCHEMA_VERSION:
+            return entry["schema"]
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, AttributeError, KeyError) as e:
+        logger.debug(f"Ignoring unreadable schema cache {path}: {e}")
+
+    schema = generate_schema(Config)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        temp_path.write_text(
+            json.dumps({"version": SCHEMA_VERSION, "schema": schema}),
+            encoding="utf-8",
+        )
+        temp_path.replace(path)
+    except OSError as e:
+        logger.debug(f"Could not write schema cache {path}: {e}")
+    return schema
+
+
+def actions_schema(
+    definition_configs: Iterable[DefinitionConfig], *, strict: bool
+) -> dict[str, Any]:
+    """The Actions section naming every definition, in merged order.
+
+    With strict, no other group or action name is allowed.
+    """
+    names: dict[str, dict[str, None]] = {}
+    for definition_config in definition_configs:
+        for group_name, group in definition_config.root.items():
+            names.setdefault(group_name, {}).update(dict.fromkeys(group))
+    additional_props = not strict
+    return {
+        "properties": {
+            group_name: {
+                "type": "object",
+                "properties": {
+                    name: {"$ref": "#/$defs/ActionMode"} for name in group_names
+                },
+                "additionalProperties": additional_props,
+            }
+            for group_name, group_names in names.items()
+        },
+        "additionalProperties": additional_props,
+    }
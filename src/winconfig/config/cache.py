@@ -0,0 +1,158 @@
+import hashlib
+import os
+import pickle
+import sys
+from enum import Enum
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, TypeAliasType, get_args, get_type_hints
+
+import pydantic
+from loguru import logger
+from pydantic import BaseModel
+
+from winconfig.cache_dir import default_cache_dir
+
+from .config import Config
+
+try:
+    PACKAGE_VERSION = version("winconfig")
+except PackageNotFoundError:
+    PACKAGE_VERSION = "unknown"
+
+
+def model_fields_hash(model: type[BaseModel]) -> str:
+    """A hash of the fields of the model and every model in them.
+
+    Unreleased versions share the package version, so this is what tells the
+    models apart when a field changes. Docstrings, defaults and descriptions
+    are part of it too, as the JSON schema is cached on it as well.
+    """
+    seen: set[int] = set()
+    fields: list[str] = []
+
+    def visit(annotation: Any) -> None:  # noqa: ANN401
+        # annotations need not be hashable, and the models may refer to each other
+        if id(annotation) in seen:
+            return
+        seen.add(id(annotation))
+        if isinstance(annotation, TypeAliasType):
+            fields.append(f"{annotation.__name__} = {annotation.__value__}")
+            visit(annotation.__value__)
+        elif isinstance(annotation, type) and issubclass(annotation, Enum):
+            fields.append(
+                f"{annotation.__qualname__} = {[e.value for e in annotation]}"
+            )
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            # resolves the annotations that are still strings in model_fields
+            hints = get_type_hints(annotation)
+            fields.append(f"{annotation.__qualname__}: {annotation.__doc__!r}")
+            for name, field in annotation.model_fields.items():
+                fields.append(
+                    f"{annotation.__qualname__}.{name}: {hints[name]}"
+                    f" = {field.default!r}, {field.description!r}"
+                )
+                visit(hints[name])
+        for arg in get_args(annotation):
+            visit(arg)
+
+    visit(model)
+    return hashlib.sha256("\n".join(fields).encode()).hexdigest()[:16]
+
+
+MODEL_VERSION = model_fields_hash(Config)
+# pickled models are only readable by the code that wrote them
+CACHE_VERSION = (
+    f"{PACKAGE_VERSION}/{MODEL_VERSION}/{pydantic.VERSION}/{sys.version_info[:2]}"
+)
+
+
+class ConfigCache:
+    """Validated configs pickled next to the mtime and content hash of their YAML.
+
+    A config whose file has the same mtime and size is loaded without reading
+    the YAML at all. Otherwise the file is hashed and only parsed again if its
+    content changed.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or default_cache_dir()
+
+    def entry_path(self, file_path: Path) -> Path:
+        key = hashlib.sha256(str(file_path.resolve()).encode()).hexdigest()[:32]
+        return self.directory / f"{key}.config.pickle"
+
+    def _read_entry(self, entry_path: Path) -> dict[str, Any] | None:
+        try:
+            entry = pickle.loads(entry_path.read_bytes())  # noqa: S301
+        except FileNotFoundError:
+            return None
+        except Exception as e:  # noqa: BLE001
+            logger.debug(f"Ignoring unreadable config cache {entry_path}: {e}")
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_VERSION:
+            return None
+        return entry
+
+    def _write_entry(self, entry_path: Path, entry: dict[str, Any]) -> None:
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_bytes(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+            temp_path.replace(entry_path)
+        except OSError as e:
+            logger.debug(f"Could not write config cache {entry_path}: {e}")
+
+    def load(self, file_path: Path) -> Config:
+        return self.load_many([file_path])[0]
+
+    def load_many(self, file_paths: list[Path]) -> list[Config]:
+        """Load the configs in order, parsing every changed file in one go."""
+        configs: list[Config | None] = []
+        entries: list[tuple[int, Path, dict[str, Any]]] = []
+        documents: list[tuple[str, Path]] = []
+        for file_path in file_paths:
+            stat = file_path.stat()
+            entry_path = self.entry_path(file_path)
+            entry = self._read_entry(entry_path)
+            if entry and (entry["mtime_ns"], entry["size"]) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                configs.append(entry["config"])
+                continue
+
+            text = file_path.read_text()
+            digest = hashlib.sha256(text.encode()).hexdigest()
+            if entry and entry["sha256"] == digest:
+                configs.append(entry["config"])
+            else:
+                configs.append(None)
+                documents.append((text, file_path))
+            entries.append(
+                (
+                    len(configs) - 1,
+                    entry_path,
+                    {
+                        "version": CACHE_VERSION,
+                        "mtime_ns": stat.st_mtime_ns,
+                        "size": stat.st_size,
+                        "sha256": digest,
+                        "config": configs[-1],
+                    },
+                )
+            )
+
+        parsed = iter(Config.from_yaml_texts(documents))
+        loaded = [next(parsed) if config is None else config for config in configs]
+        for i, entry_path, entry in entries:
+            entry["config"] = loaded[i]
+            self._write_entry(entry_path, entry)
+        return loaded
+
+
+default_config_cache = ConfigCache()
@@ -1,5 +1,8 @@
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Self
+from typing import Any, Self
 
 import yaml
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
@@ -15,6 +18,25 @@ from winconfig.exceptions import (
 from .action import ActionConfig, ActionMode
 from .definition import DefinitionConfig
 
+# the libyaml loader is several times faster where PyYAML was built with it
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+PARALLEL_PARSE_MIN_SIZE = 1 << 20
+
+
+def load_yaml(text: str) -> Any:  # noqa: ANN401
+    return yaml.load(text, Loader=SafeLoader)  # noqa: S506
+
+
+def try_load_yaml(text: str) -> tuple[bool, Any]:
+    """Parse YAML, returning whether it succeeded instead of raising.
+
+    Parse errors are not raised so they need not be pickled back from a worker.
+    """
+    try:
+        return True, load_yaml(text)
+    except YAMLError:
+        return False, None
+
 
 class Config(BaseModel):
     """The root model for a winconfig definition file."""
@@ -38,19 +60,53 @@ class Config(BaseModel):
 
     @classmethod
     def from_yaml(cls, file_path: Path) -> Self:
-        try:
-            return cls.model_validate(yaml.safe_load(file_path.read_text()))
-        except YAMLError:
-            raise ConfigYamlError(file_path) from None
-        except ValidationError:
-            raise ConfigValidationError(file_path) from None
+        return cls.from_yaml_text(file_path.read_text(), file_path)
 
-    def merge_from_yaml(self, *config_paths: Path) -> Self:
-        configs = [Config.from_yaml(config_path) for config_path in config_paths]
+    @classmethod
+    def from_yaml_text(cls, text: str, file_path: Path) -> Self:
+        return cls.from_yaml_texts([(text, file_path)])[0]
+
+    @classmethod
+    def from_yaml_files(cls, file_paths: Iterable[Path]) -> list[Self]:
+        return cls.from_yaml_texts(
+            [(file_path.read_text(), file_path) for file_path in file_paths]
+        )
+
+    @classmethod
+    def from_yaml_texts(cls, documents: list[tuple[str, Path]]) -> list[Self]:
+        """Parse and validate YAML documents, keeping their order.
+
+        Parsing holds the GIL even with libyaml, so large sets of documents are
+        parsed in worker processes. Small ones are not worth starting them for.
+        """
+        texts = [text for text, _ in documents]
+        workers = min(len(texts), os.cpu_count() or 1)
+        if workers > 1 and sum(map(len, texts)) >= PARALLEL_PARSE_MIN_SIZE:
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(pool.map(try_load_yaml, texts))
+        else:
+            results = [try_load_yaml(text) for text in texts]
+
+        configs = []
+        for (loaded, data), (_, file_path) in zip(results, documents, strict=True):
+            if not loaded:
+                raise ConfigYamlError(file_path)
+            try:
+                configs.append(cls.model_validate(data))
+            except ValidationError:
+                raise ConfigValidationError(file_path) from None
+        return configs
+
+    def merge(self, *configs: "Config") -> Self:
         self.definition_config.merge([config.definition_config for config in configs])
         self.action_config.merge([config.action_config for config in configs])
         return self
 
+    def merge_from_yaml(self, *config_paths: Path) -> Self:
+        return self.merge(
+            *(Config.from_yaml(config_path) for config_path in config_paths)
+        )
+
     def validate_action_config(self) -> None:
         for action_group_name, action_group in self.action_config.root.items():
             if action_group_name not in self.definition_config.root:
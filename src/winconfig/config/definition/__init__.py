@@ -4,10 +4,13 @@ from .definition import (  # noqa: F401
     DefinitionGroupName,
     DefinitionName,
 )
+from .helpers import HELPERS_PRELUDE, quote  # noqa: F401
 from .registry import (  # noqa: F401
     RegistryEntryDefinition,
     RegistryPathDefinition,
     RegistryValueKind,
+    normalize_registry_path,
+    registry_path_key,
 )
 from .schtask import SchtaskDefinition, SchtaskState  # noqa: F401
 from .script import ScriptDefinition  # noqa: F401
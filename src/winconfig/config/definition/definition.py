@@ -17,6 +17,10 @@ class DefinitionBody(BaseModel):
     """A single, self-contained configuration task."""
 
     description: str = Field(description="A description of the task's purpose.")
+    tags: list[str] = Field(
+        default=[],
+        description="Labels to select the task by, e.g. with `winconfig run --tag`.",
+    )
     registries: list[RegistryPathDefinition] = Field(
         default=[],
         description="The registry values to be modified.",
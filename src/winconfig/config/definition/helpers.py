@@ -0,0 +1,70 @@
+from textwrap import dedent
+
+from winconfig.protocol.state_codes import ACCESS_DENIED, NOT_EXIST, PERMISSION_DENIED
+
+
+def quote(value: str) -> str:
+    """Quote a value as a single-quoted PowerShell string."""
+    return "'" + value.replace("'", "''") + "'"
+
+
+def quote_array(values: list[str]) -> str:
+    """Quote values as a PowerShell string array, usable as a command argument."""
+    return f"([string[]]@({', '.join(map(quote, values))}))"
+
+
+# Defined once per invocation, so each compact item is a single call. The
+# helpers catch the same exceptions as the inlined scripts and print the same
+# state codes, and all scheduled tasks share one scheduler connection.
+HELPERS_PRELUDE = dedent(f"""
+    $wcState = @{{ Scheduler = $null }}
+    function Set-WcRegKey([string]$Path, [bool]$Exist) {{
+        if ($Exist) {{
+            if (!(Test-Path -LiteralPath $Path)) {{
+                New-Item -Path $Path -Force -ErrorAction Stop | Out-Null
+            }}
+        }} elseif (Test-Path -LiteralPath $Path) {{
+            Remove-Item -LiteralPath $Path -Force -Recurse -ErrorAction Stop | Out-Null
+        }}
+    }}
+    function Set-WcRegValue([string]$Path, [string]$Name, [string]$Type, $Value, [switch]$Remove) {{
+        try {{
+            if ($Remove) {{
+                Remove-ItemProperty -LiteralPath $Path -Name $Name -Force -ErrorAction Stop | Out-Null
+            }} elseif ($Type -eq "Binary") {{
+                $bytes = $Value.Split(" ") | ForEach-Object {{ [byte]$_ }}
+                Set-ItemProperty -LiteralPath $Path -Name $Name -Type $Type -Value $bytes -Force -ErrorAction Stop | Out-Null
+            }} else {{
+                Set-ItemProperty -LiteralPath $Path -Name $Name -Type $Type -Value $Value -Force -ErrorAction Stop | Out-Null
+            }}
+        }}
+        catch [System.Management.Automation.ItemNotFoundException] {{ "{NOT_EXIST}" }}
+        catch [System.Management.Automation.PSArgumentException] {{ "{NOT_EXIST}" }}
+        catch [System.UnauthorizedAccessException] {{ "{ACCESS_DENIED}" }}
+        catch [System.Security.SecurityException] {{ "{PERMISSION_DENIED}" }}
+    }}
+    function Set-WcSvc([string]$Name, [string]$StartupType) {{
+        $serviceName = $Name
+        if ($Name.Contains("*")) {{
+            $service = @(Get-Service -Name $Name -ErrorAction Stop)[0]
+            if ($service -eq $null) {{ "{NOT_EXIST}"; return }}
+            $serviceName = $service.Name
+        }}
+        try {{
+            Set-Service -Name $serviceName -StartupType $StartupType -ErrorAction Stop | Out-Null
+        }}
+        catch [System.Management.Automation.ParameterBindingException] {{ throw }}
+        catch [System.InvalidOperationException] {{ "{NOT_EXIST}" }}
+        catch [Microsoft.PowerShell.Commands.ServiceCommandException] {{ "{NOT_EXIST}" }}
+    }}
+    function Set-WcTask([string]$Path, [bool]$Enabled) {{
+        try {{
+            if ($wcState.Scheduler -eq $null) {{
+                $wcState.Scheduler = New-Object -ComObject "Schedule.Service"
+                $wcState.Scheduler.Connect()
+            }}
+            $wcState.Scheduler.GetFolder("\\").GetTask($Path).Enabled = $Enabled
+        }}
+        catch [System.IO.FileNotFoundException] {{ "{NOT_EXIST}" }}
+    }}
+""").lstrip()
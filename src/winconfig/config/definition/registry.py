@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from textwrap import dedent, indent
 from typing import Any, Literal, Self, assert_never
 
@@ -18,6 +19,8 @@ from winconfig.protocol.state_codes import (
     NotExistType,
 )
 
+from .helpers import quote, quote_array
+
 type RegistryValueKind = Literal[
     "String",
     "ExpandString",
@@ -28,6 +31,45 @@ type RegistryValueKind = Literal[
 ]
 
 
+# the short name of each hive by its lowercase spellings
+HIVES = {
+    "hkey_classes_root": "HKCR",
+    "hkcr": "HKCR",
+    "hkey_current_config": "HKCC",
+    "hkcc": "HKCC",
+    "hkey_current_user": "HKCU",
+    "hkcu": "HKCU",
+    "hkey_local_machine": "HKLM",
+    "hklm": "HKLM",
+    "hkey_users": "HKU",
+    "hku": "HKU",
+}
+# enough for the paths of many configs, while bounding what a daemon keeps
+PATH_CACHE_SIZE = 1 << 16
+HIVE_PATTERN = re.compile(
+    rf"(?:Registry::)?({'|'.join(HIVES)}):?\\", flags=re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def normalize_registry_path(path: str) -> str:
+    """The path with its hive in short form, like HKCU\\Software.
+
+    Long hive names, PowerShell drives and the Registry:: provider prefix are
+    accepted, and any other path is returned as is.
+    """
+    match = HIVE_PATTERN.match(path)
+    if match is None:
+        return path
+    return f"{HIVES[match[1].lower()]}\\{path[match.end() :]}"
+
+
+@lru_cache(maxsize=PATH_CACHE_SIZE)
+def registry_path_key(path: str) -> str:
+    """A key equal for every spelling of the same registry key, to index on."""
+    return normalize_registry_path(path).rstrip("\\").casefold()
+
+
 class RegistryPathDefinition(BaseModel):
     """Represents a single registry key and entry(s) to be modified."""
 
@@ -54,22 +96,11 @@ class RegistryPathDefinition(BaseModel):
     @field_validator("path", mode="after")
     @staticmethod
     def normalize_path(value: str) -> str:
-        mapping = {
-            r"(HKEY_CLASSES_ROOT|HKCR):?\\": r"HKCR\\",
-            r"(HKEY_CURRENT_CONFIG|HKCC):?\\": r"HKCC\\",
-            r"(HKEY_CURRENT_USER|HKCU):?\\": r"HKCU\\",
-            r"(HKEY_LOCAL_MACHINE|HKLM):?\\": r"HKLM\\",
-            r"(HKEY_USERS|HKU):?\\": r"HKU\\",
-        }
-
-        for pattern, repl in mapping.items():
-            value = re.sub(
-                "^(?:Registry::)?" + pattern,
-                repl,
-                value,
-                flags=re.IGNORECASE,
-            )
-        return value
+        return normalize_registry_path(value)
+
+    @property
+    def path_key(self) -> str:
+        return registry_path_key(self.path)
 
     @property
     def registry_path(self) -> str:
@@ -94,6 +125,10 @@ class RegistryPathDefinition(BaseModel):
             case _:
                 assert_never(mode)
 
+    def is_compliant(self, current_value: str, mode: ExecutableActionMode) -> bool:
+        value = self.resolve_value(mode)
+        return value in (NOT_CHANGE, current_value)
+
     def generate_set_script(self, mode: ActionMode) -> str:
         if mode == ActionMode.SKIP:
             return ""
@@ -120,6 +155,13 @@ class RegistryPathDefinition(BaseModel):
 
         return dedent(script)
 
+    def generate_compact_script(self, mode: ExecutableActionMode) -> str:
+        value = self.resolve_value(mode)
+        if value == NOT_CHANGE:
+            return ""
+        exist = "$false" if value == NOT_EXIST else "$true"
+        return f"Set-WcRegKey {quote(f'Registry::{self.path}')} {exist}"
+
     def generate_get_script(self) -> str:
         get_entry = rf"""
             if (Test-Path "{self.registry_path}") {{
@@ -136,11 +178,11 @@ class RegistryEntryDefinition(BaseModel):
 
     name: str = Field(description="The name of the registry value.")
     type: RegistryValueKind = Field(description="The type of the registry value.")
-    old_value: str | NotExistType = Field(
-        description="The default value of the registry entry."
+    old_value: str | list[str] | NotExistType = Field(
+        description="The default value of the registry entry. A list of strings for a MultiString."
     )
-    new_value: str | NotExistType = Field(
-        description="The desired value of the registry entry."
+    new_value: str | list[str] | NotExistType = Field(
+        description="The desired value of the registry entry. A list of strings for a MultiString."
     )
 
     _parent: RegistryPathDefinition = PrivateAttr(default=None)  # ty:ignore[invalid-assignment]
@@ -151,11 +193,15 @@ class RegistryEntryDefinition(BaseModel):
     def registry_path(self) -> str:
         return f"{self._parent.registry_path}"
 
+    @property
+    def key_path(self) -> str:
+        return self._parent.path
+
     @property
     def full_path(self) -> str:
         return f"{self._parent.path}\\{self.name}"
 
-    def resolve_value(self, mode: ExecutableActionMode) -> str:
+    def resolve_value(self, mode: ExecutableActionMode) -> str | list[str]:
         match mode:
             case ActionMode.APPLY:
                 return self.new_value
@@ -164,6 +210,15 @@ class RegistryEntryDefinition(BaseModel):
             case _:
                 assert_never(mode)
 
+    def is_compliant(self, current_value: str, mode: ExecutableActionMode) -> bool:
+        value = self.resolve_value(mode)
+        if isinstance(value, list):
+            return current_value.splitlines() == value
+        if self.type in ("Binary", "MultiString") and value != NOT_EXIST:
+            # multi-valued data is read back one element per line
+            return current_value.split() == value.split()
+        return current_value == value
+
     def with_error_handler(self, script: str) -> str:
         return f"""
             try {{
@@ -185,7 +240,9 @@ class RegistryEntryDefinition(BaseModel):
 
     def generate_set_script(self, mode: ExecutableActionMode) -> str:
         value = self.resolve_value(mode)
-        if self.type == "Binary":
+        if isinstance(value, list):
+            psvalue = quote_array(value)
+        elif self.type == "Binary":
             psvalue = f'("{value.replace('"', '`"')}".split(" ") | % {{ [byte]$_ }})'
         else:
             psvalue = f'"{value.replace('"', '`"')}"'
@@ -200,6 +257,15 @@ class RegistryEntryDefinition(BaseModel):
 
         return dedent(script)
 
+    def generate_compact_script(self, mode: ExecutableActionMode) -> str:
+        value = self.resolve_value(mode)
+        args = f"{quote(f'Registry::{self.key_path}')} {quote(self.name)}"
+        if value == NOT_EXIST:
+            return f"Set-WcRegValue {args} -Remove"
+        if isinstance(value, list):
+            return f"Set-WcRegValue {args} {self.type} {quote_array(value)}"
+        return f"Set-WcRegValue {args} {self.type} {quote(value)}"
+
     def generate_get_script(self) -> str:
         get_entry = self.with_error_handler(rf"""
             Get-ItemPropertyValue -Path "{self.registry_path}" -Name "{self.name}" -ErrorAction Stop
@@ -11,6 +11,8 @@ from pydantic import (
 from winconfig.config.action import ActionMode, ExecutableActionMode
 from winconfig.protocol.state_codes import NOT_EXIST
 
+from .helpers import quote
+
 type SchtaskState = Literal["Enabled", "Disabled"]
 
 
@@ -48,6 +50,10 @@ class SchtaskDefinition(BaseModel):
             case _:
                 assert_never(mode)
 
+    def is_compliant(self, current_value: str, mode: ExecutableActionMode) -> bool:
+        # a missing task cannot be changed, so there is nothing to apply
+        return current_value in (NOT_EXIST, self.resolve_value(mode))
+
     def with_error_handler(self, script: str) -> str:
         return f"""
             try {{
@@ -68,6 +74,10 @@ class SchtaskDefinition(BaseModel):
         """)
         return dedent(script)
 
+    def generate_compact_script(self, mode: ExecutableActionMode) -> str:
+        enabled = "$true" if self.resolve_value(mode) == "Enabled" else "$false"
+        return f"Set-WcTask {quote(self.full_path)} {enabled}"
+
     def generate_get_script(self) -> str:
         get_task = self.with_error_handler(f"""
             $service = New-Object -ComObject "Schedule.Service"
@@ -21,6 +21,10 @@ class ScriptDefinition(BaseModel):
         default="",
         description="The script to run for the default configuration.",
     )
+    exclusive: bool = Field(
+        default=True,
+        description="Whether the script may touch anything and must not run alongside other tasks.",
+    )
 
     model_config = ConfigDict(extra="forbid")
 
@@ -35,3 +39,6 @@ class ScriptDefinition(BaseModel):
 
     def generate_set_script(self, mode: ExecutableActionMode) -> str:
         return dedent(self.resolve_value(mode))
+
+    def generate_compact_script(self, mode: ExecutableActionMode) -> str:
+        return self.generate_set_script(mode)
@@ -10,6 +10,8 @@ from pydantic import (
 from winconfig.config.action import ActionMode, ExecutableActionMode
 from winconfig.protocol.state_codes import NOT_EXIST
 
+from .helpers import quote
+
 type ServiceStartupType = Literal[
     "Automatic",
     "AutomaticDelayedStart",
@@ -32,6 +34,10 @@ class ServiceDefinition(BaseModel):
 
     model_config = ConfigDict(extra="forbid")
 
+    @property
+    def full_path(self) -> str:
+        return self.name
+
     def resolve_value(self, mode: ExecutableActionMode) -> str:
         match mode:
             case ActionMode.APPLY:
@@ -41,6 +47,9 @@ class ServiceDefinition(BaseModel):
             case _:
                 assert_never(mode)
 
+    def is_compliant(self, current_value: str, mode: ExecutableActionMode) -> bool:
+        return current_value in (NOT_EXIST, self.resolve_value(mode))
+
     def with_error_handler(self, script: str) -> str:
         return f"""
             try {{
@@ -74,6 +83,10 @@ class ServiceDefinition(BaseModel):
         script = (service_name if "*" not in self.name else service_name_by_glob) + body
         return dedent(script)
 
+    def generate_compact_script(self, mode: ExecutableActionMode) -> str:
+        startup_type = self.resolve_value(mode).replace("DelayedStart", "")
+        return f"Set-WcSvc {quote(self.name)} {startup_type}"
+
     def generate_get_script(self) -> str:
         script = self.with_error_handler(f"""
             $startupType = (Get-Service -Name "{self.name}" -ErrorAction Stop).StartType
@@ -0,0 +1,147 @@
+from bisect import insort
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from .action import ActionConfig, ActionMode
+from .config import Config
+from .definition import DefinitionBody, DefinitionConfig
+
+type LayerKey = tuple[str, str | None]
+
+
+def layer_keys(root: Mapping[str, Mapping[str, Any]]) -> set[LayerKey]:
+    """The groups, as (group, None), and the entries a layer defines."""
+    return {(group_name, None) for group_name in root} | {
+        (group_name, name) for group_name, group in root.items() for name in group
+    }
+
+
+def format_sources(sources: list[Path]) -> str:
+    """The deciding source first, followed by the ones it overrides."""
+    if not sources:
+        return "default"
+    deciding, *overridden = reversed(sources)
+    if not overridden:
+        return str(deciding)
+    return f"{deciding} (overrides {', '.join(map(str, overridden))})"
+
+
+class LayeredSection:
+    """One section of the config, merged from layers and tracking their sources."""
+
+    def __init__(self, root: dict[str, dict[str, Any]]) -> None:
+        self.root = root
+        self._sources: dict[tuple[str, str], list[int]] = {}
+
+    def sources(self, group_name: str, name: str) -> list[int]:
+        return self._sources.get((group_name, name), [])
+
+    def update(
+        self,
+        layer_index: int,
+        layers: list[Mapping[str, Mapping[str, Any]]],
+        old_root: Mapping[str, Mapping[str, Any]],
+    ) -> None:
+        """Re-merge the entries of one layer whose content changed from old_root.
+
+        Only the entries the layer had or has are resolved again. The merged
+        order only depends on which entries exist, so it is rebuilt just when
+        they do not match anymore.
+        """
+        new_root = layers[layer_index]
+        old_keys, new_keys = layer_keys(old_root), layer_keys(new_root)
+        for group_name, name in old_keys - new_keys:
+            if name is not None:
+                self._sources[group_name, name].remove(layer_index)
+        for group_name, name in new_keys - old_keys:
+            if name is not None:
+                insort(self._sources.setdefault((group_name, name), []), layer_index)
+
+        if old_keys != new_keys:
+            self.rebuild(layers)
+            return
+        for group_name, name in new_keys:
+            if name is not None:
+                source = self._sources[group_name, name][-1]
+                self.root[group_name][name] = layers[source][group_name][name]
+
+    def build(self, layers: list[Mapping[str, Mapping[str, Any]]]) -> None:
+        self._sources.clear()
+        for layer_index, layer in enumerate(layers):
+            for group_name, group in layer.items():
+                for name in group:
+                    self._sources.setdefault((group_name, name), []).append(layer_index)
+        self.rebuild(layers)
+
+    def rebuild(self, layers: list[Mapping[str, Mapping[str, Any]]]) -> None:
+        # same order as merging the layers one after another
+        self.root.clear()
+        for layer in layers:
+            for group_name, group in layer.items():
+                self.root.setdefault(group_name, {}).update(group)
+
+
+def empty_config() -> Config:
+    return Config(
+        definition_config=DefinitionConfig(root={}),
+        action_config=ActionConfig(root={}),
+    )
+
+
+class LayeredConfig:
+    """Config files kept as separate layers, later layers overriding earlier ones.
+
+    The merged config is updated in place when a layer changes, and every merged
+    definition and action mode can be traced back to the layer that set it.
+    """
+
+    def __init__(self, layers: Iterable[tuple[Path, Config]] = ()) -> None:
+        self.config = empty_config()
+        # counts the changes, for what is derived from the config to notice them
+        self.version = 0
+        self._layers: dict[Path, Config] = dict(layers)
+        self._definitions = LayeredSection(self.config.definition_config.root)
+        self._actions = LayeredSection(self.config.action_config.root)
+        configs = list(self._layers.values())
+        self._definitions.build([c.definition_config.root for c in configs])
+        self._actions.build([c.action_config.root for c in configs])
+
+    @property
+    def sources(self) -> list[Path]:
+        return list(self._layers)
+
+    def layer(self, source: Path) -> Config | None:
+        return self._layers.get(source)
+
+    def set_layer(self, source: Path, config: Config) -> None:
+        """Replace the layer of the source where it is, or add it on top."""
+        self.version += 1
+        old_config = self._layers.get(source, empty_config())
+        self._layers[source] = config
+        layer_index = self.sources.index(source)
+        configs = list(self._layers.values())
+        self._definitions.update(
+            layer_index,
+            [c.definition_config.root for c in configs],
+            old_config.definition_config.root,
+        )
+        self._actions.update(
+            layer_index,
+            [c.action_config.root for c in configs],
+            old_config.action_config.root,
+        )
+
+    def definition(self, group_name: str, name: str) -> DefinitionBody | None:
+        return self.config.definition_config.root.get(group_name, {}).get(name)
+
+    def action(self, group_name: str, name: str) -> ActionMode | None:
+        return self.config.action_config.root.get(group_name, {}).get(name)
+
+    def definition_sources(self, group_name: str, name: str) -> list[Path]:
+        """The layers defining the task, the deciding one last."""
+        return [self.sources[i] for i in self._definitions.sources(group_name, name)]
+
+    def action_sources(self, group_name: str, name: str) -> list[Path]:
+        """The layers setting the mode of the task, the deciding one last."""
+        return [self.sources[i] for i in self._actions.sources(group_name, name)]
@@ -0,0 +1,28 @@
+from multiprocessing.connection import Client
+
+from loguru import logger
+
+from winconfig.exceptions import DaemonError, DaemonNotRunningError
+
+from .protocol import default_address, read_key, receive_message, send_message
+
+
+class DaemonClient:
+    """Sends requests to a running daemon, one connection per request."""
+
+    def __init__(self, address: str | None = None) -> None:
+        self.address = address or default_address()
+
+    def request(self, command: str, **options: object) -> str:
+        """Run the command on the daemon, replay its logs and return its output."""
+        try:
+            with Client(self.address, authkey=read_key()) as connection:
+                send_message(connection, {"command": command, **options})
+                response = receive_message(connection)
+        except (FileNotFoundError, ConnectionRefusedError) as e:
+            raise DaemonNotRunningError(self.address) from e
+        for level, message in response["logs"]:
+            logger.log(level, message)
+        if response["error"] is not None:
+            raise DaemonError(response["error"])
+        return response["output"]
@@ -0,0 +1,53 @@
+"""The JSON messages between the daemon and its clients.
+
+Only the standard library is used here, so a client starts without loading
+pydantic, the config or the engine.
+"""
+
+import getpass
+import json
+import secrets
+import sys
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any
+
+from winconfig.cache_dir import default_cache_dir
+
+type Message = dict[str, Any]
+
+PIPE_PREFIX = r"\\.\pipe\winconfig"
+
+
+def default_address() -> str:
+    if sys.platform == "win32":
+        # pipe names are global, unlike the cache directory holding the socket
+        return f"{PIPE_PREFIX}-{getpass.getuser()}"
+    return str(default_cache_dir() / "daemon.sock")
+
+
+def key_path() -> Path:
+    return default_cache_dir() / "daemon.key"
+
+
+def create_key() -> bytes:
+    """Write a new key that only the current user can read for clients to use."""
+    key = secrets.token_bytes(32)
+    path = key_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    path.touch(mode=0o600)
+    path.write_bytes(key)
+    return key
+
+
+def read_key() -> bytes:
+    return key_path().read_bytes()
+
+
+def send_message(connection: Connection, message: Message) -> None:
+    connection.send_bytes(json.dumps(message).encode())
+
+
+def receive_message(connection: Connection) -> Message:
+    return json.loads(connection.recv_bytes())
@@ -0,0 +1,146 @@
+import io
+import socket
+from collections.abc import Iterable
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+from winconfig.engine import Engine
+from winconfig.engine.parallel import RunspacePool
+from winconfig.engine.snapshot import SnapshotFormat
+from winconfig.engine.watch import ConfigPoller
+from winconfig.exceptions import DaemonAlreadyRunningError
+
+from .protocol import create_key, default_address, receive_message, send_message
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+
+class DaemonRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    command: Literal["apply", "revert", "plan", "snapshot", "ping", "stop"]
+    batch: bool = False
+    only_changed: bool = False
+    compact: bool = False
+    reverse: bool = False
+    graph: bool = False
+    sources: bool = False
+    format: SnapshotFormat = "yaml"
+
+
+class DaemonResponse(BaseModel):
+    output: str = ""
+    logs: list[tuple[str, str]] = []
+    error: str | None = None
+
+
+class DaemonServer:
+    """Serves requests on a local socket or named pipe with one warm engine.
+
+    The runspaces are opened once and kept for every request. Config files
+    that changed since the last request are loaded again before it runs.
+    Requests are handled one at a time, in the order they connect.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        config_paths: Iterable[Path],
+        *,
+        address: str | None = None,
+        jobs: int = 1,
+    ) -> None:
+        self.engine = engine
+        self.pool = RunspacePool(engine.executor_factory, size=jobs)
+        self.engine.runspace_pool = self.pool
+        self.poller = ConfigPoller(config_paths)
+        self.address = address or default_address()
+        self._stopped = False
+
+    def handle(self, request: DaemonRequest) -> str:
+        if changed_paths := self.poller.changed():
+            logger.info(f"Reloading: {', '.join(map(str, changed_paths))}")
+            # a file that fails to load stays changed, failing every request
+            # until it is fixed instead of running the previous config
+            self.engine.reload(*changed_paths)
+            self.poller.record(changed_paths)
+        match request.command:
+            case "apply" | "revert":
+                self.engine.run(
+                    reverse=request.command == "revert",
+                    batch=request.batch,
+                    only_changed=request.only_changed,
+                    compact=request.compact,
+                )
+                return ""
+            case "plan":
+                return self.engine.describe_plan(
+                    reverse=request.reverse,
+                    graph=request.graph,
+                    sources=request.sources,
+                )
+            case "snapshot":
+                stream = io.StringIO()
+                count = self.engine.snapshot(stream, request.format)
+                logger.info(f"Snapshot: {count} items saved")
+                return stream.getvalue()
+            case "ping":
+                return "pong"
+            case "stop":
+                self._stopped = True
+                return ""
+
+    def respond(self, connection: Connection) -> None:
+        response = DaemonResponse()
+
+        def sink(message: "Message") -> None:
+            record = message.record
+            response.logs.append((record["level"].name, record["message"]))
+
+        sink_id = logger.add(sink, level="DEBUG", format="{message}")
+        try:
+            request = DaemonRequest.model_validate(receive_message(connection))
+            response.output = self.handle(request)
+        except ValidationError as e:
+            response.error = f"Invalid request: {e}"
+        except Exception as e:  # noqa: BLE001
+            response.error = str(e)
+        finally:
+            logger.remove(sink_id)
+        send_message(connection, response.model_dump())
+
+    def remove_stale_socket(self) -> None:
+        """Remove the socket of a daemon that did not stop cleanly."""
+        if not Path(self.address).is_socket():
+            return
+        with socket.socket(socket.AF_UNIX) as probe:
+            try:
+                probe.connect(self.address)
+            except ConnectionRefusedError:
+                Path(self.address).unlink()
+                return
+        raise DaemonAlreadyRunningError(self.address)
+
+    def serve(self) -> None:
+        self.remove_stale_socket()
+        with self.pool, Listener(self.address, authkey=create_key()) as listener:
+            logger.info(f"Listening on {self.address}")
+            while not self._stopped:
+                try:
+                    connection = listener.accept()
+                except (OSError, EOFError, AuthenticationError) as e:
+                    # a client failing the authentication or hanging up early
+                    logger.warning(f"Rejected a connection: {e}")
+                    continue
+                with connection:
+                    try:
+                        self.respond(connection)
+                    except OSError as e:
+                        logger.warning(f"Lost a connection: {e}")
+        logger.info("Stopped")
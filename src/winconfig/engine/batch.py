@@ -0,0 +1,89 @@
+from textwrap import dedent
+
+from pydantic import BaseModel, ValidationError
+
+from winconfig.config.definition import quote
+from winconfig.exceptions import PowerShellAdminRequiredError, PowerShellError
+from winconfig.protocol.state_codes import PERMISSION_DENIED
+
+
+class BatchEntry(BaseModel):
+    """A named script to be run as one section of a batch."""
+
+    name: str
+    script: str
+
+
+class BatchResult(BaseModel):
+    """The output and errors of a single batch section."""
+
+    name: str
+    output: list[str] = []
+    errors: list[str] = []
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.output).strip()
+
+    def raise_for_error(self) -> None:
+        if self.errors:
+            raise PowerShellError("\n".join(self.errors).strip())
+        if PERMISSION_DENIED in self.output:
+            raise PowerShellAdminRequiredError
+
+
+def generate_section(entry: BatchEntry, *, stop_on_error: bool = True) -> str:
+    # the entry script is inserted without re-indenting to keep here-strings intact
+    head = f"""
+        #region {entry.name}
+        $wcResult = [ordered]@{{ name = {quote(entry.name)}; output = @(); errors = @() }}
+        try {{
+            foreach ($wcLine in (& {{
+    """
+    tail = """
+            } 2>&1)) {
+                if ($wcLine -is [System.Management.Automation.ErrorRecord]) {
+                    $wcResult.errors += "$wcLine"
+                } else {
+                    $wcResult.output += "$wcLine"
+                }
+            }
+        }
+        catch {
+            $wcResult.errors += "$_"
+        }
+        $wcResult | ConvertTo-Json -Compress
+    """
+    stop = "if ($wcResult.errors.Count -gt 0) { return }\n" if stop_on_error else ""
+    return (
+        dedent(head)
+        + dedent(entry.script).strip()
+        + dedent(tail)
+        + stop
+        + "#endregion\n"
+    )
+
+
+def generate_batch_script(
+    entries: list[BatchEntry], prelude: str = "", *, stop_on_error: bool = True
+) -> str:
+    """Combine the entries into one script that reports a result per entry.
+
+    Each entry runs in its own scope with its output captured, so the only lines
+    written by the batch are the JSON results. Unless stop_on_error is disabled,
+    the batch stops after the first failing entry, just like running the entries
+    one by one would.
+    """
+    return dedent(prelude) + "".join(
+        generate_section(entry, stop_on_error=stop_on_error) for entry in entries
+    )
+
+
+def parse_batch_output(output: str) -> list[BatchResult]:
+    results = []
+    for line in output.splitlines():
+        try:
+            results.append(BatchResult.model_validate_json(line))
+        except ValidationError:
+            continue
+    return results
@@ -0,0 +1,75 @@
+from .batch import BatchEntry, generate_batch_script, parse_batch_output
+from .executor import ScriptExecutor
+from .registry import RegistryReader, is_registry_item, registry_states
+from .task import StatefulItem, TaskRun
+
+
+def read_states(
+    executor: ScriptExecutor, items: list[StatefulItem]
+) -> list[str | None]:
+    """Read the current value of every item in a single invocation.
+
+    Items whose value could not be read are returned as None.
+    """
+    if not items:
+        return []
+    batch_script = generate_batch_script(
+        [
+            BatchEntry(name=str(i), script=item.generate_get_script())
+            for i, item in enumerate(items)
+        ],
+        stop_on_error=False,
+    )
+    results = {
+        result.name: result
+        for result in parse_batch_output(executor.run(batch_script))
+        if not result.errors
+    }
+    return [
+        results[str(i)].text if str(i) in results else None for i in range(len(items))
+    ]
+
+
+def exclude_compliant(
+    executor: ScriptExecutor,
+    task_runs: list[TaskRun],
+    registry_reader: RegistryReader | None = None,
+) -> None:
+    """Narrow each executable task run down to the items that differ.
+
+    A task run left with nothing to change is marked compliant and will not
+    be executed. Custom scripts cannot be read back, so they always run. With
+    a registry_reader, registry items are read through it instead of scripts.
+    """
+    executable_runs = [task_run for task_run in task_runs if task_run.executable]
+    items = [item for task_run in executable_runs for item in task_run.task.items]
+    if registry_reader is None:
+        states = iter(read_states(executor, items))
+    else:
+        registry_items = [item for item in items if is_registry_item(item)]
+        registry_values = iter(registry_states(registry_reader, registry_items))
+        other_values = iter(
+            read_states(
+                executor, [item for item in items if not is_registry_item(item)]
+            )
+        )
+        states = (
+            next(registry_values if is_registry_item(item) else other_values)
+            for item in items
+        )
+
+    for task_run in executable_runs:
+        mode = task_run.executable_mode
+        changed_items = []
+        for item in task_run.task.items:
+            current_value = next(states)
+            if current_value is not None and item.is_compliant(current_value, mode):
+                task_run.compliant_items.append(item.full_path)
+            else:
+                changed_items.append(item)
+
+        task_run.items = changed_items
+        if changed_items or task_run.task.script.resolve_value(mode).strip():
+            task_run.generate(changed_items)
+        else:
+            task_run.compliant = True
@@ -1,73 +1,499 @@
+from collections.abc import Collection, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from functools import partial
 from pathlib import Path
+from threading import Event
+from time import perf_counter
+from typing import TextIO
 
 from loguru import logger
 
 from winconfig.config.action import ActionMode
+from winconfig.config.cache import ConfigCache, default_config_cache
 from winconfig.config.config import Config
-from winconfig.exceptions import TaskError
+from winconfig.config.layers import LayeredConfig, empty_config, format_sources
+from winconfig.exceptions import ActionConfigValidationError, RunCancelledError
 from winconfig.resources import BUILTIN_DEFINITION_PATH
 
-from .powershell import PowershellRunspace
-from .task import Task, TaskGroup
+from .batch import BatchEntry, BatchResult, generate_batch_script, parse_batch_output
+from .drift import exclude_compliant
+from .executor import ExecutorFactory, ScriptExecutor, create_powershell_executor
+from .graph import TaskGraph
+from .hooks import EngineHooks, HookList, LogHooks
+from .parallel import OrderedReporter, RunspacePool, split_evenly
+from .registry import PowershellRegistryReader, RegistryBackend, RegistryReader
+from .report import RunReport
+from .script_cache import ScriptCache, default_script_cache
+from .selection import TaskIndex, TaskSelection
+from .snapshot import (
+    SnapshotFormat,
+    definition_items,
+    open_atomic,
+    read_snapshot,
+    snapshot_format,
+    write_snapshot,
+)
+from .task import Task, TaskGroup, TaskKey, TaskRun
+from .timing import Timings, recording, timed
 
 
 class Engine:
     config: Config
+    layers: LayeredConfig
+    executor_factory: ExecutorFactory
+    script_cache: ScriptCache
+    registry_backend: RegistryBackend | None
+    hooks: HookList
+    # kept open across runs by a long-lived process, keeping its runspaces warm
+    runspace_pool: RunspacePool | None = None
+    # the time spent loading and validating the config, in milliseconds
+    timings: Timings
 
-    def __init__(self, *config_paths: Path, validate: bool = True) -> None:
-        self.config = Config.from_yaml(BUILTIN_DEFINITION_PATH).merge_from_yaml(
-            *config_paths
+    def __init__(  # noqa: PLR0913
+        self,
+        *config_paths: Path,
+        validate: bool = True,
+        executor_factory: ExecutorFactory = create_powershell_executor,
+        script_cache: ScriptCache = default_script_cache,
+        registry_backend: RegistryBackend | None = None,
+        config_cache: ConfigCache | None = default_config_cache,
+        hooks: Iterable[EngineHooks] | None = None,
+    ) -> None:
+        self._load = (
+            Config.from_yaml_files if config_cache is None else config_cache.load_many
         )
+        self.validate = validate
+        self.timings = {}
+        paths = [BUILTIN_DEFINITION_PATH, *config_paths]
+        with recording(self.timings):
+            with timed("config_load"):
+                configs = self._load(paths)
+                self.layers = LayeredConfig(zip(paths, configs, strict=True))
+            self.config = self.layers.config
+            if validate:
+                with timed("validation"):
+                    self.config.validate_action_config()
+        self.executor_factory = executor_factory
+        self.script_cache = script_cache
+        self.registry_backend = registry_backend
+        self.hooks = HookList([LogHooks()] if hooks is None else hooks)
+        self._task_groups: list[TaskGroup] | None = None
+        self._task_index: TaskIndex | None = None
+        self._tasks: dict[TaskKey, Task] = {}
+        self._tasks_version = 0
 
-        if validate:
-            self.config.validate_action_config()
+    def reload(self, *config_paths: Path) -> None:
+        """Load the config files again, re-merging only what they changed.
+
+        Files that are not layers yet are added on top. When the result is not
+        valid, the previous layers are restored and the error is raised.
+        """
+        self.timings = {}
+        with recording(self.timings):
+            with timed("config_load"):
+                configs = self._load(list(config_paths))
+                previous = {path: self.layers.layer(path) for path in config_paths}
+                for path, config in zip(config_paths, configs, strict=True):
+                    self.layers.set_layer(path, config)
+            if self.validate:
+                with timed("validation"):
+                    try:
+                        self.config.validate_action_config()
+                    except ActionConfigValidationError:
+                        # a layer added by the reload stays, emptied
+                        for path, config in previous.items():
+                            self.layers.set_layer(path, config or empty_config())
+                        raise
+
+    def _forget_stale_tasks(self) -> None:
+        if self._tasks_version != self.layers.version:
+            self._task_groups = None
+            self._task_index = None
+            self._tasks = {}
+            self._tasks_version = self.layers.version
 
     @property
     def task_groups(self) -> list["TaskGroup"]:
-        return [
-            TaskGroup(
-                name=definition_group_name,
-                tasks=[
-                    Task(
-                        group_name=definition_group_name,
-                        name=definition_name,
-                        mode=(
-                            self.config.action_config.root.get(
-                                definition_group_name, {}
-                            ).get(definition_name, None)
+        """The tasks of every definition, built once until the config changes.
+
+        The tasks share the definition bodies of the config instead of copies.
+        """
+        self._forget_stale_tasks()
+        if self._task_groups is None:
+            self._task_groups = [
+                TaskGroup.model_construct(
+                    name=group_name,
+                    tasks=[self.task(group_name, name) for name in definition_group],
+                )
+                for group_name, definition_group in self.config.definition_config.root.items()
+            ]
+        return self._task_groups
+
+    @property
+    def task_index(self) -> TaskIndex:
+        self._forget_stale_tasks()
+        if self._task_index is None:
+            self._task_index = TaskIndex(self.config.definition_config)
+        return self._task_index
+
+    def task(self, group_name: str, name: str) -> Task:
+        """The task of a definition, built on first use until the config changes."""
+        self._forget_stale_tasks()
+        key = (group_name, name)
+        if key not in self._tasks:
+            self._tasks[key] = Task.from_definition(
+                group_name,
+                name,
+                self.config.action_config.root.get(group_name, {}).get(name),
+                self.config.definition_config.root[group_name][name],
+            )
+        return self._tasks[key]
+
+    def select(self, selection: TaskSelection) -> list[TaskKey]:
+        """The keys of the selected tasks in definition order, building no task."""
+        return self.task_index.select(selection)
+
+    def set_mode(self, group_name: str, name: str, mode: ActionMode) -> None:
+        """Change the mode of a task in the config and in the built task."""
+        self._forget_stale_tasks()
+        self.config.action_config.root.setdefault(group_name, {})[name] = mode
+        if (group_name, name) in self._tasks:
+            self._tasks[group_name, name].mode = mode
+
+    def open_runspace_pool(self, jobs: int) -> AbstractContextManager[RunspacePool]:
+        """The kept runspace pool if there is one, otherwise a new pool of jobs."""
+        if self.runspace_pool is not None:
+            return nullcontext(self.runspace_pool)
+        return RunspacePool(self.executor_factory, size=jobs)
+
+    def plan(
+        self,
+        *,
+        reverse: bool,
+        compact: bool = False,
+        tasks: Collection[TaskKey] | None = None,
+    ) -> list[TaskRun]:
+        """Generate the scripts of the configured tasks, or only the given ones.
+
+        Only the given tasks are built, and they are planned in definition order.
+        """
+        if tasks is None:
+            planned = [task for group in self.task_groups for task in group.tasks]
+        else:
+            order = self.task_index.order
+            keys = sorted(set(tasks) & order.keys(), key=order.__getitem__)
+            planned = [self.task(*key) for key in keys]
+        task_runs = []
+        for task in planned:
+            task_run = TaskRun(
+                task=task,
+                mode=task.mode and task.mode.resolve(reverse=reverse),
+                items=task.items,
+                compact=compact,
+                native_registry=self.registry_backend is not None,
+            )
+            if task_run.executable:
+                with recording(task_run.timings), timed("generate"):
+                    if task_run.native_registry:
+                        task_run.generate()
+                    else:
+                        task_run.script = self.script_cache.get(
+                            task, task_run.executable_mode, compact=compact
+                        )
+                self.hooks.on_generate(
+                    task_run,
+                    task_run.timings["generate"],
+                    len(task_run.script.encode()),
+                )
+            task_runs.append(task_run)
+        self.script_cache.save()
+        return task_runs
+
+    def run(  # noqa: PLR0913
+        self,
+        *,
+        reverse: bool,
+        batch: bool = False,
+        jobs: int = 1,
+        only_changed: bool = False,
+        snapshot_path: Path | None = None,
+        compact: bool = False,
+        tasks: Collection[TaskKey] | None = None,
+        report: RunReport | None = None,
+        cancel: Event | None = None,
+    ) -> None:
+        """Run the configured tasks, or only the given ones.
+
+        With batch, the tasks handed to a runspace are combined into a single
+        invocation. With more than one job, independent tasks run concurrently
+        on a pool of runspaces while results are still reported in task order.
+        With only_changed, the current state is read first and only the items
+        that differ from the desired state are written. With snapshot_path, the
+        prior state of the items about to be written is saved there first. With
+        compact, items are written by one-line calls to shared helper functions.
+        With a registry backend, registry items are read and written through it
+        instead of PowerShell. A kept runspace_pool is used instead of jobs.
+        With report, the timings and outcome of every task are added to it,
+        even when the run fails. Setting cancel, from any thread, stops the run
+        before the next task or batch starts by raising RunCancelledError.
+        """
+        phases = {} if report is None else report.phases
+        phases.update(self.timings)
+        with recording(phases), timed("run"):
+            with timed("plan"):
+                task_runs = self.plan(reverse=reverse, compact=compact, tasks=tasks)
+            try:
+                self._execute(
+                    task_runs,
+                    batch=batch,
+                    jobs=jobs,
+                    only_changed=only_changed,
+                    snapshot_path=snapshot_path,
+                    cancel=cancel,
+                )
+            finally:
+                if report is not None:
+                    report.add_task_runs(task_runs)
+
+    def _execute(  # noqa: PLR0913
+        self,
+        task_runs: list[TaskRun],
+        *,
+        batch: bool,
+        jobs: int,
+        only_changed: bool,
+        snapshot_path: Path | None,
+        cancel: Event | None,
+    ) -> None:
+        reporter = OrderedReporter(task_runs, self.hooks)
+        with self.open_runspace_pool(jobs) as pool:
+            if only_changed:
+                with timed("read_state"):
+                    exclude_compliant(pool.executor, task_runs, self.registry_backend)
+            executable_runs = [e for e in task_runs if e.executable]
+            if snapshot_path is not None:
+                items = [item for e in executable_runs for item in e.items]
+                with timed("snapshot"), open_atomic(snapshot_path) as stream:
+                    count = write_snapshot(
+                        read_snapshot(
+                            items,
+                            self.registry_backend
+                            or PowershellRegistryReader(pool.executor),
+                            pool.executor,
                         ),
-                        **definition_body.model_dump(),
+                        stream,
+                        snapshot_format(str(snapshot_path)),
                     )
-                    for definition_name, definition_body in definition_group.items()
-                ],
-            )
-            for definition_group_name, definition_group in self.config.definition_config.root.items()
+                logger.info(f"Snapshot: {count} items saved to {snapshot_path}")
+            if pool.size > 1:
+                graph = TaskGraph([task_run.task for task_run in executable_runs])
+                waves = [[executable_runs[i] for i in w] for w in graph.wave_indices]
+            else:
+                waves = [executable_runs]
+            with timed("execute"):
+                for wave in waves:
+                    if batch:
+                        units = pool.map(
+                            partial(
+                                execute_batch,
+                                registry_backend=self.registry_backend,
+                                hooks=self.hooks,
+                            ),
+                            split_evenly(wave, pool.size),
+                        )
+                    else:
+                        units = (
+                            [e]
+                            for e in pool.map(
+                                partial(
+                                    execute_script,
+                                    registry_backend=self.registry_backend,
+                                    hooks=self.hooks,
+                                ),
+                                wave,
+                            )
+                        )
+                    for unit in units:
+                        reporter.finish(unit)
+                        # the next unit has not started, or is cancelled with the pool
+                        if cancel is not None and cancel.is_set():
+                            raise RunCancelledError
+                    # the next wave may hold tasks conflicting with a failed one,
+                    # which a sequential run would never have reached
+                    reporter.raise_for_failure()
+                reporter.finish([])
+
+    def snapshot(
+        self,
+        stream: TextIO,
+        fmt: SnapshotFormat,
+        registry_reader: RegistryReader | None = None,
+    ) -> int:
+        """Write the current state of every defined item and return the count."""
+        executor = (
+            self.runspace_pool.executor
+            if self.runspace_pool is not None
+            else self.executor_factory()
+        )
+        items = read_snapshot(
+            definition_items(self.config.definition_config),
+            registry_reader
+            or self.registry_backend
+            or PowershellRegistryReader(executor),
+            executor,
+        )
+        return write_snapshot(items, stream, fmt)
+
+    def describe_plan(
+        self, *, reverse: bool, graph: bool = False, sources: bool = False
+    ) -> str:
+        """List the tasks a run would execute, or their waves with graph.
+
+        With sources, the config files that decided each task are listed too.
+        """
+        resolved = self.resolved_tasks(reverse=reverse)
+        if graph:
+            return TaskGraph([task for task, _ in resolved]).describe()
+        lines = []
+        for task, mode in resolved:
+            lines.append(f"{task.full_name}[{mode}]")
+            if sources:
+                action_sources = self.layers.action_sources(*task.key)
+                definition_sources = self.layers.definition_sources(*task.key)
+                lines.append(f"  mode: {format_sources(action_sources)}")
+                lines.append(f"  definition: {format_sources(definition_sources)}")
+        return "\n".join(lines)
+
+    def resolved_tasks(self, *, reverse: bool) -> list[tuple[Task, ActionMode]]:
+        """The tasks a run would execute, along with their resolved mode."""
+        return [
+            (task, mode)
+            for task_group in self.task_groups
+            for task in task_group.tasks
+            if task.mode is not None
+            and (mode := task.mode.resolve(reverse=reverse)) != ActionMode.SKIP
         ]
 
-    def run(self, *, reverse: bool) -> None:
-        powershell = PowershellRunspace()
-        logger.debug(f"Setup PowerShell: version {powershell.runspace.Version}")
-
-        for task_group in self.task_groups:
-            for task in task_group.tasks:
-                if task.mode is None:
-                    logger.debug(f"NoAction: {task.full_name}")
-                    continue
-                action_mode = task.mode.resolve(reverse=reverse)
-                if action_mode == ActionMode.SKIP:
-                    logger.info(f"Skipped: {task.full_name}[{action_mode}]")
-                    continue
-                script = task.generate_script(action_mode).strip()
-                try:
-                    powershell.run(script)
-                    logger.info(f"Success: {task.full_name}[{action_mode}]")
-                    logger.debug(
-                        f"{task.full_name}[{action_mode}]:\n```powershell\n{script}\n```"
+    def graph(self, *, reverse: bool = False) -> TaskGraph:
+        """Build the conflict graph of the tasks a run would execute."""
+        return TaskGraph([task for task, _ in self.resolved_tasks(reverse=reverse)])
+
+
+NO_HOOKS = EngineHooks()
+
+
+def invoke(
+    executor: ScriptExecutor,
+    script: str,
+    task_runs: list[TaskRun],
+    hooks: EngineHooks,
+) -> str:
+    output = ""
+    start = perf_counter()
+    try:
+        output = executor.run(script)
+    finally:
+        hooks.on_invoke(
+            task_runs,
+            (perf_counter() - start) * 1000,
+            len(script.encode()),
+            len(output.encode()),
+        )
+    return output
+
+
+def execute_script(
+    executor: ScriptExecutor,
+    task_run: TaskRun,
+    registry_backend: RegistryBackend | None = None,
+    hooks: EngineHooks = NO_HOOKS,
+) -> TaskRun:
+    if task_run.executable:
+        hooks.on_task_start(task_run)
+        with recording(task_run.timings), timed("execute"):
+            try:
+                if registry_backend is not None and task_run.registry_writes:
+                    with timed("registry_write"):
+                        registry_backend.write_keys(task_run.registry_writes)
+                # a native run without a script has nothing left for PowerShell
+                if task_run.script or not task_run.native_registry:
+                    invoke(
+                        executor, task_run.prelude + task_run.script, [task_run], hooks
                     )
-                except Exception as e:
-                    raise TaskError(
-                        task_name=task.full_name,
-                        action_mode=action_mode,
-                        script=script,
-                        exception=e,
-                    ) from e
+            except Exception as e:  # noqa: BLE001
+                task_run.error = e
+    return task_run
+
+
+def execute_batch(
+    executor: ScriptExecutor,
+    task_runs: list[TaskRun],
+    registry_backend: RegistryBackend | None = None,
+    hooks: EngineHooks = NO_HOOKS,
+) -> list[TaskRun]:
+    """Run the executable task runs in as few PowerShell invocations as possible.
+
+    Scripts are combined into a single invocation, which is only split where
+    registry writes have to happen in between to keep the task order.
+    """
+    pending: list[TaskRun] = []
+    for task_run in task_runs:
+        if not task_run.executable:
+            continue
+        hooks.on_task_start(task_run)
+        if registry_backend is not None and task_run.registry_writes:
+            if not run_batch(executor, pending, hooks):
+                return task_runs
+            pending = []
+            try:
+                # timed as executing, like the writes of a task run on its own
+                with (
+                    recording(task_run.timings),
+                    timed("execute"),
+                    timed("registry_write"),
+                ):
+                    registry_backend.write_keys(task_run.registry_writes)
+            except Exception as e:  # noqa: BLE001
+                task_run.error = e
+                return task_runs
+        if task_run.script or not task_run.native_registry:
+            pending.append(task_run)
+    run_batch(executor, pending, hooks)
+    return task_runs
+
+
+def run_batch(
+    executor: ScriptExecutor, task_runs: list[TaskRun], hooks: EngineHooks = NO_HOOKS
+) -> bool:
+    """Run the task runs in a single invocation and return whether all succeeded."""
+    if not task_runs:
+        return True
+
+    batch_script = generate_batch_script(
+        [
+            BatchEntry(name=task_run.task.full_name, script=task_run.script)
+            for task_run in task_runs
+        ],
+        prelude="".join(dict.fromkeys(e.prelude for e in task_runs)),
+    )
+    batch_timings: Timings = {}
+    for task_run in task_runs:
+        task_run.batch_timings = batch_timings
+    try:
+        with recording(batch_timings), timed("execute"):
+            output = invoke(executor, batch_script, task_runs, hooks)
+    except Exception as e:  # noqa: BLE001
+        task_runs[0].error = e
+        return False
+
+    results = {result.name: result for result in parse_batch_output(output)}
+    for task_run in task_runs:
+        name = task_run.task.full_name
+        result = results.get(
+            name, BatchResult(name=name, errors=["No result was returned"])
+        )
+        try:
+            result.raise_for_error()
+        except Exception as e:  # noqa: BLE001
+            task_run.error = e
+    return all(task_run.error is None for task_run in task_runs)
@@ -0,0 +1,30 @@
+from collections.abc import Callable
+from typing import Protocol
+
+
+class ScriptExecutor(Protocol):
+    """Runs a PowerShell script and returns its joined standard output."""
+
+    def run(self, script: str) -> str: ...
+
+
+type ExecutorFactory = Callable[[], ScriptExecutor]
+
+
+def create_powershell_executor() -> ScriptExecutor:
+    # imported lazily so the engine stays importable where the CLR is unavailable
+    from .powershell import PowershellRunspace  # noqa: PLC0415
+
+    return PowershellRunspace()
+
+
+def shared_executor_factory(executor_factory: ExecutorFactory) -> ExecutorFactory:
+    """A factory that creates one executor on first use and always returns it."""
+    executors: list[ScriptExecutor] = []
+
+    def factory() -> ScriptExecutor:
+        if not executors:
+            executors.append(executor_factory())
+        return executors[0]
+
+    return factory
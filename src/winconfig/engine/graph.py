@@ -0,0 +1,164 @@
+from collections import defaultdict
+from fnmatch import fnmatchcase
+from typing import Literal, NamedTuple
+
+from .task import Task
+
+type ResourceKind = Literal["registry", "service", "schtask"]
+
+
+class Resource(NamedTuple):
+    """A normalized system resource touched by a task."""
+
+    kind: ResourceKind
+    key: str
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.key}"
+
+
+def task_resources(task: Task) -> set[Resource]:
+    return (
+        {Resource("registry", registry.path_key) for registry in task.registries}
+        | {Resource("service", service.name.casefold()) for service in task.services}
+        | {
+            Resource("schtask", schtask.formatted_path.casefold())
+            for schtask in task.scheduled_tasks
+        }
+    )
+
+
+def is_exclusive(task: Task) -> bool:
+    """Whether the task runs a custom script that may touch anything."""
+    script = task.script
+    return script.exclusive and bool(script.apply.strip() or script.revert.strip())
+
+
+def registry_ancestors(key: str) -> list[str]:
+    parts = key.split("\\")
+    return ["\\".join(parts[:i]) for i in range(1, len(parts))]
+
+
+class TaskGraph:
+    """A resource-indexed conflict graph over tasks.
+
+    Two tasks conflict when they touch the same service or scheduled task, or
+    registry keys where one contains the other. Tasks with an exclusive custom
+    script conflict with every other task. A task depends on every earlier task
+    it conflicts with, so conflicting tasks keep their configured order.
+    """
+
+    tasks: list[Task]
+    resources: dict[Resource, list[Task]]
+    dependencies: list[set[int]]
+
+    def __init__(self, tasks: list[Task]) -> None:
+        self.tasks = tasks
+        self.resources = defaultdict(list)
+        self._index: dict[Resource, set[int]] = defaultdict(set)
+        self._subtree: dict[str, set[int]] = defaultdict(set)
+        self._globs: dict[Resource, set[int]] = defaultdict(set)
+        self._exclusive: set[int] = set()
+
+        task_resource_sets = [task_resources(task) for task in tasks]
+        for i, (task, resources) in enumerate(
+            zip(tasks, task_resource_sets, strict=True)
+        ):
+            if is_exclusive(task):
+                self._exclusive.add(i)
+            for resource in sorted(resources):
+                self.resources[resource].append(task)
+                self._index[resource].add(i)
+                if resource.kind == "registry":
+                    for ancestor in registry_ancestors(resource.key):
+                        self._subtree[ancestor].add(i)
+                elif "*" in resource.key or "?" in resource.key:
+                    self._globs[resource].add(i)
+
+        self.dependencies = [
+            {j for j in self._conflicts(i, resources) if j < i}
+            for i, resources in enumerate(task_resource_sets)
+        ]
+
+    def _conflicts(self, i: int, resources: set[Resource]) -> set[int]:
+        if i in self._exclusive:
+            return set(range(len(self.tasks))) - {i}
+
+        conflicts = set(self._exclusive)
+        for resource in resources:
+            conflicts |= self._index[resource]
+            if resource.kind == "registry":
+                conflicts |= self._subtree[resource.key]
+                for ancestor in registry_ancestors(resource.key):
+                    conflicts |= self._index[Resource("registry", ancestor)]
+            elif resource in self._globs:
+                conflicts |= {
+                    j
+                    for other, indices in self._index.items()
+                    if other.kind == resource.kind
+                    and fnmatchcase(other.key, resource.key)
+                    for j in indices
+                }
+            else:
+                for glob, indices in self._globs.items():
+                    if glob.kind == resource.kind and fnmatchcase(
+                        resource.key, glob.key
+                    ):
+                        conflicts |= indices
+        conflicts.discard(i)
+        return conflicts
+
+    @property
+    def levels(self) -> list[int]:
+        """The wave each task belongs to, one past its latest dependency."""
+        levels: list[int] = []
+        for dependencies in self.dependencies:
+            levels.append(max((levels[j] + 1 for j in dependencies), default=0))
+        return levels
+
+    @property
+    def wave_indices(self) -> list[list[int]]:
+        """Group task indices into waves of mutually non-conflicting tasks."""
+        levels = self.levels
+        waves: list[list[int]] = [[] for _ in range(max(levels, default=-1) + 1)]
+        for i, level in enumerate(levels):
+            waves[level].append(i)
+        return waves
+
+    @property
+    def waves(self) -> list[list[Task]]:
+        return [[self.tasks[i] for i in wave] for wave in self.wave_indices]
+
+    @property
+    def shared_resources(self) -> dict[Resource, list[Task]]:
+        return {
+            resource: tasks
+            for resource, tasks in self.resources.items()
+            if len(tasks) > 1
+        }
+
+    def describe(self) -> str:
+        levels = self.levels
+        wave_indices = self.wave_indices
+        lines = [f"{len(self.tasks)} tasks in {len(wave_indices)} waves"]
+        for number, wave in enumerate(wave_indices, start=1):
+            lines.append(f"\nWave {number} ({len(wave)} tasks)")
+            for i in wave:
+                # only the dependencies in the previous wave decide the placement
+                after = ", ".join(
+                    self.tasks[j].full_name
+                    for j in sorted(self.dependencies[i])
+                    if levels[j] == levels[i] - 1
+                )
+                line = f"  {self.tasks[i].full_name}"
+                if i in self._exclusive:
+                    line += " [exclusive]"
+                elif after:
+                    line += f" (after: {after})"
+                lines.append(line)
+        if self.shared_resources:
+            lines.append("\nShared resources")
+            for resource, tasks in sorted(self.shared_resources.items()):
+                names = ", ".join(task.full_name for task in tasks)
+                lines.append(f"  {resource}: {names}")
+        return "\n".join(lines)
@@ -0,0 +1,100 @@
+from collections.abc import Iterable
+
+from loguru import logger
+
+from winconfig.config.action import ActionMode
+
+from .task import TaskRun
+
+
+class EngineHooks:
+    """Callbacks on the phases of a run, each doing nothing unless overridden.
+
+    Durations are in milliseconds and sizes in bytes. on_generate and
+    on_task_end are called on the thread calling Engine.run, in task order.
+    on_task_start and on_invoke are called on the thread running the task,
+    which is a pool worker when there is more than one job.
+    """
+
+    def on_generate(
+        self, task_run: TaskRun, duration_ms: float, script_size: int
+    ) -> None:
+        """The script of an executable task was generated or taken from the cache."""
+
+    def on_task_start(self, task_run: TaskRun) -> None:
+        """An executable task is about to run, on its own or as part of a batch."""
+
+    def on_invoke(
+        self,
+        task_runs: list[TaskRun],
+        duration_ms: float,
+        script_size: int,
+        output_size: int,
+    ) -> None:
+        """A script ran in PowerShell for the tasks, a single one unless batched."""
+
+    def on_task_end(self, task_run: TaskRun, duration_ms: float) -> None:
+        """The outcome of a task is known, including tasks that did not run.
+
+        Tasks run in a batch report the duration of the whole batch.
+        """
+
+
+class HookList(EngineHooks):
+    """Calls every hook in turn."""
+
+    def __init__(self, hooks: Iterable[EngineHooks] = ()) -> None:
+        self.hooks = list(hooks)
+
+    def on_generate(
+        self, task_run: TaskRun, duration_ms: float, script_size: int
+    ) -> None:
+        for hook in self.hooks:
+            hook.on_generate(task_run, duration_ms, script_size)
+
+    def on_task_start(self, task_run: TaskRun) -> None:
+        for hook in self.hooks:
+            hook.on_task_start(task_run)
+
+    def on_invoke(
+        self,
+        task_runs: list[TaskRun],
+        duration_ms: float,
+        script_size: int,
+        output_size: int,
+    ) -> None:
+        for hook in self.hooks:
+            hook.on_invoke(task_runs, duration_ms, script_size, output_size)
+
+    def on_task_end(self, task_run: TaskRun, duration_ms: float) -> None:
+        for hook in self.hooks:
+            hook.on_task_end(task_run, duration_ms)
+
+
+def task_outcome(task_run: TaskRun) -> list[tuple[str, str]]:
+    """The log levels and messages describing how a task ended.
+
+    A failed task has none, its error being raised instead.
+    """
+    name = f"{task_run.task.full_name}[{task_run.mode}]"
+    messages = [
+        ("INFO", f"Compliant: {name} {item}") for item in task_run.compliant_items
+    ]
+    if task_run.mode is None:
+        messages.append(("DEBUG", f"NoAction: {task_run.task.full_name}"))
+    elif task_run.mode == ActionMode.SKIP:
+        messages.append(("INFO", f"Skipped: {name}"))
+    elif task_run.compliant:
+        messages.append(("INFO", f"Compliant: {name}"))
+    elif task_run.error is None:
+        messages.append(("INFO", f"Success: {name}"))
+        messages.append(("DEBUG", f"{name}:\n```powershell\n{task_run.script}\n```"))
+    return messages
+
+
+class LogHooks(EngineHooks):
+    """Logs the outcome of every task, which is what engines do by default."""
+
+    def on_task_end(self, task_run: TaskRun, duration_ms: float) -> None:  # noqa: ARG002
+        for level, message in task_outcome(task_run):
+            logger.log(level, message)
@@ -0,0 +1,103 @@
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Self
+
+from .executor import ExecutorFactory, ScriptExecutor
+from .hooks import EngineHooks
+from .task import TaskRun
+
+
+class RunspacePool:
+    """A pool of worker threads, each owning its own executor.
+
+    With a single worker no thread is started and items run on the calling
+    thread instead.
+    """
+
+    size: int
+
+    def __init__(self, executor_factory: ExecutorFactory, size: int = 1) -> None:
+        self.size = max(size, 1)
+        self._executor_factory = executor_factory
+        self._local = threading.local()
+        self._pool: ThreadPoolExecutor | None = None
+
+    def __enter__(self) -> Self:
+        if self.size > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.size, thread_name_prefix="runspace"
+            )
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    @property
+    def executor(self) -> ScriptExecutor:
+        """The executor of the calling thread, created on first use."""
+        if not hasattr(self._local, "executor"):
+            self._local.executor = self._executor_factory()
+        return self._local.executor
+
+    def _call[T, R](self, func: Callable[[ScriptExecutor, T], R], item: T) -> R:
+        return func(self.executor, item)
+
+    def map[T, R](
+        self, func: Callable[[ScriptExecutor, T], R], items: Iterable[T]
+    ) -> Iterator[R]:
+        """Apply func to every item, yielding the results in submission order."""
+        if self._pool is None:
+            return (self._call(func, item) for item in items)
+        futures = [self._pool.submit(self._call, func, item) for item in items]
+        return (future.result() for future in futures)
+
+
+class OrderedReporter:
+    """Reports task runs in their planned order as they finish."""
+
+    def __init__(self, task_runs: list[TaskRun], hooks: EngineHooks) -> None:
+        self._pending = deque(task_runs)
+        self._finished: set[int] = set()
+        self._hooks = hooks
+
+    def finish(self, task_runs: Iterable[TaskRun]) -> None:
+        self._finished.update(id(task_run) for task_run in task_runs)
+        while self._pending and (
+            not self._pending[0].executable or id(self._pending[0]) in self._finished
+        ):
+            task_run = self._pending.popleft()
+            self._hooks.on_task_end(task_run, task_run.execute_ms)
+            task_run.raise_for_error()
+
+    def raise_for_failure(self) -> None:
+        """Raise the error of the first failed task run, if any has finished.
+
+        The finished runs planned before it are reported first. Runs that have
+        not started are left out, as none of them will.
+        """
+        if not any(
+            id(task_run) in self._finished and task_run.error is not None
+            for task_run in self._pending
+        ):
+            return
+        while self._pending:
+            task_run = self._pending.popleft()
+            if not task_run.executable or id(task_run) in self._finished:
+                self._hooks.on_task_end(task_run, task_run.execute_ms)
+                task_run.raise_for_error()
+
+
+def split_evenly[T](items: list[T], count: int) -> list[list[T]]:
+    """Split items into at most count contiguous chunks of similar size."""
+    size, remainder = divmod(len(items), count)
+    chunks = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < remainder else 0)
+        chunks.append(items[start:end])
+        start = end
+    return [chunk for chunk in chunks if chunk]
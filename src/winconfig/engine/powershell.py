@@ -1,37 +1,55 @@
-import clr
+from functools import cache
+from importlib import import_module
+from typing import Any
+
+from loguru import logger
 
 from winconfig.exceptions import PowerShellAdminRequiredError, PowerShellError
 from winconfig.protocol.state_codes import PERMISSION_DENIED
 
+from .timing import timed
+
 dll_path = r"C:\Windows\Microsoft.NET\assembly\GAC_MSIL\System.Management.Automation\v4.0_3.0.0.0__31bf3856ad364e35\System.Management.Automation.dll"
-clr.AddReference(dll_path)  # ty:ignore[unresolved-attribute]
-from Microsoft.PowerShell import (  # ty:ignore[unresolved-import]  # noqa: E402
-    ExecutionPolicy,
-)
-from System.Management.Automation import (  # ty:ignore[unresolved-import] # noqa: E402
-    PowerShell,
-    Runspaces,
-)
+
+
+@cache
+def load_automation() -> None:
+    """Load the CLR and the PowerShell assembly, once and only when needed."""
+    # the CLR members only exist at runtime
+    clr: Any = import_module("clr")
+    clr.AddReference(dll_path)
 
 
 class PowershellRunspace:
-    runspace: Runspaces.Runspace
+    runspace: Any
     version: int
 
     def __init__(self) -> None:
+        load_automation()
+        from Microsoft.PowerShell import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            ExecutionPolicy,
+        )
+        from System.Management.Automation import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            PowerShell,
+            Runspaces,
+        )
+
+        self.powershell = PowerShell
         iss = Runspaces.InitialSessionState.CreateDefault()
         iss.ExecutionPolicy = ExecutionPolicy.Bypass
         self.runspace = Runspaces.RunspaceFactory.CreateRunspace(iss)
         self.runspace.Open()
         self.version = self.runspace.Version.Major
+        logger.debug(f"Setup PowerShell: version {self.runspace.Version}")
 
     def run(self, script: str) -> str:
-        process = PowerShell.Create()
+        process = self.powershell.Create()
         process.Runspace = self.runspace
         process.AddScript(script, useLocalScope=True)
 
         try:
-            stdouts = [str(e) for e in process.Invoke()]
+            with timed("invoke"):
+                stdouts = [str(e) for e in process.Invoke()]
             if process.Streams.Error.Count > 0:
                 stderrs = "\n".join(map(str, process.Streams.Error)).strip()
                 raise PowerShellError(stderrs)
@@ -42,4 +60,5 @@ class PowershellRunspace:
             output = "\n".join(stdouts).strip()
             return output
         finally:
-            process.Dispose()
+            with timed("dispose"):
+                process.Dispose()
@@ -0,0 +1,358 @@
+import json
+import threading
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from typing import Any, Protocol, TypeGuard
+
+from loguru import logger
+from pydantic import BaseModel
+
+from winconfig.config.action import ExecutableActionMode
+from winconfig.config.definition import (
+    RegistryEntryDefinition,
+    RegistryPathDefinition,
+    RegistryValueKind,
+    registry_path_key,
+)
+from winconfig.exceptions import PowerShellAdminRequiredError
+from winconfig.protocol.state_codes import (
+    EXIST,
+    NOT_CHANGE,
+    NOT_EXIST,
+    ExistType,
+    NotChangeType,
+    NotExistType,
+)
+
+from .batch import BatchEntry, generate_batch_script, parse_batch_output
+from .executor import ScriptExecutor
+
+DEFAULT_VALUE_NAME = "(Default)"
+
+# a MultiString is a list of its strings, any other value a string
+type RegistryValue = str | list[str]
+type RegistryValues = dict[str, RegistryValue]
+type RegistryItem = RegistryPathDefinition | RegistryEntryDefinition
+
+
+class RegistryKeyWrite(BaseModel):
+    """The changes to make to a single registry key, applied while it is open."""
+
+    path: str
+    existence: NotChangeType | ExistType | NotExistType = NOT_CHANGE
+    values: dict[str, tuple[RegistryValueKind, RegistryValue]] = {}
+    removed_values: list[str] = []
+
+
+def is_registry_item(item: object) -> TypeGuard[RegistryItem]:
+    return isinstance(item, RegistryPathDefinition | RegistryEntryDefinition)
+
+
+def registry_writes(
+    items: Iterable[RegistryItem], mode: ExecutableActionMode
+) -> list[RegistryKeyWrite]:
+    """Group the registry items into one write per key, in order of appearance."""
+    writes: dict[str, RegistryKeyWrite] = {}
+    for item in items:
+        match item:
+            case RegistryPathDefinition():
+                write = writes.setdefault(
+                    item.path_key, RegistryKeyWrite(path=item.path)
+                )
+                write.existence = item.resolve_value(mode)
+            case RegistryEntryDefinition():
+                write = writes.setdefault(
+                    registry_path_key(item.key_path),
+                    RegistryKeyWrite(path=item.key_path),
+                )
+                value = item.resolve_value(mode)
+                if value == NOT_EXIST:
+                    write.removed_values.append(item.name)
+                else:
+                    write.values[item.name] = (item.type, value)
+    return list(writes.values())
+
+
+class RegistryReader(Protocol):
+    """Reads all values of registry keys, one key at a time."""
+
+    def read_keys(
+        self, paths: Iterable[str]
+    ) -> Iterator[tuple[str, RegistryValues | None]]:
+        """Yield each path with its values by name, or None if the key is missing."""
+        ...
+
+
+class RegistryBackend(RegistryReader, Protocol):
+    """Reads and writes registry keys directly, without generating scripts."""
+
+    def write_keys(self, writes: Iterable[RegistryKeyWrite]) -> None:
+        """Apply the writes in order, opening every key once.
+
+        Like the generated scripts, values of a missing key are skipped and a
+        missing value is not an error.
+        """
+        ...
+
+
+def registry_states(
+    registry_reader: RegistryReader, items: list[RegistryItem]
+) -> list[str]:
+    """Read registry items back the way their get scripts print them."""
+    paths = {
+        item.path_key
+        if isinstance(item, RegistryPathDefinition)
+        else registry_path_key(item.key_path): None
+        for item in items
+    }
+    keys = {
+        path: None if values is None else {k.casefold(): v for k, v in values.items()}
+        for path, values in registry_reader.read_keys(paths)
+    }
+    states = []
+    for item in items:
+        if isinstance(item, RegistryPathDefinition):
+            states.append(NOT_EXIST if keys[item.path_key] is None else EXIST)
+        else:
+            values = keys[registry_path_key(item.key_path)] or {}
+            value = values.get(item.name.casefold(), NOT_EXIST)
+            states.append(value if isinstance(value, str) else "\n".join(value))
+    return states
+
+
+class PowershellRegistryReader:
+    """Reads registry keys in batches through a PowerShell executor.
+
+    Every key is opened once no matter how many of its values are needed, and
+    values are formatted the way Get-ItemPropertyValue prints them, except for
+    MultiString values which are kept as lists.
+    """
+
+    keys_per_invocation: int
+
+    def __init__(
+        self, executor: ScriptExecutor, keys_per_invocation: int = 256
+    ) -> None:
+        self.executor = executor
+        self.keys_per_invocation = keys_per_invocation
+
+    @staticmethod
+    def generate_read_script(path: str) -> str:
+        literal_path = "Registry::" + path.replace("'", "''")
+        return f"""
+            $key = Get-Item -LiteralPath '{literal_path}' -ErrorAction SilentlyContinue
+            if ($key -eq $null) {{ "{NOT_EXIST}"; return }}
+            $values = [ordered]@{{}}
+            foreach ($name in $key.GetValueNames()) {{
+                $value = $key.GetValue($name, $null, "DoNotExpandEnvironmentNames")
+                if ($name -eq "") {{ $name = "{DEFAULT_VALUE_NAME}" }}
+                if ($value -is [string[]]) {{
+                    $values[$name] = $value
+                }} else {{
+                    $values[$name] = ($value | ForEach-Object {{ "$_" }}) -join " "
+                }}
+            }}
+            $values | ConvertTo-Json -Compress
+        """
+
+    def read_keys(
+        self, paths: Iterable[str]
+    ) -> Iterator[tuple[str, RegistryValues | None]]:
+        for chunk in batched(paths, self.keys_per_invocation):
+            batch_script = generate_batch_script(
+                [
+                    BatchEntry(name=str(i), script=self.generate_read_script(path))
+                    for i, path in enumerate(chunk)
+                ],
+                stop_on_error=False,
+            )
+            results = {
+                result.name: result
+                for result in parse_batch_output(self.executor.run(batch_script))
+            }
+            for i, path in enumerate(chunk):
+                result = results.get(str(i))
+                if result is None or result.errors or result.text == NOT_EXIST:
+                    yield path, None
+                else:
+                    yield path, json.loads(result.text or "{}")
+
+
+class DotnetRegistry:
+    """Reads and writes the registry through Microsoft.Win32.Registry.
+
+    The .NET API is reached through pythonnet, so no PowerShell script is
+    generated, parsed or run for registry items.
+    """
+
+    def __init__(self) -> None:
+        # imported lazily so the engine stays importable where the CLR is unavailable
+        import clr  # noqa: F401, PLC0415
+        from Microsoft.Win32 import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            Registry,
+        )
+
+        self.hives = {
+            "HKCR": Registry.ClassesRoot,
+            "HKCC": Registry.CurrentConfig,
+            "HKCU": Registry.CurrentUser,
+            "HKLM": Registry.LocalMachine,
+            "HKU": Registry.Users,
+        }
+
+    def _split(self, path: str) -> tuple[Any, str]:
+        hive, _, subkey = path.partition("\\")
+        return self.hives[hive.upper()], subkey
+
+    @staticmethod
+    def _value_name(name: str) -> str:
+        return "" if name.casefold() == DEFAULT_VALUE_NAME.casefold() else name
+
+    @staticmethod
+    def _format_value(value: Any) -> RegistryValue:  # noqa: ANN401
+        if isinstance(value, str | int):
+            return str(value)
+        if value.GetType().GetElementType().Name == "String":
+            return list(value)
+        return " ".join(str(e) for e in value)
+
+    @staticmethod
+    def _convert_value(kind: RegistryValueKind, value: RegistryValue) -> Any:  # noqa: ANN401
+        from System import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            Array,
+            Byte,
+            Int32,
+            Int64,
+            String,
+        )
+
+        if isinstance(value, list):
+            return Array[String](value)
+        match kind:
+            case "DWord":
+                return Int32(
+                    int(value) - (1 << 32) if int(value) >= 1 << 31 else int(value)
+                )
+            case "QWord":
+                return Int64(
+                    int(value) - (1 << 64) if int(value) >= 1 << 63 else int(value)
+                )
+            case "Binary":
+                return Array[Byte]([int(e) for e in value.split()])
+            case "MultiString":
+                return Array[String]([value])
+            case _:
+                return value
+
+    def read_keys(
+        self, paths: Iterable[str]
+    ) -> Iterator[tuple[str, RegistryValues | None]]:
+        from Microsoft.Win32 import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            RegistryValueOptions,
+        )
+
+        for path in paths:
+            hive, subkey = self._split(path)
+            key = hive.OpenSubKey(subkey)
+            if key is None:
+                yield path, None
+                continue
+            try:
+                values = {
+                    name or DEFAULT_VALUE_NAME: self._format_value(
+                        key.GetValue(
+                            name, None, RegistryValueOptions.DoNotExpandEnvironmentNames
+                        )
+                    )
+                    for name in key.GetValueNames()
+                }
+            finally:
+                key.Dispose()
+            yield path, values
+
+    def write_keys(self, writes: Iterable[RegistryKeyWrite]) -> None:
+        from Microsoft.Win32 import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            RegistryValueKind as DotnetValueKind,
+        )
+        from System import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            UnauthorizedAccessException,
+        )
+        from System.Security import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            SecurityException,
+        )
+
+        for write in writes:
+            hive, subkey = self._split(write.path)
+            try:
+                if write.existence == NOT_EXIST:
+                    hive.DeleteSubKeyTree(subkey, False)  # noqa: FBT003
+                    continue
+                if write.existence == EXIST:
+                    key = hive.CreateSubKey(subkey)
+                else:
+                    key = hive.OpenSubKey(subkey, True)  # noqa: FBT003
+                if key is None:
+                    continue
+                try:
+                    for name, (kind, value) in write.values.items():
+                        key.SetValue(
+                            self._value_name(name),
+                            self._convert_value(kind, value),
+                            getattr(DotnetValueKind, kind),
+                        )
+                    for name in write.removed_values:
+                        key.DeleteValue(self._value_name(name), False)  # noqa: FBT003
+                finally:
+                    key.Dispose()
+            except SecurityException as e:
+                raise PowerShellAdminRequiredError from e
+            except UnauthorizedAccessException:
+                logger.warning(f"Access denied: {write.path}")
+
+
+class InMemoryRegistry:
+    """A dict-backed registry, keyed case-insensitively like the real one."""
+
+    def __init__(self, keys: dict[str, RegistryValues] | None = None) -> None:
+        self.keys: dict[str, RegistryValues] = {}
+        self.reads = 0
+        self.writes = 0
+        self._lock = threading.Lock()
+        for path, values in (keys or {}).items():
+            self.keys[path.casefold()] = dict(values)
+
+    def read_keys(
+        self, paths: Iterable[str]
+    ) -> Iterator[tuple[str, RegistryValues | None]]:
+        for path in paths:
+            with self._lock:
+                self.reads += 1
+                values = self.keys.get(path.casefold())
+                values = None if values is None else dict(values)
+            yield path, values
+
+    def write_keys(self, writes: Iterable[RegistryKeyWrite]) -> None:
+        for write in writes:
+            path = write.path.casefold()
+            with self._lock:
+                self.writes += 1
+                if write.existence == NOT_EXIST:
+                    for key in [
+                        k for k in self.keys if k == path or k.startswith(path + "\\")
+                    ]:
+                        del self.keys[key]
+                    continue
+                if write.existence == EXIST:
+                    parts = path.split("\\")
+                    for i in range(1, len(parts) + 1):
+                        self.keys.setdefault("\\".join(parts[:i]), {})
+                values = self.keys.get(path)
+                if values is None:
+                    continue
+                for name in [*write.values, *write.removed_values]:
+                    for existing in [
+                        k for k in values if k.casefold() == name.casefold()
+                    ]:
+                        del values[existing]
+                for name, (_, value) in write.values.items():
+                    values[name] = value
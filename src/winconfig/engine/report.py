@@ -0,0 +1,175 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, computed_field
+
+from winconfig.config.definition import (
+    RegistryEntryDefinition,
+    RegistryPathDefinition,
+    SchtaskDefinition,
+    ServiceDefinition,
+)
+
+from .snapshot import open_atomic
+from .task import StatefulItem, TaskRun
+from .timing import Timings
+
+type ItemType = Literal[
+    "registry_key", "registry_value", "service", "schtask", "script"
+]
+type TaskStatus = Literal[
+    "success", "failed", "not_run", "compliant", "skipped", "no_action"
+]
+
+
+def item_type(item: StatefulItem) -> ItemType:
+    match item:
+        case RegistryPathDefinition():
+            return "registry_key"
+        case RegistryEntryDefinition():
+            return "registry_value"
+        case ServiceDefinition():
+            return "service"
+        case SchtaskDefinition():
+            return "schtask"
+
+
+def rounded(timings: Timings) -> Timings:
+    return {name: round(ms, 3) for name, ms in timings.items()}
+
+
+def task_status(task_run: TaskRun) -> TaskStatus:
+    if task_run.mode is None:
+        return "no_action"
+    if not task_run.executable:
+        return "compliant" if task_run.compliant else "skipped"
+    if task_run.error is not None:
+        return "failed"
+    if "execute" not in task_run.timings and task_run.batch_timings is None:
+        # a failure stopped the run before the task was reached
+        return "not_run"
+    return "success"
+
+
+class BatchReport(BaseModel):
+    tasks: list[str]
+    timings: Timings
+
+
+class TaskReport(BaseModel):
+    name: str
+    mode: str | None
+    status: TaskStatus
+    items: dict[ItemType, int]
+    script_bytes: int
+    timings: Timings
+    batch: int | None = None
+    error: str | None = None
+
+    @property
+    def total_ms(self) -> float:
+        # the other timings are parts of executing
+        return self.timings.get("generate", 0) + self.timings.get("execute", 0)
+
+
+class RunReport(BaseModel):
+    """What a run did and how long each of its phases and tasks took.
+
+    Timings are in milliseconds. Tasks run in a batch share the timings of its
+    invocation, which are reported once per batch.
+    """
+
+    started_at: datetime
+    options: dict[str, Any] = {}
+    phases: Timings = {}
+    tasks: list[TaskReport] = []
+    batches: list[BatchReport] = []
+
+    def add_task_runs(self, task_runs: list[TaskRun]) -> None:
+        batch_indices: dict[int, int] = {}
+        for task_run in task_runs:
+            batch = None
+            if task_run.batch_timings is not None:
+                key = id(task_run.batch_timings)
+                if key not in batch_indices:
+                    batch_indices[key] = len(self.batches)
+                    self.batches.append(
+                        BatchReport(tasks=[], timings=rounded(task_run.batch_timings))
+                    )
+                batch = batch_indices[key]
+                self.batches[batch].tasks.append(task_run.task.full_name)
+
+            items: dict[ItemType, int] = {}
+            for item in task_run.task.items:
+                items[item_type(item)] = items.get(item_type(item), 0) + 1
+            if task_run.executable and task_run.task.script.resolve_value(
+                task_run.executable_mode
+            ):
+                items["script"] = 1
+            self.tasks.append(
+                TaskReport(
+                    name=task_run.task.full_name,
+                    mode=task_run.mode,
+                    status=task_status(task_run),
+                    items=items,
+                    script_bytes=len(task_run.script.encode()),
+                    timings=rounded(task_run.timings),
+                    batch=batch,
+                    error=None if task_run.error is None else str(task_run.error),
+                )
+            )
+
+    @computed_field
+    @property
+    def item_types(self) -> dict[ItemType, dict[str, float]]:
+        """The items of each type and the time spent on the tasks that have them."""
+        totals: dict[ItemType, dict[str, float]] = {}
+        for task in self.tasks:
+            for kind, count in task.items.items():
+                total = totals.setdefault(kind, {"tasks": 0, "items": 0, "ms": 0})
+                total["tasks"] += 1
+                total["items"] += count
+                total["ms"] += task.total_ms
+        return totals
+
+    def describe_slowest(self, count: int) -> str:
+        slowest = sorted(self.tasks, key=lambda task: task.total_ms, reverse=True)
+        rows = [("Task", "Status", "Items", "Generate", "Execute", "Total")]
+        rows += [
+            (
+                task.name,
+                task.status,
+                ", ".join(f"{n} {kind}" for kind, n in task.items.items()),
+                f"{task.timings.get('generate', 0):.1f} ms",
+                f"{task.timings.get('execute', 0):.1f} ms",
+                f"{task.total_ms:.1f} ms",
+            )
+            for task in slowest[:count]
+        ]
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) for cell, width in zip(row, widths, strict=True)
+            )
+            for row in rows
+        )
+
+    def write(self, path: Path) -> None:
+        """Write the report as JSON, or as JSON lines for a .jsonl path.
+
+        JSON lines start with the run, followed by a line per batch and task.
+        """
+        with open_atomic(path) as stream:
+            if path.suffix.lower() != ".jsonl":
+                stream.write(self.model_dump_json(indent=2))
+                return
+            run = self.model_dump(mode="json", exclude={"tasks", "batches"})
+            stream.write(json.dumps({"type": "run", **run}) + "\n")
+            for i, batch in enumerate(self.batches):
+                line = {"type": "batch", "index": i, **batch.model_dump(mode="json")}
+                stream.write(json.dumps(line) + "\n")
+            for task in self.tasks:
+                line = {"type": "task", **task.model_dump(mode="json")}
+                stream.write(json.dumps(line) + "\n")
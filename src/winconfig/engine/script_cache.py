@@ -0,0 +1,100 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from loguru import logger
+
+from winconfig.config.action import ExecutableActionMode
+from winconfig.config.cache import PACKAGE_VERSION
+from winconfig.config.definition import DefinitionBody
+
+from .snapshot import open_atomic
+from .task import Task
+
+DEFINITION_BODY_FIELDS = set(DefinitionBody.model_fields)
+SCRIPT_CACHE_FILENAME = ".winconfig.script-cache.json"
+
+
+def script_key(task: Task, mode: ExecutableActionMode, *, compact: bool = False) -> str:
+    """A stable hash of the definition body and options a script is generated from.
+
+    The package version is part of the key, so scripts generated by an older
+    release are never reused.
+    """
+    body = task.model_dump_json(include=DEFINITION_BODY_FIELDS)
+    options = f"{PACKAGE_VERSION}\0{mode}\0{'compact' if compact else ''}"
+    return hashlib.sha256(f"{options}\0{body}".encode()).hexdigest()
+
+
+class ScriptCache:
+    """An LRU cache of generated task scripts, optionally persisted as JSON."""
+
+    max_size: int
+    path: Path | None
+
+    def __init__(self, max_size: int = 1024, path: Path | None = None) -> None:
+        self.max_size = max_size
+        self.path = path
+        self._scripts: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path is not None and path.exists():
+            self._load(path)
+
+    def __len__(self) -> int:
+        return len(self._scripts)
+
+    def _load(self, path: Path) -> None:
+        try:
+            scripts = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable script cache: {path}")
+            return
+        if isinstance(scripts, dict):
+            for key, script in list(scripts.items())[-self.max_size :]:
+                self._scripts[key] = script
+
+    def get(
+        self, task: Task, mode: ExecutableActionMode, *, compact: bool = False
+    ) -> str:
+        """Return the task's script for the mode, generating it on a miss."""
+        key = script_key(task, mode, compact=compact)
+        with self._lock:
+            script = self._scripts.get(key)
+            if script is not None:
+                self._scripts.move_to_end(key)
+                return script
+
+        script = task.generate_script(mode, compact=compact).strip()
+        with self._lock:
+            self._scripts[key] = script
+            self._dirty = True
+            while len(self._scripts) > self.max_size:
+                self._scripts.popitem(last=False)
+        return script
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scripts.clear()
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to its path if it has one and has changed."""
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            content = json.dumps(self._scripts, ensure_ascii=False)
+            self._dirty = False
+        with open_atomic(self.path) as stream:
+            stream.write(content)
+
+
+default_script_cache = ScriptCache()
+
+
+def persistent_script_cache(*config_paths: Path) -> ScriptCache:
+    """A cache stored next to the first config file, or in the working directory."""
+    directory = config_paths[0].parent if config_paths else Path.cwd()
+    return ScriptCache(path=directory / SCRIPT_CACHE_FILENAME)
@@ -0,0 +1,64 @@
+from fnmatch import fnmatchcase
+
+from pydantic import BaseModel
+
+from winconfig.config.definition import DefinitionConfig
+from winconfig.exceptions import DefinitionGroupNotFoundError
+
+from .task import TaskKey
+
+
+class TaskSelection(BaseModel):
+    """Which tasks to run, all of them unless narrowed down.
+
+    A task is selected when it is in one of the groups, its name matches one of
+    the glob patterns and it has one of the tags, each ignored when empty.
+    """
+
+    groups: list[str] = []
+    names: list[str] = []
+    tags: list[str] = []
+
+    def __bool__(self) -> bool:
+        return bool(self.groups or self.names or self.tags)
+
+
+class TaskIndex:
+    """The task keys of the definitions by group and by tag, in definition order.
+
+    Selecting through it touches only the keys of the selected groups and tags,
+    without building any task.
+    """
+
+    def __init__(self, definition_config: DefinitionConfig) -> None:
+        self.groups: dict[str, list[TaskKey]] = {}
+        self.tags: dict[str, list[TaskKey]] = {}
+        for group_name, group in definition_config.root.items():
+            keys = self.groups[group_name] = []
+            for name, definition_body in group.items():
+                keys.append((group_name, name))
+                for tag in definition_body.tags:
+                    self.tags.setdefault(tag, []).append((group_name, name))
+        self.order = {
+            key: i for i, key in enumerate(k for ks in self.groups.values() for k in ks)
+        }
+
+    def select(self, selection: TaskSelection) -> list[TaskKey]:
+        if selection.groups:
+            for group_name in selection.groups:
+                if group_name not in self.groups:
+                    raise DefinitionGroupNotFoundError(group_name)
+            keys = {k for g in selection.groups for k in self.groups[g]}
+            if selection.tags:
+                keys &= {k for t in selection.tags for k in self.tags.get(t, [])}
+        elif selection.tags:
+            keys = {k for t in selection.tags for k in self.tags.get(t, [])}
+        else:
+            keys = set(self.order)
+        if selection.names:
+            keys = {
+                key
+                for key in keys
+                if any(fnmatchcase(key[1], pattern) for pattern in selection.names)
+            }
+        return sorted(keys, key=self.order.__getitem__)
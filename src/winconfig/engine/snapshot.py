@@ -0,0 +1,287 @@
+import json
+import os
+import tempfile
+from collections.abc import Generator, Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Literal, TextIO
+
+import yaml
+from loguru import logger
+from pydantic import BaseModel, ValidationError
+
+from winconfig.config.action import ActionMode
+from winconfig.config.definition import (
+    HELPERS_PRELUDE,
+    DefinitionConfig,
+    RegistryEntryDefinition,
+    RegistryPathDefinition,
+    RegistryValueKind,
+    SchtaskDefinition,
+    ServiceDefinition,
+    registry_path_key,
+)
+from winconfig.exceptions import RollbackError
+from winconfig.protocol.state_codes import EXIST, NOT_CHANGE, NOT_EXIST, UNREADABLE
+
+from .batch import (
+    BatchEntry,
+    BatchResult,
+    generate_batch_script,
+    parse_batch_output,
+)
+from .drift import read_states
+from .executor import ScriptExecutor
+from .registry import RegistryReader
+from .task import StatefulItem
+
+type SnapshotFormat = Literal["json", "yaml"]
+type SnapshotItemKind = Literal["registry_key", "registry_value", "service", "schtask"]
+
+
+class SnapshotItem(BaseModel):
+    """The recorded state of a single registry key or value, service or task."""
+
+    kind: SnapshotItemKind
+    path: str
+    name: str | None = None
+    type: RegistryValueKind | None = None
+    # a list of strings for a MultiString value
+    value: str | list[str]
+
+
+def definition_items(definition_config: DefinitionConfig) -> list[StatefulItem]:
+    return [
+        item
+        for definition_group in definition_config.root.values()
+        for definition_body in definition_group.values()
+        for item in [
+            *(e for registry in definition_body.registries for e in registry.items),
+            *definition_body.scheduled_tasks,
+            *definition_body.services,
+        ]
+    ]
+
+
+class SnapshotRequest:
+    """The unique items to record, with registry entries grouped by key."""
+
+    def __init__(self, items: Iterable[StatefulItem]) -> None:
+        self.registry_paths: dict[str, str] = {}
+        self.registry_keys: set[str] = set()
+        self.registry_entries: dict[str, dict[str, RegistryEntryDefinition]] = {}
+        others: dict[tuple[str, str], ServiceDefinition | SchtaskDefinition] = {}
+        for item in items:
+            match item:
+                case RegistryPathDefinition():
+                    self.registry_keys.add(self._register_path(item.path))
+                case RegistryEntryDefinition():
+                    path = self._register_path(item.key_path)
+                    entries = self.registry_entries[path]
+                    entries.setdefault(item.name.casefold(), item)
+                case ServiceDefinition():
+                    others.setdefault(("service", item.name.casefold()), item)
+                case SchtaskDefinition():
+                    others.setdefault(("schtask", item.formatted_path.casefold()), item)
+        self.others = list(others.values())
+
+    def _register_path(self, path: str) -> str:
+        path = self.registry_paths.setdefault(registry_path_key(path), path)
+        self.registry_entries.setdefault(path, {})
+        return path
+
+    def __len__(self) -> int:
+        return (
+            len(self.registry_keys)
+            + sum(len(entries) for entries in self.registry_entries.values())
+            + len(self.others)
+        )
+
+
+def read_snapshot(
+    items: Iterable[StatefulItem],
+    registry_reader: RegistryReader,
+    executor: ScriptExecutor,
+) -> Iterator[SnapshotItem]:
+    """Read the current state of the items.
+
+    Registry keys are read whole, so a key is opened once however many of its
+    entries are requested. Services and scheduled tasks are read in one batch.
+    """
+    request = SnapshotRequest(items)
+
+    for path, values in registry_reader.read_keys(request.registry_entries):
+        if path in request.registry_keys:
+            yield SnapshotItem(
+                kind="registry_key",
+                path=path,
+                value=NOT_EXIST if values is None else EXIST,
+            )
+        folded_values = {
+            name.casefold(): value for name, value in (values or {}).items()
+        }
+        for name, entry in request.registry_entries[path].items():
+            yield SnapshotItem(
+                kind="registry_value",
+                path=path,
+                name=entry.name,
+                type=entry.type,
+                value=folded_values.get(name, NOT_EXIST),
+            )
+
+    others = request.others
+    for item, value in zip(others, read_states(executor, others), strict=True):
+        # a missing item reads as NOT_EXIST, so no value means the read failed
+        if not value:
+            logger.warning(f"Unreadable: {item.full_path}")
+        kind = "service" if isinstance(item, ServiceDefinition) else "schtask"
+        yield SnapshotItem(kind=kind, path=item.full_path, value=value or UNREADABLE)
+
+
+def write_snapshot(
+    items: Iterable[SnapshotItem], stream: TextIO, fmt: SnapshotFormat
+) -> int:
+    """Write items to the stream as they arrive and return how many were written."""
+    count = 0
+    if fmt == "json":
+        stream.write("[")
+        for item in items:
+            stream.write(
+                ("\n  " if count == 0 else ",\n  ")
+                + item.model_dump_json(exclude_none=True)
+            )
+            count += 1
+        stream.write("\n]\n" if count else "]\n")
+    else:
+        for item in items:
+            stream.write(
+                yaml.safe_dump([item.model_dump(exclude_none=True)], sort_keys=False)
+            )
+            count += 1
+        if not count:
+            stream.write("[]\n")
+    return count
+
+
+def load_snapshot(content: str, fmt: SnapshotFormat) -> list[SnapshotItem]:
+    raw_items = json.loads(content) if fmt == "json" else yaml.safe_load(content)
+    return [SnapshotItem.model_validate(item) for item in raw_items or []]
+
+
+def snapshot_format(path: str | None) -> SnapshotFormat:
+    return "json" if path and path.lower().endswith(".json") else "yaml"
+
+
+@contextmanager
+def open_atomic(path: Path) -> Generator[TextIO, Any, None]:
+    """Open a temporary file that replaces path only once fully written."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as stream:
+            yield stream
+            stream.flush()
+            os.fsync(stream.fileno())
+        Path(temp_path).replace(path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def restore_definitions(
+    snapshot_items: Iterable[SnapshotItem],
+) -> list[RegistryPathDefinition | ServiceDefinition | SchtaskDefinition]:
+    """Build definitions whose apply mode writes back the recorded values."""
+    registry_paths: dict[str, dict[str, Any]] = {}
+    definitions: list[
+        RegistryPathDefinition | ServiceDefinition | SchtaskDefinition
+    ] = []
+    for item in snapshot_items:
+        if item.kind in ("registry_key", "registry_value"):
+            key = registry_path_key(item.path)
+            registry_path = registry_paths.get(key)
+            if registry_path is None:
+                registry_path = registry_paths[key] = {
+                    "path": item.path,
+                    "old_existence": NOT_CHANGE,
+                    "new_existence": NOT_CHANGE,
+                    "entries": [],
+                }
+            if item.kind == "registry_key":
+                registry_path["old_existence"] = registry_path["new_existence"] = (
+                    item.value
+                )
+            else:
+                registry_path["entries"].append(
+                    {
+                        "name": item.name,
+                        "type": item.type,
+                        "old_value": item.value,
+                        "new_value": item.value,
+                    }
+                )
+            continue
+
+        if item.value == NOT_EXIST:
+            continue
+        if item.value == UNREADABLE:
+            logger.warning(f"Unrestorable: {item.path} was not read")
+            continue
+        try:
+            if item.kind == "service":
+                definitions.append(
+                    ServiceDefinition(
+                        name=item.path, old_startup=item.value, new_startup=item.value
+                    )
+                )
+            else:
+                definitions.append(
+                    SchtaskDefinition(
+                        full_path=item.path, old_state=item.value, new_state=item.value
+                    )
+                )
+        except ValidationError:
+            logger.warning(f"Unrestorable: {item.path} '{item.value}'")
+
+    return [
+        RegistryPathDefinition.model_validate(registry_path)
+        for registry_path in registry_paths.values()
+    ] + definitions
+
+
+def restore_snapshot(
+    executor: ScriptExecutor, snapshot_items: Iterable[SnapshotItem]
+) -> None:
+    """Write the recorded values back in a single compact invocation."""
+    entries = []
+    for definition in restore_definitions(snapshot_items):
+        if isinstance(definition, RegistryPathDefinition):
+            name, items = definition.path, definition.items
+        else:
+            name, items = definition.full_path, [definition]
+        script = "\n".join(
+            item.generate_compact_script(ActionMode.APPLY) for item in items
+        )
+        entries.append(BatchEntry(name=name, script=script))
+    if not entries:
+        return
+
+    batch_script = generate_batch_script(
+        entries, prelude=HELPERS_PRELUDE, stop_on_error=False
+    )
+    results = {r.name: r for r in parse_batch_output(executor.run(batch_script))}
+    failed = []
+    for entry in entries:
+        try:
+            results.get(
+                entry.name,
+                BatchResult(name=entry.name, errors=["No result was returned"]),
+            ).raise_for_error()
+        except Exception as e:  # noqa: BLE001
+            logger.error(f"Failed: {entry.name}: {e}")
+            failed.append(entry.name)
+        else:
+            logger.info(f"Restored: {entry.name}")
+    if failed:
+        raise RollbackError(failed)
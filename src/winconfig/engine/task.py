@@ -1,11 +1,28 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from winconfig.config.action import ActionMode, ExecutableActionMode
 from winconfig.config.definition import (
+    HELPERS_PRELUDE,
     DefinitionBody,
     DefinitionGroupName,
     DefinitionName,
+    RegistryEntryDefinition,
+    RegistryPathDefinition,
+    SchtaskDefinition,
+    ServiceDefinition,
 )
+from winconfig.exceptions import TaskError, TaskNotExecutableError
+
+from .registry import RegistryKeyWrite, is_registry_item, registry_writes
+from .timing import Timings
+
+type StatefulItem = (
+    RegistryPathDefinition
+    | RegistryEntryDefinition
+    | SchtaskDefinition
+    | ServiceDefinition
+)
+type TaskKey = tuple[DefinitionGroupName, DefinitionName]
 
 
 class TaskGroup(BaseModel):
@@ -18,24 +35,125 @@ class Task(DefinitionBody):
     name: DefinitionName
     mode: ActionMode | None
 
+    @classmethod
+    def from_definition(
+        cls,
+        group_name: DefinitionGroupName,
+        name: DefinitionName,
+        mode: ActionMode | None,
+        definition_body: DefinitionBody,
+    ) -> "Task":
+        """A task sharing the already validated fields of its definition body."""
+        return cls.model_construct(
+            group_name=group_name, name=name, mode=mode, **dict(definition_body)
+        )
+
     @property
     def full_name(self) -> str:
         return f"{self.group_name} > {self.name}"
 
-    def generate_script(self, mode: ExecutableActionMode) -> str:
+    @property
+    def key(self) -> TaskKey:
+        return (self.group_name, self.name)
+
+    @property
+    def items(self) -> list[StatefulItem]:
+        return [
+            registry_item
+            for registry_path in self.registries
+            for registry_item in registry_path.items
+        ] + [*self.scheduled_tasks, *self.services]
+
+    def generate_script(
+        self,
+        mode: ExecutableActionMode,
+        items: list[StatefulItem] | None = None,
+        *,
+        compact: bool = False,
+    ) -> str:
+        """Generate the script that sets the items, followed by the custom script.
+
+        Compact scripts call the helpers of HELPERS_PRELUDE, one line per item,
+        so they must run after the prelude.
+        """
         script = "\n".join(
             [
-                e.generate_set_script(mode)
-                for e in (
-                    [
-                        registry_item
-                        for registry_path in self.registries
-                        for registry_item in registry_path.items
-                    ]
-                    + self.scheduled_tasks
-                    + self.services
-                    + [self.script]
-                )
+                e.generate_compact_script(mode)
+                if compact
+                else e.generate_set_script(mode)
+                for e in [*(self.items if items is None else items), self.script]
             ]
         )
         return script
+
+
+class TaskRun(BaseModel):
+    """A task resolved for a single run, along with the outcome of executing it."""
+
+    task: Task
+    mode: ActionMode | None
+    script: str = ""
+    items: list[StatefulItem] = []
+    compliant_items: list[str] = []
+    compliant: bool = False
+    compact: bool = False
+    native_registry: bool = False
+    registry_writes: list[RegistryKeyWrite] = []
+    error: Exception | None = None
+    timings: Timings = {}
+    # shared by the tasks run in the same batch invocation
+    batch_timings: Timings | None = None
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def generate(self, items: list[StatefulItem] | None = None) -> None:
+        """Generate what sets the items, all items of the task by default.
+
+        With native_registry, registry items become registry writes and are
+        left out of the script.
+        """
+        mode = self.executable_mode
+        items = self.task.items if items is None else items
+        if self.native_registry:
+            self.registry_writes = registry_writes(
+                [item for item in items if is_registry_item(item)], mode
+            )
+            items = [item for item in items if not is_registry_item(item)]
+        self.script = self.task.generate_script(
+            mode, items, compact=self.compact
+        ).strip()
+
+    @property
+    def executable_mode(self) -> ExecutableActionMode:
+        """The mode of an executable task run, which can only apply or revert."""
+        mode = self.mode
+        if mode in (ActionMode.APPLY, ActionMode.REVERT):
+            return mode
+        raise TaskNotExecutableError(self.task.full_name, mode)
+
+    @property
+    def prelude(self) -> str:
+        return HELPERS_PRELUDE if self.compact else ""
+
+    @property
+    def executable(self) -> bool:
+        return (
+            self.mode is not None
+            and self.mode != ActionMode.SKIP
+            and not self.compliant
+        )
+
+    @property
+    def execute_ms(self) -> float:
+        """How long executing took, shared with the other tasks of a batch."""
+        timings = self.timings if self.batch_timings is None else self.batch_timings
+        return timings.get("execute", 0)
+
+    def raise_for_error(self) -> None:
+        if self.executable and self.error is not None:
+            raise TaskError(
+                task_name=self.task.full_name,
+                action_mode=self.executable_mode,
+                script=self.script,
+                exception=self.error,
+            ) from self.error
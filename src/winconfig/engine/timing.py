@@ -0,0 +1,37 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+type Timings = dict[str, float]
+
+_current_timings: ContextVar[Timings | None] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def recording(timings: Timings) -> Iterator[Timings]:
+    """Record what is timed within the block into timings, in milliseconds.
+
+    The recording is local to the calling thread, so tasks running on a pool of
+    runspaces each record into their own timings.
+    """
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Add the duration of the block to the current recording, if there is one."""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings = _current_timings.get()
+        if timings is not None:
+            elapsed = (perf_counter() - start) * 1000
+            timings[name] = timings.get(name, 0) + elapsed
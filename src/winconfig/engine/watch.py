@@ -0,0 +1,210 @@
+import sys
+import threading
+import time
+from collections.abc import Callable, Collection, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from .engine import Engine
+from .executor import shared_executor_factory
+from .report import RunReport
+from .task import TaskKey
+
+# editors write a file in several steps, so a notification waits for them
+NOTIFICATION_SETTLE_TIME = 0.1
+
+type FileStat = tuple[int, int]
+
+
+def file_stat(path: Path) -> FileStat | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        # an editor replacing the file, it is picked up once it is back
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def task_states(engine: Engine) -> dict[TaskKey, dict[str, Any]]:
+    """The mode and definition body of every task, to diff them between loads."""
+    return {
+        task.key: task.model_dump()
+        for task_group in engine.task_groups
+        for task in task_group.tasks
+    }
+
+
+def changed_tasks(
+    old: dict[TaskKey, dict[str, Any]], new: dict[TaskKey, dict[str, Any]]
+) -> set[TaskKey]:
+    """The tasks that are new or whose mode or definition body changed."""
+    return {key for key, state in new.items() if old.get(key) != state}
+
+
+class ConfigPoller:
+    """Finds the changed config files by comparing their mtime and size."""
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self.paths = list(paths)
+        self._stats = {path: file_stat(path) for path in self.paths}
+
+    def changed(self) -> list[Path]:
+        """The files changed since they were last recorded as loaded."""
+        return [
+            path
+            for path in self.paths
+            if (stat := file_stat(path)) is not None and stat != self._stats[path]
+        ]
+
+    def record(self, paths: Iterable[Path]) -> None:
+        """Record the files as loaded, so they are not changed until edited again."""
+        for path in paths:
+            self._stats[path] = file_stat(path)
+
+
+def notify_on_change(paths: Iterable[Path], callback: Callable[[], None]) -> list[Any]:
+    """Call back when one of the files changes, using .NET FileSystemWatchers.
+
+    Returns the watchers, which must be kept alive, or none where .NET is
+    unavailable and polling is all that is left.
+    """
+    if sys.platform != "win32":
+        return []
+    try:
+        import clr  # noqa: F401, PLC0415
+        from System.IO import (  # ty:ignore[unresolved-import]  # noqa: PLC0415
+            FileSystemWatcher,
+            NotifyFilters,
+        )
+    except ImportError:
+        return []
+
+    def handler(_sender: object, _args: object) -> None:
+        callback()
+
+    watchers = []
+    for path in paths:
+        watcher = FileSystemWatcher(str(path.parent), path.name)
+        watcher.NotifyFilter = (
+            NotifyFilters.LastWrite | NotifyFilters.FileName | NotifyFilters.Size
+        )
+        watcher.Changed += handler
+        watcher.Created += handler
+        watcher.Renamed += handler
+        watcher.EnableRaisingEvents = True
+        watchers.append(watcher)
+    return watchers
+
+
+class ConfigWatch:
+    """Re-applies the tasks whose mode or definition changed in the config files.
+
+    Only the changed files are loaded again, and all runs share one executor,
+    so a PowerShell runspace is created once for the whole watch.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        engine: Engine,
+        config_paths: Iterable[Path],
+        *,
+        reverse: bool = False,
+        batch: bool = False,
+        only_changed: bool = False,
+        compact: bool = False,
+        interval: float = 1.0,
+    ) -> None:
+        self.engine = engine
+        self.engine.executor_factory = shared_executor_factory(engine.executor_factory)
+        self.poller = ConfigPoller(config_paths)
+        self.reverse = reverse
+        self.batch = batch
+        self.only_changed = only_changed
+        self.compact = compact
+        self.interval = interval
+        self.task_states = task_states(engine)
+        self._wake = threading.Event()
+        self._stopped = False
+
+    def run_tasks(self, tasks: Collection[TaskKey] | None = None) -> set[TaskKey]:
+        """Run the given tasks, or all, and return those that failed or did not run."""
+        keys = {
+            task.full_name: task.key
+            for task_group in self.engine.task_groups
+            for task in task_group.tasks
+        }
+        report = RunReport(started_at=datetime.now(UTC))
+        try:
+            self.engine.run(
+                reverse=self.reverse,
+                batch=self.batch,
+                only_changed=self.only_changed,
+                compact=self.compact,
+                tasks=tasks,
+                report=report,
+            )
+        except Exception as e:  # noqa: BLE001
+            logger.error(str(e))
+            if not report.tasks:
+                # the run failed before any task was planned
+                return set(keys.values() if tasks is None else tasks)
+        return {
+            keys[task.name]
+            for task in report.tasks
+            if task.status in ("failed", "not_run")
+        }
+
+    def apply_changes(self) -> set[TaskKey]:
+        """Reload the changed config files and run the tasks they changed."""
+        changed_paths = self.poller.changed()
+        if not changed_paths:
+            return set()
+        # a file that fails to load is reported once, until it is edited again
+        self.poller.record(changed_paths)
+        logger.info(f"Changed: {', '.join(map(str, changed_paths))}")
+        try:
+            self.engine.reload(*changed_paths)
+        except Exception as e:  # noqa: BLE001
+            # the last applied states stay, so the fixed file is diffed against them
+            logger.error(str(e))
+            return set()
+
+        states = task_states(self.engine)
+        tasks = changed_tasks(self.task_states, states)
+        if tasks:
+            # the tasks that were not applied keep their last applied state,
+            # so they are run again on the next change
+            for key in self.run_tasks(tasks):
+                if key in self.task_states:
+                    states[key] = self.task_states[key]
+                else:
+                    del states[key]
+        else:
+            logger.info("No task changed")
+        self.task_states = states
+        return tasks
+
+    def watch(self) -> None:
+        """Apply every task, then the changed ones until stopped."""
+        for key in self.run_tasks():
+            self.task_states.pop(key, None)
+        watchers = notify_on_change(self.poller.paths, self._wake.set)
+        logger.info(
+            f"Watching {len(self.poller.paths)} config file(s), "
+            + ("notified on change and " if watchers else "")
+            + f"polling every {self.interval}s"
+        )
+        while True:
+            if self._wake.wait(self.interval):
+                time.sleep(NOTIFICATION_SETTLE_TIME)
+                self._wake.clear()
+            if self._stopped:
+                return
+            self.apply_changes()
+
+    def stop(self) -> None:
+        self._stopped = True
+        self._wake.set()
@@ -20,6 +20,23 @@ class TaskError(Exception):
         )
 
 
+class TaskNotExecutableError(Exception):
+    def __init__(self, task_name: str, action_mode: str | None) -> None:
+        super().__init__(f"{task_name} is not executable in mode {action_mode}")
+
+
+class RunCancelledError(Exception):
+    def __init__(self) -> None:
+        super().__init__("The run was cancelled")
+
+
+class RollbackError(Exception):
+    def __init__(self, item_names: list[str]) -> None:
+        super().__init__(
+            f"Failed to restore {len(item_names)} item(s): {', '.join(item_names)}"
+        )
+
+
 class ConfigError(Exception):
     pass
 
@@ -48,3 +65,17 @@ class DefinitionNotFoundError(ActionConfigValidationError):
         super().__init__(
             f'Definition "{action_name}" not found in Definition Group "{group_name}"'
         )
+
+
+class DaemonError(Exception):
+    pass
+
+
+class DaemonNotRunningError(DaemonError):
+    def __init__(self, address: str) -> None:
+        super().__init__(f'No daemon is listening on "{address}"')
+
+
+class DaemonAlreadyRunningError(DaemonError):
+    def __init__(self, address: str) -> None:
+        super().__init__(f'A daemon is already listening on "{address}"')
@@ -1,17 +1,23 @@
+import threading
 from typing import Any
 
+from loguru import logger
+from textual import work
 from textual.app import App, ComposeResult
 from textual.containers import Center
 from textual.reactive import reactive
+from textual.widget import AwaitMount
 from textual.widgets import (
     Footer,
     Header,
+    ProgressBar,
 )
 
 from winconfig.engine import Engine
 
-from .content import LogList, TaskList
+from .content import LogList, MessageHooks, RunFinished, TaskEnded, TaskList
 from .controller import LogListController, TaskListController
+from .root_access_mixin import RootAccessMixin
 
 
 class WinconfigApp(App):
@@ -23,7 +29,16 @@ class WinconfigApp(App):
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         super().__init__(*args, **kwargs)
-        self.engine = Engine()
+        # the outcome of a run is shown by the log list, not logged
+        self.engine = Engine(hooks=[])
+        self.cancel_run = threading.Event()
+
+    def on_mount(self) -> None:
+        # the terminal is drawn by the app, so nothing may log onto it
+        logger.disable("winconfig")
+
+    def on_unmount(self) -> None:
+        logger.enable("winconfig")
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -31,36 +46,61 @@ class WinconfigApp(App):
             yield Body()
         yield Footer()
 
-    def watch_running(self, _: bool, new_value: bool) -> None:  # noqa: FBT001
+    async def watch_running(self, _: bool, new_value: bool) -> None:  # noqa: FBT001
         is_running = new_value is True
         body = self.query_one(Body)
         if is_running:
-            body.mount_log()
+            await body.mount_log()
+            self.cancel_run = threading.Event()
+            self.run_engine(body)
         else:
-            body.mount_task_list()
-
-
-class Body(Center):
+            await body.mount_task_list()
+
+    @work(thread=True, exclusive=True)
+    def run_engine(self, body: "Body") -> None:
+        """Run the engine off the event loop, posting its progress to the body."""
+        hooks = MessageHooks(body)
+        self.engine.hooks.hooks.append(hooks)
+        error = None
+        try:
+            self.engine.run(reverse=False, cancel=self.cancel_run)
+        except Exception as e:  # noqa: BLE001
+            error = e
+        finally:
+            self.engine.hooks.hooks.remove(hooks)
+        body.post_message(RunFinished(error))
+
+
+class Body(Center, RootAccessMixin):
     def compose(self) -> ComposeResult:
         yield TaskListController()
         yield TaskList()
 
-    def mount_task_list(self) -> None:
+    def mount_task_list(self) -> AwaitMount:
         self.remove_children()
-        self.mount(
+        return self.mount(
             TaskListController(),
             TaskList(),
         )
 
-    def mount_log(self) -> None:
+    def mount_log(self) -> AwaitMount:
         self.remove_children()
-        self.mount(
-            LogListController(),
+        return self.mount(
+            LogListController(task_count=len(self.root.engine.task_index.order)),
             LogList(),
         )
 
     def on_import_button_imported(self) -> None:
         self.mount_task_list()
 
+    def on_task_ended(self, message: TaskEnded) -> None:
+        self.query_one(LogList).write_outcome(message.task_run)
+        self.query_one(ProgressBar).advance(1)
+
+    def on_run_finished(self, message: RunFinished) -> None:
+        if message.error is not None:
+            self.query_one(LogList).write_log(str(message.error))
+        self.query_one(LogListController).finish()
+
 
 app = WinconfigApp()
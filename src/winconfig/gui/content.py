@@ -1,9 +1,12 @@
+from bisect import bisect_left
+from datetime import datetime
 from typing import ClassVar, cast
 
-from loguru import logger
 from textual.app import ComposeResult
 from textual.containers import Container, Grid, Middle
 from textual.events import Focus
+from textual.message import Message
+from textual.message_pump import MessagePump
 from textual.widgets import (
     Label,
     ListItem,
@@ -14,27 +17,60 @@ from textual.widgets import (
 
 from winconfig.config.action import ActionMode
 from winconfig.engine import Task
+from winconfig.engine.hooks import EngineHooks, task_outcome
+from winconfig.engine.task import TaskKey, TaskRun
 
 from .root_access_mixin import RootAccessMixin
 
 
+class TaskEnded(Message):
+    """A task of a run ended, whether it ran or not."""
+
+    def __init__(self, task_run: TaskRun) -> None:
+        super().__init__()
+        self.task_run = task_run
+
+
+class RunFinished(Message):
+    """A run ended, with the error that stopped it if any."""
+
+    def __init__(self, error: Exception | None) -> None:
+        super().__init__()
+        self.error = error
+
+
+class MessageHooks(EngineHooks):
+    """Posts the end of every task to a widget, from the thread running the engine."""
+
+    def __init__(self, target: MessagePump) -> None:
+        self.target = target
+
+    def on_task_end(self, task_run: TaskRun, duration_ms: float) -> None:  # noqa: ARG002
+        self.target.post_message(TaskEnded(task_run))
+
+
 class LogList(Log):
     BORDER_TITLE = "LogList"
 
-    def on_mount(self) -> None:
-        logger.configure(
-            handlers=[
-                {
-                    "sink": self.write,
-                    "format": "<green>{time:HH:mm:ss.SSS}</green> | <level>{message}</level>",
-                    "level": "INFO",
-                }
-            ]  # ty:ignore[invalid-argument-type]  # loguru not having runtime type
-        )
+    def write_log(self, message: str) -> None:
+        now = datetime.now()
+        self.write_line(f"{now:%H:%M:%S}.{now.microsecond // 1000:03} | {message}")
+
+    def write_outcome(self, task_run: TaskRun) -> None:
+        for level, message in task_outcome(task_run):
+            if level != "DEBUG":
+                self.write_log(message)
 
 
 class TaskList(ListView, RootAccessMixin):
+    """The tasks as rows, mounted a page at a time as they are reached.
+
+    Only rows that are shown get mounted, in task order, and they are never
+    removed: filtering hides them instead.
+    """
+
     BORDER_TITLE = "TaskList"
+    PAGE_SIZE = 40
 
     BINDINGS: ClassVar = [
         ("a", f"set_action_mode('{ActionMode.APPLY}')", "Set apply mode"),
@@ -43,13 +79,91 @@ class TaskList(ListView, RootAccessMixin):
     ]
 
     def __init__(self) -> None:
-        super().__init__(
-            *[
-                TaskListItem(task=task)
-                for group in self.root.engine.task_groups
-                for task in group.tasks
-            ],
-        )
+        super().__init__()
+        self.tasks = [
+            task for group in self.root.engine.task_groups for task in group.tasks
+        ]
+        self.task_positions = {task.key: i for i, task in enumerate(self.tasks)}
+        self.search_texts = [
+            f"{task.full_name} {task.description} {' '.join(task.tags)}".lower()
+            for task in self.tasks
+        ]
+        self.filter_text = ""
+        self.task_rows: dict[TaskKey, TaskListItem] = {}
+        # the task positions of the mounted rows, in the order of the rows
+        self.mounted_positions: list[int] = []
+        self.all_shown_mounted = False
+
+    def on_mount(self) -> None:
+        self.mount_rows(self.PAGE_SIZE)
+
+    def row_index(self, key: TaskKey) -> int:
+        """The index of the mounted row of a task among the rows."""
+        return bisect_left(self.mounted_positions, self.task_positions[key])
+
+    def is_shown(self, position: int) -> bool:
+        return self.filter_text in self.search_texts[position]
+
+    def mount_rows(self, count: int) -> None:
+        """Mount the first count rows that would be shown and are not mounted yet."""
+        if self.all_shown_mounted or count <= 0:
+            return
+        positions = []
+        for position, task in enumerate(self.tasks):
+            if task.key not in self.task_rows and self.is_shown(position):
+                positions.append(position)
+                if len(positions) == count:
+                    break
+        else:
+            self.all_shown_mounted = True
+        if not positions:
+            return
+
+        highlighted = self.highlighted_child
+        # rows going to the same index are mounted together, from the last index
+        # on so that the earlier indices stay valid
+        runs: dict[int, list[TaskListItem]] = {}
+        for position in positions:
+            row = TaskListItem(self.tasks[position])
+            self.task_rows[row.winconfig_task.key] = row
+            runs.setdefault(bisect_left(self.mounted_positions, position), []).append(
+                row
+            )
+        for index in sorted(runs, reverse=True):
+            self.insert(index, runs[index])
+        self.mounted_positions = sorted(self.mounted_positions + positions)
+        if isinstance(highlighted, TaskListItem):
+            self.index = self.row_index(highlighted.winconfig_task.key)
+
+    def apply_filter(self, text: str) -> None:
+        """Show only the rows whose task name, description or tags contain text."""
+        self.filter_text = text.lower()
+        self.all_shown_mounted = False
+        shown = 0
+        for key, row in self.task_rows.items():
+            row.shown = self.is_shown(self.task_positions[key])
+            shown += row.shown
+        self.mount_rows(self.PAGE_SIZE - shown)
+        highlighted = self.highlighted_child
+        if highlighted is None or not highlighted.display:
+            self.index = next(
+                (
+                    i
+                    for i, position in enumerate(self.mounted_positions)
+                    if self.is_shown(position)
+                ),
+                None,
+            )
+
+    def watch_index(self, old_index: int | None, new_index: int | None) -> None:
+        super().watch_index(old_index, new_index)
+        if new_index is not None and new_index >= len(self.task_rows) - 1:
+            self.mount_rows(self.PAGE_SIZE)
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value >= self.max_scroll_y - self.size.height:
+            self.mount_rows(self.PAGE_SIZE)
 
     def action_set_action_mode(self, mode: ActionMode) -> None:
         selected_line = self.highlighted_child
@@ -61,9 +175,19 @@ class TaskListItem(ListItem):
     winconfig_task: Task
 
     def __init__(self, task: Task) -> None:
-        super().__init__(classes=f"{task.group_name} {task.name}")
+        super().__init__()
         self.winconfig_task = task
 
+    @property
+    def shown(self) -> bool:
+        return self.display
+
+    @shown.setter
+    def shown(self, shown: bool) -> None:
+        # disabled rows are skipped by the cursor
+        self.display = shown
+        self.disabled = not shown
+
     def compose(self) -> ComposeResult:
         with Grid():
             with Middle():
@@ -105,17 +229,16 @@ class TaskSelect(RootAccessMixin, Select):
         self.winconfig_task = task
 
     def on_focus(self, _: Focus) -> None:
-        list_item = self.screen.query_one(
-            f".{self.winconfig_task.group_name}.{self.winconfig_task.name}", ListItem
-        )
-        list_view = self.screen.query_one(ListView)
-        list_view.index = list_view._nodes.index(list_item)  # noqa: SLF001
+        task_list = self.query_ancestor(TaskList)
+        task_list.index = task_list.row_index(self.winconfig_task.key)
 
     def watch_value(self, old_value: str, new_value: str) -> None:
         if old_value != Select.BLANK:
             self.remove_class(old_value)
         if new_value != Select.BLANK:
             self.add_class(new_value)
-            self.root.engine.config.action_config.root[self.winconfig_task.group_name][
-                self.winconfig_task.name
-            ] = cast("ActionMode", new_value)
+            self.root.engine.set_mode(
+                self.winconfig_task.group_name,
+                self.winconfig_task.name,
+                cast("ActionMode", new_value),
+            )
@@ -1,21 +1,22 @@
 from __future__ import annotations
 
 import json
-import subprocess
-from pathlib import Path
-from textwrap import dedent
 from typing import TYPE_CHECKING
 
 import yaml
 from textual.containers import HorizontalGroup, Right
 from textual.message import Message
-from textual.widgets import Button, Log
+from textual.widgets import Button, Input, ProgressBar
 
-from winconfig.engine import Engine
+from winconfig.exceptions import ConfigError
 
+from .content import TaskList
+from .file_picker import FilePicker
 from .root_access_mixin import RootAccessMixin
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from textual.app import ComposeResult
 
 
@@ -23,15 +24,34 @@ class TaskListController(HorizontalGroup):
     def compose(self) -> ComposeResult:
         yield ImportButton()
         yield ExportButton()
+        yield TaskFilter()
         with Right():
             yield RunButton()
 
 
 class LogListController(HorizontalGroup):
+    def __init__(self, task_count: int) -> None:
+        super().__init__()
+        self.task_count = task_count
+
     def compose(self) -> ComposeResult:
+        yield ProgressBar(total=self.task_count, show_eta=False)
         with Right():
+            yield CancelButton()
             yield BackButton()
 
+    def finish(self) -> None:
+        self.query_one(CancelButton).disabled = True
+        self.query_one(BackButton).disabled = False
+
+
+class TaskFilter(Input):
+    def __init__(self) -> None:
+        super().__init__(placeholder="Filter tasks")
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        self.screen.query_one(TaskList).apply_filter(event.value)
+
 
 class RunButton(Button, RootAccessMixin):
     def __init__(self) -> None:
@@ -41,12 +61,22 @@ class RunButton(Button, RootAccessMixin):
             flat=True,
         )
 
-    async def on_button_pressed(self, _: Button.Pressed) -> None:
+    def on_button_pressed(self, _: Button.Pressed) -> None:
         self.root.running = True
-        try:
-            self.root.engine.run(reverse=False)
-        except Exception as e:  # noqa: BLE001
-            self.app.screen.query_one(Log).write(str(e))
+
+
+class CancelButton(Button, RootAccessMixin):
+    def __init__(self) -> None:
+        super().__init__(
+            "Cancel",
+            variant="error",
+            flat=True,
+        )
+
+    def on_button_pressed(self, _: Button.Pressed) -> None:
+        # the run stops once the task it is on ends
+        self.root.cancel_run.set()
+        self.disabled = True
 
 
 class ImportButton(Button, RootAccessMixin):
@@ -61,39 +91,18 @@ class ImportButton(Button, RootAccessMixin):
         pass
 
     def on_button_pressed(self, _: Button.Pressed) -> None:
-        result = subprocess.run(  # noqa: S603
-            [
-                "powershell",
-                "-Command",
-                dedent(
-                    """
-                    Add-Type -TypeDefinition @"
-                        using System.Runtime.InteropServices;
-                        public class DPIAware {
-                            [DllImport("user32.dll")]
-                            public static extern bool SetProcessDPIAware();
-                        }
-                    "@
-                    [DPIAware]::SetProcessDPIAware() | Out-Null
-                    Add-Type -AssemblyName System.Windows.Forms
-                    $dialog = New-Object System.Windows.Forms.OpenFileDialog
-                    $dialog.Filter = 'yaml files (*.yaml)|*.yaml|All files (*.*)|*.*'
-                    @{
-                        "success" = if ($dialog.ShowDialog() -eq "OK") { $true }else { $false }
-                        "path"   = $dialog.FileName
-                    } | ConvertTo-Json
-                    """
-                ),
-            ],
-            check=False,
-            capture_output=True,
-            text=True,
-        )
-        ps_result = json.loads(result.stdout.strip())
-        if ps_result["success"]:
-            self.root.engine = Engine()
-            self.root.engine.config.merge_from_yaml(Path(ps_result["path"]))
-            self.post_message(self.Imported())
+        self.app.push_screen(FilePicker("Import a config file"), self.import_config)
+
+    def import_config(self, path: Path | None) -> None:
+        """Merge the file into the config of the engine, on top of what it has."""
+        if path is None:
+            return
+        try:
+            self.root.engine.reload(path)
+        except (ConfigError, OSError, UnicodeDecodeError) as e:
+            self.notify(str(e), severity="error")
+            return
+        self.post_message(self.Imported())
 
 
 class ExportButton(Button, RootAccessMixin):
@@ -105,40 +114,25 @@ class ExportButton(Button, RootAccessMixin):
         )
 
     def on_button_pressed(self, _: Button.Pressed) -> None:
-        result = subprocess.run(  # noqa: S603
-            [
-                "powershell",
-                "-Command",
-                dedent(
-                    """
-                    Add-Type -TypeDefinition @"
-                        using System.Runtime.InteropServices;
-                        public class DPIAware {
-                            [DllImport("user32.dll")]
-                            public static extern bool SetProcessDPIAware();
-                        }
-                    "@
-                    [DPIAware]::SetProcessDPIAware() | Out-Null
-                    Add-Type -AssemblyName System.Windows.Forms
-                    $dialog = New-Object System.Windows.Forms.SaveFileDialog
-                    $dialog.Filter = 'yaml files (*.yaml)|*.yaml|All files (*.*)|*.*'
-                    $dialog.FileName = 'winconfig.config.yaml'
-                    @{
-                        "success" = if ($dialog.ShowDialog() -eq "OK") { $true }else { $false }
-                        "path"   = $dialog.FileName
-                    } | ConvertTo-Json
-                    """
-                ),
-            ],
-            check=False,
-            capture_output=True,
-            text=True,
+        self.app.push_screen(
+            FilePicker(
+                "Export the config", save=True, file_name="winconfig.config.yaml"
+            ),
+            self.export_config,
         )
-        ps_result = json.loads(result.stdout.strip())
-        if ps_result["success"]:
-            Path(ps_result["path"]).write_text(
-                yaml.safe_dump(json.loads(self.root.engine.config.model_dump_json()))
+
+    def export_config(self, path: Path | None) -> None:
+        if path is None:
+            return
+        try:
+            path.write_text(
+                yaml.safe_dump(json.loads(self.root.engine.config.model_dump_json())),
+                encoding="utf-8",
             )
+        except OSError as e:
+            self.notify(str(e), severity="error")
+            return
+        self.notify(f"Exported to {path}")
 
 
 class BackButton(Button, RootAccessMixin):
@@ -147,6 +141,8 @@ class BackButton(Button, RootAccessMixin):
             "Back",
             variant="primary",
             flat=True,
+            # enabled once the run finishes
+            disabled=True,
         )
 
     def on_button_pressed(self, _: Button.Pressed) -> None:
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, ClassVar
+
+from textual.containers import HorizontalGroup, Right, Vertical
+from textual.screen import ModalScreen
+from textual.widgets import Button, DirectoryTree, Input, Label
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from textual.app import ComposeResult
+
+CONFIG_SUFFIXES = {".yaml", ".yml"}
+
+
+class ConfigDirectoryTree(DirectoryTree):
+    """Directories and config files, without hidden ones."""
+
+    def filter_paths(self, paths: Iterable[Path]) -> Iterable[Path]:
+        return [
+            path
+            for path in paths
+            if not path.name.startswith(".")
+            and (path.is_dir() or path.suffix.lower() in CONFIG_SUFFIXES)
+        ]
+
+
+class FilePicker(ModalScreen[Path | None]):
+    """Picks a config file to open, or a path to save to with save.
+
+    The picked path is typed in or chosen in the tree, and typing a directory
+    moves the tree there.
+    """
+
+    BINDINGS: ClassVar = [("escape", "cancel", "Cancel")]
+
+    def __init__(self, prompt: str, *, save: bool = False, file_name: str = "") -> None:
+        super().__init__()
+        self.prompt = prompt
+        self.save = save
+        self.file_name = file_name
+
+    def compose(self) -> ComposeResult:
+        with Vertical():
+            yield Label(self.prompt)
+            yield ConfigDirectoryTree(Path.cwd())
+            yield Input(
+                value=str(Path.cwd() / self.file_name) if self.file_name else "",
+                placeholder="Path",
+            )
+            with HorizontalGroup(), Right():
+                yield Button("Cancel", id="cancel", flat=True)
+                yield Button(
+                    "Save" if self.save else "Open",
+                    id="pick",
+                    variant="primary",
+                    flat=True,
+                )
+
+    def on_directory_tree_file_selected(
+        self, event: DirectoryTree.FileSelected
+    ) -> None:
+        self.query_one(Input).value = str(event.path)
+        if not self.save:
+            self.pick()
+
+    def on_directory_tree_directory_selected(
+        self, event: DirectoryTree.DirectorySelected
+    ) -> None:
+        if self.save:
+            name = Path(self.query_one(Input).value).name or self.file_name
+            self.query_one(Input).value = str(event.path / name)
+
+    def on_input_submitted(self, _: Input.Submitted) -> None:
+        self.pick()
+
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "pick":
+            self.pick()
+        else:
+            self.dismiss(None)
+
+    def action_cancel(self) -> None:
+        self.dismiss(None)
+
+    def pick(self) -> None:
+        value = self.query_one(Input).value.strip()
+        if not value:
+            return
+        tree = self.query_one(ConfigDirectoryTree)
+        # relative paths are relative to the directory shown in the tree
+        path = (Path(tree.path) / Path(value).expanduser()).resolve()
+        if path.is_dir():
+            tree.path = path
+        elif path.is_file() or (self.save and path.parent.is_dir()):
+            self.dismiss(path)
+        else:
+            self.notify(f'"{path}" does not exist', severity="error")
@@ -2,6 +2,8 @@ from typing import Final, Literal
 
 ACCESS_DENIED: Final = "<AccessDenied>"
 PERMISSION_DENIED: Final = "<PermissionDenied>"
+# recorded for an item whose state could not be read, so it is not restored
+UNREADABLE: Final = "<Unreadable>"
 NOT_EXIST = "<NotExist>"
 type NotExistType = Literal["<NotExist>"]
 EXIST = "<Exist>"
@@ -1,45 +1,109 @@
+import re
+import sys
+import time
+from collections.abc import Callable, Collection, Mapping
+from pathlib import Path
+
 import pytest
 
-from winconfig.config.action import ActionMode, ExecutableActionMode
-from winconfig.engine import Engine, Task
-from winconfig.engine.powershell import PowershellRunspace
+from winconfig.cache_dir import CACHE_DIR_ENV
+from winconfig.engine import Engine
+from winconfig.engine.batch import BatchResult
+from winconfig.exceptions import PowerShellError
+
+# the sandbox suite drives a real PowerShell runspace
+collect_ignore = ["sandbox"] if sys.platform != "win32" else []
+
+SAMPLE_CONFIG_PATH = Path(__file__).parents[1] / "samples" / "winconfig.config.yaml"
+FAKE_ERROR = "fake failure"
+
+
+class FakeExecutor:
+    """Records scripts instead of running them, answering batches per section."""
+
+    def __init__(
+        self,
+        failing: Collection[str] = (),
+        delay: float = 0,
+        outputs: Mapping[str, str] | None = None,
+    ) -> None:
+        self.scripts: list[str] = []
+        self.failing = failing
+        self.delay = delay
+        self.outputs = outputs or {}
 
+    def is_failing(self, script: str) -> bool:
+        return any(marker in script for marker in self.failing)
 
-@pytest.fixture(autouse=True, scope="session")
-def ensure_sandbox():
-    is_sandbox = (
-        PowershellRunspace().run(
-            '((Get-WmiObject Win32_ComputerSystem).Model -eq "Virtual Machine")'
+    def run(self, script: str) -> str:
+        self.scripts.append(script)
+        time.sleep(self.delay)
+        sections = re.findall(
+            r"^#region (.+?)$(.*?)^#endregion$", script, flags=re.MULTILINE | re.DOTALL
         )
-        == "True"
-    )
-    if not is_sandbox:
-        pytest.fail("This test must be run inside a Windows Sandbox")
-
-
-def generate_runtime_sets() -> list[tuple[PowershellRunspace, Task]]:
-    engine = Engine()
-    runspace = PowershellRunspace()
-    runtime_sets = [
-        (runspace, task) for group in engine.task_groups for task in group.tasks
-    ]
-    return runtime_sets
-
-
-@pytest.fixture(
-    scope="session",
-    params=generate_runtime_sets(),
-    ids=lambda runtime_set: runtime_set[1].name,
-)
-def runtime_set(
-    request: pytest.FixtureRequest,
-) -> tuple[PowershellRunspace, Task]:
-    return request.param
-
-
-@pytest.fixture(
-    params=[ActionMode.APPLY, ActionMode.REVERT],
-    ids=lambda e: e,
-)
-def mode(request: pytest.FixtureRequest) -> ExecutableActionMode:
-    return request.param
+        if not sections:
+            if self.is_failing(script):
+                raise PowerShellError(FAKE_ERROR)
+            return ""
+
+        results = []
+        for name, body in sections:
+            result = BatchResult(
+                name=name,
+                output=[v for k, v in self.outputs.items() if k in body],
+                errors=[FAKE_ERROR] if self.is_failing(body) else [],
+            )
+            results.append(result.model_dump_json())
+            if result.errors:
+                break
+        return "\n".join(results)
+
+
+@pytest.fixture(autouse=True)
+def config_cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> Path:
+    directory = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv(CACHE_DIR_ENV, str(directory))
+    return directory
+
+
+@pytest.fixture
+def fake_executor() -> FakeExecutor:
+    return FakeExecutor()
+
+
+@pytest.fixture
+def engine(fake_executor: FakeExecutor) -> Engine:
+    return Engine(SAMPLE_CONFIG_PATH, executor_factory=lambda: fake_executor)
+
+
+@pytest.fixture
+def sample_config_path(tmp_path: Path) -> Path:
+    """A copy of the sample config that the test may edit."""
+    path = tmp_path / "config.yaml"
+    path.write_text(SAMPLE_CONFIG_PATH.read_text())
+    return path
+
+
+@pytest.fixture
+def executors() -> list[FakeExecutor]:
+    return []
+
+
+@pytest.fixture
+def failing() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def recording_executor_factory(
+    executors: list[FakeExecutor], failing: list[str]
+) -> Callable[[], FakeExecutor]:
+    """Creates executors failing on the markers of failing, appending them to executors."""
+
+    def executor_factory() -> FakeExecutor:
+        executors.append(FakeExecutor(failing=failing))
+        return executors[-1]
+
+    return executor_factory
@@ -0,0 +1,75 @@
+import pytest
+
+from tests.conftest import SAMPLE_CONFIG_PATH, FakeExecutor
+from winconfig.engine import Engine
+from winconfig.engine.batch import (
+    BatchEntry,
+    BatchResult,
+    generate_batch_script,
+    parse_batch_output,
+)
+from winconfig.exceptions import (
+    PowerShellAdminRequiredError,
+    PowerShellError,
+    TaskError,
+)
+from winconfig.protocol.state_codes import PERMISSION_DENIED
+
+
+def test_batch_runs_in_single_invocation(engine: Engine, fake_executor: FakeExecutor):
+    engine.run(reverse=False, batch=True)
+    executable_runs = [e for e in engine.plan(reverse=False) if e.executable]
+
+    assert len(fake_executor.scripts) == 1
+    for task_run in executable_runs:
+        assert f"#region {task_run.task.full_name}\n" in fake_executor.scripts[0]
+
+
+def test_sequential_runs_one_invocation_per_task(
+    engine: Engine, fake_executor: FakeExecutor
+):
+    engine.run(reverse=False)
+    executable_runs = [e for e in engine.plan(reverse=False) if e.executable]
+
+    assert len(fake_executor.scripts) == len(executable_runs)
+
+
+def test_batch_failure_keeps_task_detail():
+    executor = FakeExecutor(failing=["SearchboxTaskbarMode"])
+    engine = Engine(SAMPLE_CONFIG_PATH, executor_factory=lambda: executor)
+
+    with pytest.raises(TaskError, match="Taskbar > HideSearch") as exc_info:
+        engine.run(reverse=False, batch=True)
+    assert "SearchboxTaskbarMode" in str(exc_info.value)
+    assert "#region" not in str(exc_info.value)
+
+
+def test_batch_script_keeps_entry_script_verbatim():
+    script = '$text = @"\nunindented\n"@\n$text'
+    batch_script = generate_batch_script([BatchEntry(name="it's", script=script)])
+
+    assert "name = 'it''s'" in batch_script
+    assert f"\n{script}\n" in batch_script
+
+
+def test_parse_batch_output_skips_noise():
+    output = "\n".join(
+        [
+            "noise",
+            BatchResult(name="A > B", output=["1"]).model_dump_json(),
+            BatchResult(name="A > C", errors=["boom"]).model_dump_json(),
+        ]
+    )
+    results = parse_batch_output(output)
+
+    assert [result.name for result in results] == ["A > B", "A > C"]
+    assert results[0].text == "1"
+    results[0].raise_for_error()
+    with pytest.raises(PowerShellError, match="boom"):
+        results[1].raise_for_error()
+
+
+def test_permission_denied_raises_admin_required():
+    result = BatchResult(name="A > B", output=[PERMISSION_DENIED])
+    with pytest.raises(PowerShellAdminRequiredError):
+        result.raise_for_error()
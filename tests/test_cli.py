@@ -0,0 +1,35 @@
+import subprocess
+import sys
+
+from loguru import logger
+
+from winconfig.cli.cli_utils import loglevel_callback
+
+
+def test_cli_import_loads_no_subcommand_dependency():
+    script = "import sys, winconfig.cli.main; print(*sys.modules)"
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    modules = set(result.stdout.split())
+
+    assert not {m.split(".")[0] for m in modules} & {
+        "clr",
+        "pydantic",
+        "textual",
+        "yaml",
+    }
+    assert not {"winconfig.config", "winconfig.engine", "winconfig.gui"} & modules
+
+
+def test_loglevel_replaces_only_the_stderr_handler():
+    messages = []
+    handler_id = logger.add(messages.append, level="INFO", format="{message}")
+    try:
+        loglevel_callback("SILENT")
+        logger.info("kept")
+    finally:
+        loglevel_callback("INFO")
+        logger.remove(handler_id)
+
+    assert messages == ["kept\n"]
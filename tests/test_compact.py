@@ -0,0 +1,95 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from tests.conftest import FakeExecutor
+from winconfig.config.action import ActionMode
+from winconfig.config.definition import HELPERS_PRELUDE
+from winconfig.engine import Engine
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    config = {
+        "Definitions": {
+            "Compact": {
+                "Tasks": {
+                    "description": "Two scheduled tasks.",
+                    "scheduled_tasks": [
+                        {
+                            "full_path": rf"\Microsoft\Windows\{name}",
+                            "old_state": "Enabled",
+                            "new_state": "Disabled",
+                        }
+                        for name in ("First", "Second")
+                    ],
+                },
+                "Registry": {
+                    "description": "A key with an entry.",
+                    "registries": [
+                        {
+                            "path": r"HKCU\Software\It's",
+                            "entries": [
+                                {
+                                    "name": "Value",
+                                    "type": "Binary",
+                                    "new_value": "1 2",
+                                    "old_value": "<NotExist>",
+                                }
+                            ],
+                        }
+                    ],
+                },
+            }
+        },
+        "Actions": {"Compact": {"Tasks": "apply", "Registry": "revert"}},
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    return path
+
+
+def test_compact_script_is_one_line_per_item(engine: Engine):
+    for task_group in engine.task_groups:
+        for task in task_group.tasks:
+            for mode in (ActionMode.APPLY, ActionMode.REVERT):
+                compact = task.generate_script(mode, compact=True)
+                full = task.generate_script(mode)
+                if not task.script.resolve_value(mode).strip():
+                    assert len(compact.strip().splitlines()) <= len(task.items)
+                assert len(compact) <= len(full)
+
+
+def test_compact_batch_defines_helpers_once(config_path: Path):
+    executor = FakeExecutor()
+    engine = Engine(config_path, executor_factory=lambda: executor)
+    engine.run(reverse=False, batch=True, compact=True)
+
+    (script,) = executor.scripts
+    assert script.startswith(HELPERS_PRELUDE)
+    assert script.count("function Set-WcTask") == 1
+    assert script.count('New-Object -ComObject "Schedule.Service"') == 1
+    assert r"Set-WcTask '\Microsoft\Windows\First' $false" in script
+    assert r"Set-WcRegValue 'Registry::HKCU\Software\It''s' 'Value' -Remove" in script
+
+
+def test_compact_sequential_scripts_carry_helpers(config_path: Path):
+    executor = FakeExecutor()
+    engine = Engine(config_path, executor_factory=lambda: executor)
+    engine.run(reverse=False, compact=True)
+
+    assert len(executor.scripts) == 2
+    assert all(script.startswith(HELPERS_PRELUDE) for script in executor.scripts)
+
+
+def test_compact_scripts_are_cached_separately(config_path: Path):
+    engine = Engine(config_path, executor_factory=FakeExecutor)
+    full_runs = engine.plan(reverse=False)
+    compact_runs = engine.plan(reverse=False, compact=True)
+
+    for full_run, compact_run in zip(full_runs, compact_runs, strict=True):
+        if not full_run.executable:
+            continue
+        assert "Set-Wc" not in full_run.script
+        assert "Set-Wc" in compact_run.script
@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, Field, create_model
+
+from tests.conftest import SAMPLE_CONFIG_PATH
+from winconfig.config.cache import ConfigCache, model_fields_hash
+from winconfig.config.config import Config
+from winconfig.config.definition import RegistryEntryDefinition
+from winconfig.engine import Engine
+from winconfig.exceptions import ConfigYamlError
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+
+@pytest.fixture
+def parses(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    parsed: list[Path] = []
+    from_yaml_texts = Config.from_yaml_texts
+
+    def recording_from_yaml_texts(documents: list[tuple[str, Path]]) -> list[Config]:
+        parsed.extend(file_path for _, file_path in documents)
+        return from_yaml_texts(documents)
+
+    monkeypatch.setattr(Config, "from_yaml_texts", recording_from_yaml_texts)
+    return parsed
+
+
+def test_warm_load_skips_parsing(tmp_path: Path, parses: list[Path]):
+    cache = ConfigCache(tmp_path / "cache")
+    cold = cache.load(BUILTIN_DEFINITION_PATH)
+    warm = cache.load(BUILTIN_DEFINITION_PATH)
+
+    assert parses == [BUILTIN_DEFINITION_PATH]
+    assert warm.model_dump() == cold.model_dump()
+    registry = next(
+        registry
+        for group in warm.definition_config.root.values()
+        for body in group.values()
+        for registry in body.registries
+        if registry.entries
+    )
+    assert isinstance(registry.entries[0], RegistryEntryDefinition)
+    assert registry.entries[0].key_path == registry.path
+
+
+def test_touched_file_is_checked_by_hash(
+    tmp_path: Path, sample_config_path: Path, parses: list[Path]
+):
+    cache = ConfigCache(tmp_path / "cache")
+    cache.load(sample_config_path)
+    stat = sample_config_path.stat()
+    os.utime(sample_config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    cache.load(sample_config_path)
+
+    assert parses == [sample_config_path]
+
+
+def test_changed_file_is_parsed_again(
+    tmp_path: Path, sample_config_path: Path, parses: list[Path]
+):
+    cache = ConfigCache(tmp_path / "cache")
+    cache.load(sample_config_path)
+    sample_config_path.write_text(sample_config_path.read_text() + "\n# changed\n")
+    cache.load(sample_config_path)
+
+    assert parses == [sample_config_path, sample_config_path]
+
+
+def test_unreadable_entry_is_ignored(
+    tmp_path: Path, sample_config_path: Path, parses: list[Path]
+):
+    cache = ConfigCache(tmp_path / "cache")
+    cache.load(sample_config_path)
+    cache.entry_path(sample_config_path).write_bytes(b"not a pickle")
+    cache.load(sample_config_path)
+
+    assert parses == [sample_config_path, sample_config_path]
+
+
+def test_invalid_yaml_is_not_cached(tmp_path: Path):
+    path = tmp_path / "broken.yaml"
+    path.write_text("Actions: [")
+    cache = ConfigCache(tmp_path / "cache")
+
+    for _ in range(2):
+        with pytest.raises(ConfigYamlError):
+            cache.load(path)
+    assert not cache.entry_path(path).exists()
+
+
+def test_engine_uses_cache(config_cache_dir: Path, parses: list[Path]):
+    Engine(SAMPLE_CONFIG_PATH)
+    Engine(SAMPLE_CONFIG_PATH)
+
+    assert parses == [BUILTIN_DEFINITION_PATH, SAMPLE_CONFIG_PATH]
+    assert len(list(config_cache_dir.glob("*.config.pickle"))) == 2
+
+
+def nested_model(value_type: Any) -> type[BaseModel]:  # noqa: ANN401
+    entry = create_model("Entry", value=(value_type, ...))
+    return create_model("Root", entry=(entry, ...))
+
+
+def test_model_hash_follows_nested_fields():
+    assert model_fields_hash(nested_model(str)) == model_fields_hash(nested_model(str))
+    assert model_fields_hash(nested_model(str)) != model_fields_hash(
+        nested_model(str | list[str])
+    )
+
+
+def test_model_hash_follows_field_descriptions():
+    def described(description: str) -> type[BaseModel]:
+        return create_model(
+            "Root", value=(str, Field(default="", description=description))
+        )
+
+    assert model_fields_hash(described("old")) != model_fields_hash(described("new"))
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from tests.conftest import SAMPLE_CONFIG_PATH
+from winconfig.config import config as config_module
+from winconfig.config.config import Config
+from winconfig.exceptions import ConfigYamlError
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+
+@pytest.fixture
+def layered_paths(tmp_path: Path) -> list[Path]:
+    sample = yaml.safe_load(SAMPLE_CONFIG_PATH.read_text())
+    paths = []
+    for i, (group_name, group) in enumerate(sample["Actions"].items()):
+        path = tmp_path / f"{i:02}.yaml"
+        layer = {"Actions": {group_name: group}}
+        if i % 2:
+            layer["Actions"][group_name] = dict.fromkeys(group, "revert")
+        path.write_text(yaml.safe_dump(layer, sort_keys=False))
+        paths.append(path)
+    return paths
+
+
+@pytest.fixture
+def parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config_module, "PARALLEL_PARSE_MIN_SIZE", 0)
+    monkeypatch.setattr(config_module.os, "cpu_count", lambda: 4)
+
+
+def pure_python_merge(paths: list[Path]) -> Config:
+    configs = [
+        Config.model_validate(yaml.load(path.read_text(), Loader=yaml.SafeLoader))
+        for path in [BUILTIN_DEFINITION_PATH, *paths]
+    ]
+    return configs[0].merge(*configs[1:])
+
+
+@pytest.mark.usefixtures("parallel")
+def test_parallel_merge_matches_sequential_pure_python(layered_paths: list[Path]):
+    merged = Config.from_yaml(BUILTIN_DEFINITION_PATH).merge_from_yaml(*layered_paths)
+
+    assert merged.model_dump() == pure_python_merge(layered_paths).model_dump()
+    assert list(merged.action_config.root) == list(
+        pure_python_merge(layered_paths).action_config.root
+    )
+
+
+@pytest.mark.usefixtures("parallel")
+def test_parallel_parse_error_names_file(tmp_path: Path, layered_paths: list[Path]):
+    broken = tmp_path / "broken.yaml"
+    broken.write_text("Actions: [")
+
+    with pytest.raises(ConfigYamlError, match=r"broken\.yaml"):
+        Config.from_yaml_files([*layered_paths, broken])
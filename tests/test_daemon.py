@@ -0,0 +1,123 @@
+import getpass
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from multiprocessing import AuthenticationError
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import FakeExecutor
+from winconfig.daemon.client import DaemonClient
+from winconfig.daemon.protocol import create_key, default_address, key_path, read_key
+from winconfig.daemon.server import DaemonServer
+from winconfig.engine import Engine
+from winconfig.exceptions import DaemonError, DaemonNotRunningError
+
+
+@pytest.fixture
+def client(
+    sample_config_path: Path,
+    recording_executor_factory: Callable[[], FakeExecutor],
+    config_cache_dir: Path,
+) -> Iterator[DaemonClient]:
+    address = str(config_cache_dir / "daemon.sock")
+    server = DaemonServer(
+        Engine(sample_config_path, executor_factory=recording_executor_factory),
+        [sample_config_path],
+        address=address,
+    )
+    thread = threading.Thread(target=server.serve)
+    thread.start()
+    client = DaemonClient(address)
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            client.request("ping")
+            break
+        except DaemonNotRunningError:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    yield client
+    client.request("stop")
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_requests_share_one_executor(
+    client: DaemonClient, executors: list[FakeExecutor]
+):
+    client.request("apply")
+    count = len(executors[0].scripts)
+    client.request("revert", batch=True)
+
+    assert count > 0
+    assert len(executors) == 1
+    assert len(executors[0].scripts) == count + 1
+
+
+def test_plan_follows_config_changes(client: DaemonClient, sample_config_path: Path):
+    assert "Taskbar > HideSearch[apply]" in client.request("plan")
+
+    sample_config_path.write_text(
+        sample_config_path.read_text().replace(
+            "HideSearch: apply", "HideSearch: revert"
+        )
+    )
+
+    assert "Taskbar > HideSearch[revert]" in client.request("plan")
+
+
+def test_invalid_config_fails_every_request_until_fixed(
+    client: DaemonClient, sample_config_path: Path
+):
+    valid = sample_config_path.read_text()
+    sample_config_path.write_text(
+        valid.replace("HideSearch: apply", "HideSearch: wrong")
+    )
+
+    for _ in range(2):
+        with pytest.raises(DaemonError):
+            client.request("plan")
+
+    sample_config_path.write_text(
+        valid.replace("HideSearch: apply", "HideSearch: revert")
+    )
+
+    assert "Taskbar > HideSearch[revert]" in client.request("plan")
+
+
+def test_snapshot_returns_content(client: DaemonClient):
+    assert client.request("snapshot", format="json").startswith("[")
+
+
+def test_invalid_request_is_reported(client: DaemonClient):
+    with pytest.raises(DaemonError, match="Invalid request"):
+        client.request("delete")
+
+    assert client.request("ping") == "pong"
+
+
+def test_wrong_key_is_rejected(client: DaemonClient):
+    key = read_key()
+    create_key()
+    try:
+        with pytest.raises(AuthenticationError):
+            client.request("ping")
+    finally:
+        key_path().write_bytes(key)
+
+    assert client.request("ping") == "pong"
+
+
+def test_no_daemon(config_cache_dir: Path):
+    with pytest.raises(DaemonNotRunningError):
+        DaemonClient(str(config_cache_dir / "daemon.sock")).request("ping")
+
+
+def test_pipe_address_is_per_user(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setattr(getpass, "getuser", lambda: "someone")
+
+    assert default_address() == r"\\.\pipe\winconfig-someone"
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+import yaml
+from loguru import logger
+
+from tests.conftest import FakeExecutor
+from winconfig.engine import Engine
+from winconfig.protocol.state_codes import EXIST
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    config = {
+        "Definitions": {
+            "Drift": {
+                "Partial": {
+                    "description": "One entry already set, one not.",
+                    "registries": [
+                        {
+                            "path": r"HKCU\Software\Drift",
+                            "entries": [
+                                {
+                                    "name": "Compliant",
+                                    "type": "DWord",
+                                    "new_value": "1",
+                                    "old_value": "0",
+                                },
+                                {
+                                    "name": "Drifted",
+                                    "type": "DWord",
+                                    "new_value": "1",
+                                    "old_value": "0",
+                                },
+                            ],
+                        }
+                    ],
+                },
+                "Done": {
+                    "description": "Already in the desired state.",
+                    "services": [
+                        {
+                            "name": "DriftService",
+                            "old_startup": "Manual",
+                            "new_startup": "Disabled",
+                        }
+                    ],
+                },
+            }
+        },
+        "Actions": {"Drift": {"Partial": "apply", "Done": "apply"}},
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    return path
+
+
+def test_only_changed_writes_drifted_items(config_path: Path):
+    executor = FakeExecutor(
+        outputs={
+            "Test-Path": EXIST,
+            '-Name "Compliant"': "1",
+            '-Name "Drifted"': "0",
+            "Get-Service": "Disabled",
+        }
+    )
+    engine = Engine(config_path, executor_factory=lambda: executor)
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, format="{message}", level="INFO")
+    try:
+        engine.run(reverse=False, only_changed=True)
+    finally:
+        logger.remove(handler_id)
+
+    read_script, *set_scripts = executor.scripts
+    assert read_script.count("#region") == 4
+    assert len(set_scripts) == 1
+    assert (
+        'Set-ItemProperty -Path "Registry::HKCU\\Software\\Drift" -Name "Drifted"'
+        in (set_scripts[0])
+    )
+    assert '"Compliant"' not in set_scripts[0]
+    assert "New-Item" not in set_scripts[0]
+    assert any(
+        r"Compliant: Drift > Partial[apply] HKCU\Software\Drift\Compliant" in m
+        for m in messages
+    )
+    assert any(m.strip() == "Compliant: Drift > Done[apply]" for m in messages)
+
+
+def test_unreadable_items_are_written(config_path: Path):
+    executor = FakeExecutor(failing=["Get-ItemPropertyValue"])
+    engine = Engine(config_path, executor_factory=lambda: executor)
+    engine.run(reverse=False, only_changed=True)
+
+    _, *set_scripts = executor.scripts
+    assert len(set_scripts) == 2
+    assert '"Compliant"' in set_scripts[0]
@@ -0,0 +1,116 @@
+from typing import Any
+
+from winconfig.config.action import ActionMode
+from winconfig.engine import Engine, Task
+from winconfig.engine.graph import Resource, TaskGraph
+
+
+def make_task(name: str, **definition: Any) -> Task:  # noqa: ANN401
+    return Task(
+        group_name="Test",
+        name=name,
+        mode=ActionMode.APPLY,
+        description=name,
+        **definition,
+    )
+
+
+def registry(path: str) -> dict[str, Any]:
+    return {"registries": [{"path": path}]}
+
+
+def test_same_registry_key_conflicts_across_aliases():
+    tasks = [
+        make_task("A", **registry(r"HKCU\Software\Foo")),
+        make_task("B", **registry(r"HKEY_CURRENT_USER:\software\foo")),
+        make_task("C", **registry(r"HKCU\Software\Bar")),
+    ]
+    graph = TaskGraph(tasks)
+
+    assert graph.wave_indices == [[0, 2], [1]]
+    assert graph.shared_resources == {
+        Resource("registry", r"hkcu\software\foo"): tasks[:2]
+    }
+
+
+def test_nested_registry_keys_conflict():
+    graph = TaskGraph(
+        [
+            make_task("Parent", **registry(r"HKCU\Software\Foo")),
+            make_task("Child", **registry(r"HKCU\Software\Foo\Bar")),
+            make_task("Sibling", **registry(r"HKCU\Software\FooBar")),
+        ]
+    )
+
+    assert graph.dependencies == [set(), {0}, set()]
+
+
+def test_service_and_schtask_conflicts():
+    graph = TaskGraph(
+        [
+            make_task(
+                "A",
+                services=[
+                    {
+                        "name": "WSearch",
+                        "old_startup": "Manual",
+                        "new_startup": "Disabled",
+                    }
+                ],
+            ),
+            make_task(
+                "B",
+                services=[
+                    {
+                        "name": "wsearch",
+                        "old_startup": "Manual",
+                        "new_startup": "Disabled",
+                    }
+                ],
+            ),
+            make_task(
+                "C",
+                services=[
+                    {"name": "WS*", "old_startup": "Manual", "new_startup": "Disabled"}
+                ],
+            ),
+            make_task(
+                "D",
+                scheduled_tasks=[
+                    {
+                        "full_path": r"Microsoft\Foo",
+                        "old_state": "Enabled",
+                        "new_state": "Disabled",
+                    }
+                ],
+            ),
+        ]
+    )
+
+    assert graph.dependencies == [set(), {0}, {0, 1}, set()]
+
+
+def test_scripts_are_exclusive_unless_declared_otherwise():
+    graph = TaskGraph(
+        [
+            make_task("A", **registry(r"HKCU\Software\Foo")),
+            make_task("Script", script={"apply": "Do-Something"}),
+            make_task("B", **registry(r"HKCU\Software\Bar")),
+            make_task("Free", script={"apply": "Do-Something", "exclusive": False}),
+        ]
+    )
+
+    assert graph.wave_indices == [[0], [1], [2, 3]]
+
+
+def test_engine_graph_covers_executable_tasks(engine: Engine):
+    graph = engine.graph()
+    executable_runs = [e for e in engine.plan(reverse=False) if e.executable]
+
+    assert [task.full_name for task in graph.tasks] == [
+        task_run.task.full_name for task_run in executable_runs
+    ]
+    assert sorted(i for wave in graph.wave_indices for i in wave) == list(
+        range(len(graph.tasks))
+    )
+    assert "waves" in graph.describe()
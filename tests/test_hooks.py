@@ -0,0 +1,139 @@
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+import pytest
+from loguru import logger
+
+from tests.conftest import SAMPLE_CONFIG_PATH, FakeExecutor
+from winconfig.engine import Engine
+from winconfig.engine.hooks import EngineHooks
+from winconfig.engine.report import RunReport
+from winconfig.engine.task import TaskRun
+from winconfig.exceptions import RunCancelledError
+
+
+class RecordingHooks(EngineHooks):
+    def __init__(self) -> None:
+        self.events: list[tuple[str, ...]] = []
+        self.invokes: list[tuple[int, int, int]] = []
+
+    def on_generate(
+        self, task_run: TaskRun, duration_ms: float, script_size: int
+    ) -> None:
+        assert duration_ms >= 0
+        assert script_size == len(task_run.script.encode())
+        self.events.append(("generate", task_run.task.full_name))
+
+    def on_task_start(self, task_run: TaskRun) -> None:
+        self.events.append(("start", task_run.task.full_name))
+
+    def on_invoke(
+        self,
+        task_runs: list[TaskRun],
+        duration_ms: float,
+        script_size: int,
+        output_size: int,
+    ) -> None:
+        assert duration_ms >= 0
+        self.invokes.append((len(task_runs), script_size, output_size))
+        self.events.append(("invoke", *(e.task.full_name for e in task_runs)))
+
+    def on_task_end(self, task_run: TaskRun, duration_ms: float) -> None:
+        assert duration_ms >= 0
+        self.events.append(("end", task_run.task.full_name))
+
+
+@pytest.fixture
+def hooks() -> RecordingHooks:
+    return RecordingHooks()
+
+
+@pytest.fixture
+def log_messages() -> Iterator[list[str]]:
+    messages: list[str] = []
+    sink_id = logger.add(messages.append, level="INFO", format="{message}")
+    yield messages
+    logger.remove(sink_id)
+
+
+def test_events_follow_task_order(hooks: RecordingHooks, fake_executor: FakeExecutor):
+    engine = Engine(
+        SAMPLE_CONFIG_PATH, executor_factory=lambda: fake_executor, hooks=[hooks]
+    )
+    task_runs = engine.plan(reverse=False)
+    executable = [e.task.full_name for e in task_runs if e.executable]
+    hooks.events.clear()
+    engine.run(reverse=False)
+
+    generated = [name for event, name, *_ in hooks.events if event == "generate"]
+    started = [name for event, name, *_ in hooks.events if event == "start"]
+    assert generated == executable
+    assert started == executable
+    assert len(hooks.invokes) == len(executable)
+    assert [size for _, size, _ in hooks.invokes] == [
+        len(script.encode()) for script in fake_executor.scripts
+    ]
+    for name in executable:
+        start = hooks.events.index(("start", name))
+        assert hooks.events[start + 1] == ("invoke", name)
+    assert [name for event, name, *_ in hooks.events if event == "end"] == [
+        e.task.full_name for e in task_runs
+    ]
+
+
+def test_batch_is_one_invocation(hooks: RecordingHooks, fake_executor: FakeExecutor):
+    engine = Engine(
+        SAMPLE_CONFIG_PATH, executor_factory=lambda: fake_executor, hooks=[hooks]
+    )
+    engine.run(reverse=False, batch=True)
+    executable = [e for e in engine.plan(reverse=False) if e.executable]
+
+    [(task_count, script_size, output_size)] = hooks.invokes
+    assert task_count == len(executable)
+    assert script_size == len(fake_executor.scripts[0].encode())
+    assert output_size > 0
+
+
+def test_default_hooks_log_outcomes(engine: Engine, log_messages: list[str]):
+    engine.run(reverse=False)
+
+    assert any(m.startswith("Success: Taskbar > HideSearch[") for m in log_messages)
+    assert any(m.startswith("Skipped: ") for m in log_messages)
+
+
+def test_custom_hooks_replace_logging(
+    hooks: RecordingHooks, fake_executor: FakeExecutor, log_messages: list[str]
+):
+    Engine(
+        SAMPLE_CONFIG_PATH, executor_factory=lambda: fake_executor, hooks=[hooks]
+    ).run(reverse=False)
+
+    assert not any(m.startswith("Success: ") for m in log_messages)
+
+
+class CancellingHooks(EngineHooks):
+    def __init__(self, cancel: threading.Event) -> None:
+        self.cancel = cancel
+
+    def on_task_end(self, task_run: TaskRun, duration_ms: float) -> None:  # noqa: ARG002
+        if task_run.executable:
+            self.cancel.set()
+
+
+def test_cancel_stops_at_task_boundary(fake_executor: FakeExecutor):
+    cancel = threading.Event()
+    engine = Engine(
+        SAMPLE_CONFIG_PATH,
+        executor_factory=lambda: fake_executor,
+        hooks=[CancellingHooks(cancel)],
+    )
+    run_report = RunReport(started_at=datetime.now(UTC))
+
+    with pytest.raises(RunCancelledError):
+        engine.run(reverse=False, report=run_report, cancel=cancel)
+
+    assert len(fake_executor.scripts) == 1
+    statuses = [task.status for task in run_report.tasks]
+    assert statuses.count("success") == 1
+    assert "not_run" in statuses
@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from tests.conftest import SAMPLE_CONFIG_PATH
+from winconfig.config.action import ActionMode
+from winconfig.config.config import Config
+from winconfig.config.layers import LayeredConfig
+from winconfig.engine import Engine
+from winconfig.exceptions import DefinitionGroupNotFoundError, DefinitionNotFoundError
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+
+@pytest.fixture
+def layer_paths(tmp_path: Path) -> list[Path]:
+    sample = yaml.safe_load(SAMPLE_CONFIG_PATH.read_text())
+    definitions = tmp_path / "definitions.yaml"
+    definitions.write_text(yaml.safe_dump({"Definitions": sample["Definitions"]}))
+    paths = [definitions]
+    for i, (group_name, group) in enumerate(sample["Actions"].items()):
+        path = tmp_path / f"{i:02}.yaml"
+        path.write_text(yaml.safe_dump({"Actions": {group_name: group}}))
+        paths.append(path)
+    override = tmp_path / "override.yaml"
+    override.write_text(
+        yaml.safe_dump({"Actions": {"Taskbar": {"HideSearch": "revert"}}})
+    )
+    return [*paths, override]
+
+
+def layered(paths: list[Path]) -> LayeredConfig:
+    paths = [BUILTIN_DEFINITION_PATH, *paths]
+    return LayeredConfig(zip(paths, Config.from_yaml_files(paths), strict=True))
+
+
+def full_merge(paths: list[Path]) -> Config:
+    return Config.from_yaml(BUILTIN_DEFINITION_PATH).merge_from_yaml(*paths)
+
+
+def assert_same_merge(layers: LayeredConfig, merged: Config) -> None:
+    assert layers.config.model_dump() == merged.model_dump()
+    assert list(layers.config.action_config.root) == list(merged.action_config.root)
+    for group_name, group in merged.action_config.root.items():
+        assert list(layers.config.action_config.root[group_name]) == list(group)
+
+
+def test_layers_match_full_merge(layer_paths: list[Path]):
+    assert_same_merge(layered(layer_paths), full_merge(layer_paths))
+
+
+def test_sources_name_deciding_layer(layer_paths: list[Path]):
+    layers = layered(layer_paths)
+
+    assert layers.action("Taskbar", "HideSearch") == ActionMode.REVERT
+    assert layers.action_sources("Taskbar", "HideSearch")[-1] == layer_paths[-1]
+    assert len(layers.action_sources("Taskbar", "HideSearch")) == 2
+    assert layers.definition_sources("Taskbar", "HideSearch") == [
+        BUILTIN_DEFINITION_PATH
+    ]
+    assert layers.action_sources("Taskbar", "NoSuchTask") == []
+
+
+def test_value_change_updates_in_place(layer_paths: list[Path]):
+    layers = layered(layer_paths)
+    taskbar = layers.config.action_config.root["Taskbar"]
+    layer_paths[-1].write_text(
+        yaml.safe_dump({"Actions": {"Taskbar": {"HideSearch": "skip"}}})
+    )
+    layers.set_layer(layer_paths[-1], Config.from_yaml(layer_paths[-1]))
+
+    assert layers.config.action_config.root["Taskbar"] is taskbar
+    assert layers.action("Taskbar", "HideSearch") == ActionMode.SKIP
+    assert_same_merge(layers, full_merge(layer_paths))
+
+
+def test_removed_entry_falls_back_to_lower_layer(layer_paths: list[Path]):
+    layers = layered(layer_paths)
+    layer_paths[-1].write_text(
+        yaml.safe_dump({"Actions": {"Desktop": {"HideRecycleBin": "revert"}}})
+    )
+    layers.set_layer(layer_paths[-1], Config.from_yaml(layer_paths[-1]))
+
+    assert layers.action("Taskbar", "HideSearch") == ActionMode.APPLY
+    assert layers.action_sources("Desktop", "HideRecycleBin")[-1] == layer_paths[-1]
+    assert_same_merge(layers, full_merge(layer_paths))
+
+
+def test_engine_reload(layer_paths: list[Path]):
+    engine = Engine(*layer_paths)
+    layer_paths[-1].write_text(
+        yaml.safe_dump({"Actions": {"Taskbar": {"HideSearch": "skip"}}})
+    )
+    engine.reload(layer_paths[-1])
+
+    task = next(
+        task
+        for group in engine.task_groups
+        for task in group.tasks
+        if task.full_name == "Taskbar > HideSearch"
+    )
+    assert task.mode == ActionMode.SKIP
+    assert engine.config.model_dump() == Engine(*layer_paths).config.model_dump()
+
+
+def test_invalid_reload_restores_layers(layer_paths: list[Path], tmp_path: Path):
+    engine = Engine(*layer_paths)
+    before = engine.config.model_dump()
+    layer_paths[-1].write_text(
+        yaml.safe_dump({"Actions": {"Taskbar": {"Unknown": "apply"}}})
+    )
+    added = tmp_path / "added.yaml"
+    added.write_text(yaml.safe_dump({"Actions": {"Unknown": {"Task": "apply"}}}))
+
+    with pytest.raises(DefinitionNotFoundError):
+        engine.reload(layer_paths[-1])
+    with pytest.raises(DefinitionGroupNotFoundError):
+        engine.reload(added)
+
+    assert engine.config.model_dump() == before
+    assert engine.task("Taskbar", "HideSearch").mode == ActionMode.REVERT
@@ -0,0 +1,117 @@
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+from loguru import logger
+
+from tests.conftest import SAMPLE_CONFIG_PATH, FakeExecutor
+from winconfig.engine import Engine
+from winconfig.engine.parallel import split_evenly
+from winconfig.exceptions import TaskError
+
+
+def run_and_collect_logs(engine: Engine, **kwargs: int | bool) -> list[str]:
+    messages: list[str] = []
+    handler_id = logger.add(messages.append, format="{message}", level="INFO")
+    try:
+        engine.run(reverse=False, **kwargs)  # ty:ignore[invalid-argument-type]
+    finally:
+        logger.remove(handler_id)
+    return [message.strip() for message in messages]
+
+
+def test_parallel_run_is_faster_than_sequential(tmp_path: Path):
+    # independent tasks only, so every task lands in the same wave
+    config = {
+        "Definitions": {
+            "Independent": {
+                f"Task{i}": {
+                    "description": f"Task {i}",
+                    "registries": [{"path": f"HKCU\\Software\\Test{i}"}],
+                }
+                for i in range(16)
+            }
+        },
+        "Actions": {"Independent": {f"Task{i}": "apply" for i in range(16)}},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    engine = Engine(config_path, executor_factory=lambda: FakeExecutor(delay=0.02))
+
+    start = time.perf_counter()
+    engine.run(reverse=False, jobs=1)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.run(reverse=False, jobs=4)
+    parallel = time.perf_counter() - start
+
+    assert len(engine.graph().wave_indices) == 1
+    assert parallel < sequential / 2
+
+
+def test_parallel_logs_keep_task_order():
+    engine = Engine(
+        SAMPLE_CONFIG_PATH, executor_factory=lambda: FakeExecutor(delay=0.001)
+    )
+
+    assert run_and_collect_logs(engine, jobs=4) == run_and_collect_logs(engine, jobs=1)
+    assert run_and_collect_logs(engine, jobs=4, batch=True) == run_and_collect_logs(
+        engine, jobs=1
+    )
+
+
+def test_parallel_pool_creates_one_executor_per_worker():
+    executors: list[FakeExecutor] = []
+
+    def executor_factory() -> FakeExecutor:
+        executors.append(FakeExecutor(delay=0.001))
+        return executors[-1]
+
+    engine = Engine(SAMPLE_CONFIG_PATH, executor_factory=executor_factory)
+    engine.run(reverse=False, jobs=3, batch=True)
+
+    assert 1 < len(executors) <= 3
+
+
+def test_parallel_failure_raises_task_error():
+    executor = FakeExecutor(failing=["SearchboxTaskbarMode"])
+    engine = Engine(SAMPLE_CONFIG_PATH, executor_factory=lambda: executor)
+
+    with pytest.raises(TaskError, match="Taskbar > HideSearch"):
+        engine.run(reverse=False, jobs=4)
+
+
+def test_parallel_failure_stops_before_the_next_wave(tmp_path: Path):
+    paths = {
+        "A": r"HKCU\Software\Foo",
+        "B": r"HKCU\Software\Foo",
+        "C": r"HKCU\Software\Bar",
+        "D": r"HKCU\Software\Bar\Child",
+    }
+    config = {
+        "Definitions": {
+            "Waves": {
+                name: {"description": name, "registries": [{"path": path}]}
+                for name, path in paths.items()
+            }
+        },
+        "Actions": {"Waves": dict.fromkeys(paths, "apply")},
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config))
+    executor = FakeExecutor(failing=['Software\\Bar"'])
+    engine = Engine(config_path, executor_factory=lambda: executor)
+
+    with pytest.raises(TaskError, match="Waves > C"):
+        engine.run(reverse=False, jobs=4)
+
+    # B and D conflict with A and C, so they wait for the wave after them
+    assert engine.graph().wave_indices == [[0, 2], [1, 3]]
+    assert not any("Child" in script for script in executor.scripts)
+
+
+def test_split_evenly():
+    assert split_evenly([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+    assert split_evenly([1], 3) == [[1]]
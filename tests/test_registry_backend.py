@@ -0,0 +1,178 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+import yaml
+
+from tests.conftest import FakeExecutor
+from winconfig.config.action import ActionMode
+from winconfig.config.definition import RegistryPathDefinition
+from winconfig.engine import Engine
+from winconfig.engine.registry import (
+    InMemoryRegistry,
+    RegistryKeyWrite,
+    registry_states,
+    registry_writes,
+)
+from winconfig.engine.report import RunReport
+from winconfig.protocol.state_codes import EXIST, NOT_EXIST
+
+KEY_PATH = r"HKCU\Software\Backend"
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    config = {
+        "Definitions": {
+            "Backend": {
+                "Values": {
+                    "description": "Two entries under one key.",
+                    "registries": [
+                        {
+                            "path": KEY_PATH,
+                            "entries": [
+                                {
+                                    "name": "Number",
+                                    "type": "DWord",
+                                    "new_value": "1",
+                                    "old_value": "0",
+                                },
+                                {
+                                    "name": "Text",
+                                    "type": "String",
+                                    "new_value": "on",
+                                    "old_value": NOT_EXIST,
+                                },
+                            ],
+                        }
+                    ],
+                },
+                "Script": {
+                    "description": "A custom script.",
+                    "script": {"apply": "Write-Output 'custom'", "revert": ""},
+                },
+                "Removed": {
+                    "description": "A key that is removed.",
+                    "registries": [
+                        {
+                            "path": rf"{KEY_PATH}\Removed",
+                            "old_existence": EXIST,
+                            "new_existence": NOT_EXIST,
+                        }
+                    ],
+                },
+            }
+        },
+        "Actions": {
+            "Backend": {"Values": "apply", "Script": "apply", "Removed": "apply"}
+        },
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    return path
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_registry_items_bypass_powershell(config_path: Path, *, batch: bool):
+    executor = FakeExecutor()
+    registry = InMemoryRegistry({rf"{KEY_PATH}\Removed\Child": {"Value": "1"}})
+    engine = Engine(
+        config_path, executor_factory=lambda: executor, registry_backend=registry
+    )
+    engine.run(reverse=False, batch=batch)
+
+    (script,) = executor.scripts
+    assert "custom" in script
+    assert "ItemProperty" not in script
+    assert registry.keys[KEY_PATH.casefold()] == {"Number": "1", "Text": "on"}
+    assert not any(
+        key.startswith(rf"{KEY_PATH}\removed".casefold()) for key in registry.keys
+    )
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_registry_only_tasks_are_reported_as_run(config_path: Path, *, batch: bool):
+    engine = Engine(
+        config_path,
+        executor_factory=FakeExecutor,
+        registry_backend=InMemoryRegistry(),
+    )
+    run_report = RunReport(started_at=datetime.now(UTC))
+    engine.run(reverse=False, batch=batch, report=run_report)
+
+    statuses = {task.name: task.status for task in run_report.tasks}
+    assert {
+        name: statuses[name] for name in statuses if name.startswith("Backend >")
+    } == {
+        "Backend > Values": "success",
+        "Backend > Script": "success",
+        "Backend > Removed": "success",
+    }
+
+
+def test_revert_removes_values(config_path: Path):
+    registry = InMemoryRegistry({KEY_PATH: {"number": "1", "TEXT": "on"}})
+    engine = Engine(
+        config_path, executor_factory=FakeExecutor, registry_backend=registry
+    )
+    engine.run(reverse=True)
+
+    assert registry.keys[KEY_PATH.casefold()] == {"Number": "0"}
+
+
+def test_only_changed_reads_registry_through_backend(config_path: Path):
+    executor = FakeExecutor()
+    registry = InMemoryRegistry({KEY_PATH: {"Number": "1", "Text": "off"}})
+    engine = Engine(
+        config_path, executor_factory=lambda: executor, registry_backend=registry
+    )
+    engine.run(reverse=False, only_changed=True)
+
+    assert registry.reads == 2
+    assert registry.writes == 1
+    assert registry.keys[KEY_PATH.casefold()] == {"Number": "1", "Text": "on"}
+    assert ["custom" in script for script in executor.scripts] == [True]
+
+
+def test_registry_writes_group_entries_by_key(config_path: Path):
+    engine = Engine(config_path)
+    task = engine.task_groups[-1].tasks[0]
+
+    assert registry_writes(task.items, ActionMode.REVERT) == [
+        RegistryKeyWrite(
+            path=KEY_PATH,
+            existence=EXIST,
+            values={"Number": ("DWord", "0")},
+            removed_values=["Text"],
+        )
+    ]
+
+
+def test_values_of_missing_key_are_skipped():
+    registry = InMemoryRegistry()
+    registry.write_keys(
+        [RegistryKeyWrite(path=KEY_PATH, values={"Number": ("DWord", "1")})]
+    )
+    assert registry.keys == {}
+
+    registry.write_keys([RegistryKeyWrite(path=KEY_PATH, existence=EXIST)])
+    assert registry.keys == {"hkcu": {}, r"hkcu\software": {}, KEY_PATH.casefold(): {}}
+
+
+def test_multi_string_compliance_compares_elements():
+    (entry,) = RegistryPathDefinition(
+        path=KEY_PATH,
+        entries=[
+            {
+                "name": "Paths",
+                "type": "MultiString",
+                "new_value": ["a b", "c"],
+                "old_value": NOT_EXIST,
+            }
+        ],
+    ).entries
+
+    for values, compliant in ((["a b", "c"], True), (["a", "b c"], False)):
+        registry = InMemoryRegistry({KEY_PATH: {"Paths": values}})
+        (state,) = registry_states(registry, [entry])
+        assert entry.is_compliant(state, ActionMode.APPLY) == compliant
@@ -0,0 +1,38 @@
+import pytest
+
+from winconfig.config.definition import (
+    RegistryPathDefinition,
+    normalize_registry_path,
+    registry_path_key,
+)
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        (r"HKCU\Software\Foo", r"HKCU\Software\Foo"),
+        (r"HKEY_CURRENT_USER\Software\Foo", r"HKCU\Software\Foo"),
+        (r"hkey_local_machine\SOFTWARE", r"HKLM\SOFTWARE"),
+        (r"HKLM:\SOFTWARE", r"HKLM\SOFTWARE"),
+        (r"Registry::HKEY_CLASSES_ROOT\*\shell", r"HKCR\*\shell"),
+        (r"registry::hku:\.DEFAULT", r"HKU\.DEFAULT"),
+        (r"HKEY_CURRENT_CONFIG\System", r"HKCC\System"),
+        (r"HKCUX\Software", r"HKCUX\Software"),
+        (r"Software\HKCU\Foo", r"Software\HKCU\Foo"),
+        (r"Registry::Unknown\Foo", r"Registry::Unknown\Foo"),
+    ],
+)
+def test_normalize_registry_path(path: str, expected: str):
+    assert normalize_registry_path(path) == expected
+    assert RegistryPathDefinition(path=path).path == expected
+
+
+def test_path_key_is_shared_by_every_spelling():
+    spellings = [
+        r"HKCU\Software\Foo",
+        r"HKEY_CURRENT_USER\software\FOO",
+        "Registry::hkcu:\\Software\\Foo\\",
+    ]
+
+    assert {registry_path_key(path) for path in spellings} == {r"hkcu\software\foo"}
+    assert RegistryPathDefinition(path=spellings[1]).path_key == r"hkcu\software\foo"
@@ -0,0 +1,107 @@
+import json
+import threading
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import SAMPLE_CONFIG_PATH, FakeExecutor
+from winconfig.engine import Engine
+from winconfig.engine.report import RunReport
+from winconfig.engine.timing import recording, timed
+from winconfig.exceptions import TaskError
+
+
+@pytest.fixture
+def run_report() -> RunReport:
+    return RunReport(started_at=datetime.now(UTC))
+
+
+def test_report_times_every_task(engine: Engine, run_report: RunReport):
+    engine.run(reverse=False, report=run_report)
+
+    assert {"config_load", "validation", "plan", "execute", "run"} <= set(
+        run_report.phases
+    )
+    statuses = {task.status for task in run_report.tasks}
+    assert statuses <= {"success", "skipped", "no_action"}
+    for task in run_report.tasks:
+        if task.status == "success":
+            assert "generate" in task.timings
+            assert "execute" in task.timings
+            assert task.script_bytes > 0
+            assert task.items
+    assert run_report.item_types["registry_value"]["items"] > 0
+
+
+def test_batch_timings_are_reported_once(engine: Engine, run_report: RunReport):
+    engine.run(reverse=False, batch=True, report=run_report)
+
+    assert len(run_report.batches) == 1
+    batched = [task for task in run_report.tasks if task.batch == 0]
+    assert [task.name for task in batched] == run_report.batches[0].tasks
+    assert all(task.status == "success" for task in batched)
+    assert "execute" in run_report.batches[0].timings
+
+
+def test_failed_run_still_reports(run_report: RunReport):
+    executor = FakeExecutor(failing=["SearchboxTaskbarMode"])
+    engine = Engine(SAMPLE_CONFIG_PATH, executor_factory=lambda: executor)
+
+    with pytest.raises(TaskError):
+        engine.run(reverse=False, report=run_report)
+
+    statuses = {task.name: task.status for task in run_report.tasks}
+    assert statuses["Taskbar > HideSearch"] == "failed"
+    assert "not_run" in statuses.values()
+
+
+def test_report_formats(engine: Engine, run_report: RunReport, tmp_path: Path):
+    engine.run(reverse=False, report=run_report)
+    run_report.write(tmp_path / "report.json")
+    run_report.write(tmp_path / "report.jsonl")
+
+    document = json.loads((tmp_path / "report.json").read_text())
+    lines = [
+        json.loads(line)
+        for line in (tmp_path / "report.jsonl").read_text().splitlines()
+    ]
+    assert lines[0]["type"] == "run"
+    assert lines[0]["item_types"] == document["item_types"]
+    assert [line["name"] for line in lines[1:]] == [
+        task["name"] for task in document["tasks"]
+    ]
+
+
+def test_slowest_table(engine: Engine, run_report: RunReport):
+    engine.run(reverse=False, report=run_report)
+    table = run_report.describe_slowest(3).splitlines()
+
+    assert table[0].split() == [
+        "Task",
+        "Status",
+        "Items",
+        "Generate",
+        "Execute",
+        "Total",
+    ]
+    assert len(table) == 4
+
+
+def test_recording_is_local_to_thread():
+    outer: dict[str, float] = {}
+    inner: dict[str, float] = {}
+
+    def work() -> None:
+        with recording(inner), timed("thread"):
+            pass
+
+    with recording(outer), timed("main"):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    with timed("unrecorded"):
+        pass
+
+    assert set(outer) == {"main"}
+    assert set(inner) == {"thread"}
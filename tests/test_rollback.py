@@ -0,0 +1,178 @@
+import io
+from pathlib import Path
+from typing import Literal
+
+import pytest
+import yaml
+
+from tests.conftest import FakeExecutor
+from winconfig.config.definition import HELPERS_PRELUDE, RegistryPathDefinition
+from winconfig.engine import Engine
+from winconfig.engine.registry import InMemoryRegistry
+from winconfig.engine.snapshot import (
+    SnapshotItem,
+    load_snapshot,
+    open_atomic,
+    read_snapshot,
+    restore_snapshot,
+    write_snapshot,
+)
+from winconfig.exceptions import RollbackError
+from winconfig.protocol.state_codes import EXIST, NOT_EXIST, UNREADABLE
+
+
+@pytest.fixture
+def config_path(tmp_path: Path) -> Path:
+    config = {
+        "Definitions": {
+            "Rollback": {
+                "Changed": {
+                    "description": "Two entries under one key.",
+                    "registries": [
+                        {
+                            "path": r"HKCU\Software\Rollback",
+                            "entries": [
+                                {
+                                    "name": name,
+                                    "type": "DWord",
+                                    "new_value": "1",
+                                    "old_value": "0",
+                                }
+                                for name in ("First", "Second")
+                            ],
+                        }
+                    ],
+                },
+                "Untouched": {
+                    "description": "Not part of the run.",
+                    "registries": [{"path": r"HKCU\Software\Untouched"}],
+                },
+            }
+        },
+        "Actions": {"Rollback": {"Changed": "apply", "Untouched": "skip"}},
+    }
+    path = tmp_path / "config.yaml"
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    return path
+
+
+def test_run_saves_snapshot_of_changed_items(config_path: Path, tmp_path: Path):
+    executor = FakeExecutor(outputs={"Get-Item ": '{"first":"7"}'})
+    engine = Engine(config_path, executor_factory=lambda: executor)
+    snapshot_path = tmp_path / "before.json"
+    engine.run(reverse=False, snapshot_path=snapshot_path)
+
+    items = load_snapshot(snapshot_path.read_text(), "json")
+    assert items == [
+        SnapshotItem(kind="registry_key", path=r"HKCU\Software\Rollback", value=EXIST),
+        SnapshotItem(
+            kind="registry_value",
+            path=r"HKCU\Software\Rollback",
+            name="First",
+            type="DWord",
+            value="7",
+        ),
+        SnapshotItem(
+            kind="registry_value",
+            path=r"HKCU\Software\Rollback",
+            name="Second",
+            type="DWord",
+            value=NOT_EXIST,
+        ),
+    ]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_only_changed_snapshot_skips_compliant_items(config_path: Path, tmp_path: Path):
+    executor = FakeExecutor(
+        outputs={"Test-Path": EXIST, '-Name "First"': "1", "Get-Item ": "{}"}
+    )
+    engine = Engine(config_path, executor_factory=lambda: executor)
+    snapshot_path = tmp_path / "before.yaml"
+    engine.run(reverse=False, only_changed=True, snapshot_path=snapshot_path)
+
+    items = load_snapshot(snapshot_path.read_text(), "yaml")
+    assert [(item.kind, item.name) for item in items] == [("registry_value", "Second")]
+
+
+def test_restore_snapshot_writes_recorded_values(fake_executor: FakeExecutor):
+    restore_snapshot(
+        fake_executor,
+        [
+            SnapshotItem(
+                kind="registry_key", path=r"HKCU\Software\Gone", value=NOT_EXIST
+            ),
+            SnapshotItem(
+                kind="registry_value",
+                path=r"HKCU\Software\Kept",
+                name="Value",
+                type="DWord",
+                value="7",
+            ),
+            SnapshotItem(kind="service", path="WSearch", value="Manual"),
+            SnapshotItem(kind="service", path="Missing", value=NOT_EXIST),
+            SnapshotItem(kind="service", path="Unread", value=UNREADABLE),
+        ],
+    )
+
+    (script,) = fake_executor.scripts
+    assert script.count("#region") == 3
+    assert script.startswith(HELPERS_PRELUDE)
+    assert "Set-WcRegKey 'Registry::HKCU\\Software\\Gone' $false" in script
+    assert "Set-WcRegValue 'Registry::HKCU\\Software\\Kept' 'Value' DWord '7'" in script
+    assert "Set-WcRegKey 'Registry::HKCU\\Software\\Kept'" not in script
+    assert "Set-WcSvc 'WSearch' Manual" in script
+    assert "Missing" not in script
+    assert "Unread" not in script
+
+
+@pytest.mark.parametrize("fmt", ["json", "yaml"])
+def test_multi_string_is_restored_element_by_element(
+    fake_executor: FakeExecutor, fmt: Literal["json", "yaml"]
+):
+    registry_path = RegistryPathDefinition(
+        path=r"HKCU\Software\Kept",
+        entries=[
+            {"name": "Paths", "type": "MultiString", "old_value": "", "new_value": ""}
+        ],
+    )
+    registry = InMemoryRegistry({registry_path.path: {"Paths": ["a b", "c"]}})
+    stream = io.StringIO()
+    write_snapshot(
+        read_snapshot(registry_path.entries, registry, fake_executor), stream, fmt
+    )
+
+    (item,) = load_snapshot(stream.getvalue(), fmt)
+    assert item.value == ["a b", "c"]
+
+    restore_snapshot(fake_executor, [item])
+
+    (script,) = fake_executor.scripts
+    assert (
+        "Set-WcRegValue 'Registry::HKCU\\Software\\Kept' 'Paths' MultiString "
+        "([string[]]@('a b', 'c'))"
+    ) in script
+
+
+def test_restore_snapshot_reports_failures():
+    executor = FakeExecutor(failing=["WSearch"])
+    with pytest.raises(RollbackError, match="WSearch"):
+        restore_snapshot(
+            executor, [SnapshotItem(kind="service", path="WSearch", value="Manual")]
+        )
+
+
+def test_open_atomic_keeps_original_on_failure(tmp_path: Path):
+    path = tmp_path / "snapshot.json"
+    path.write_text("original")
+
+    def write_partially() -> None:
+        with open_atomic(path) as stream:
+            stream.write("partial")
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write_partially()
+
+    assert path.read_text() == "original"
+    assert list(tmp_path.iterdir()) == [path]
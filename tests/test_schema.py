@@ -0,0 +1,73 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.conftest import SAMPLE_CONFIG_PATH
+from winconfig.cli import schema
+from winconfig.cli.cli_utils import handle_output
+from winconfig.config.config import Config
+from winconfig.engine import Engine
+from winconfig.resources import BUILTIN_DEFINITION_PATH
+
+
+def test_config_schema_is_generated_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    generated: list[type] = []
+    generate_schema = schema.generate_schema
+
+    def recording_generate_schema(model_type: type[Config]) -> dict:
+        generated.append(model_type)
+        return generate_schema(model_type)
+
+    monkeypatch.setattr(schema, "generate_schema", recording_generate_schema)
+    cold = schema.config_schema(tmp_path)
+    warm = schema.config_schema(tmp_path)
+
+    assert generated == [Config]
+    assert warm == cold == generate_schema(Config)
+
+
+def test_stale_config_schema_is_regenerated(tmp_path: Path):
+    (tmp_path / "config.schema.json").write_text('{"version": "old", "schema": {}}')
+
+    assert schema.config_schema(tmp_path) == schema.generate_schema(Config)
+
+
+def test_actions_name_every_definition():
+    paths = [BUILTIN_DEFINITION_PATH, SAMPLE_CONFIG_PATH]
+    actions = schema.actions_schema(
+        (Config.from_yaml(path).definition_config for path in paths), strict=True
+    )
+
+    engine = Engine(SAMPLE_CONFIG_PATH, validate=False)
+    assert {
+        group_name: list(group["properties"])
+        for group_name, group in actions["properties"].items()
+    } == {
+        task_group.name: [task.name for task in task_group.tasks]
+        for task_group in engine.task_groups
+    }
+    assert actions["additionalProperties"] is False
+
+
+def test_unchanged_output_is_not_rewritten(tmp_path: Path):
+    path = tmp_path / "schema.json"
+    handle_output("{}", str(path))
+    os.utime(path, ns=(0, 0))
+    handle_output("{}", str(path))
+
+    assert path.stat().st_mtime_ns == 0
+    handle_output("[]", str(path))
+    assert path.read_text() == "[]"
+
+
+def test_reformatted_json_output_is_not_rewritten(tmp_path: Path):
+    path = tmp_path / "schema.json"
+    path.write_text('{"enum": ["apply", "revert"]}')
+    os.utime(path, ns=(0, 0))
+    handle_output(json.dumps({"enum": ["apply", "revert"]}, indent=2), str(path))
+
+    assert path.stat().st_mtime_ns == 0
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+from winconfig.config.action import ActionMode
+from winconfig.engine import Engine
+from winconfig.engine.script_cache import ScriptCache, script_key
+
+
+def test_cache_returns_generated_script(engine: Engine):
+    cache = ScriptCache()
+    task = engine.task_groups[0].tasks[0]
+
+    script = cache.get(task, ActionMode.APPLY)
+
+    assert script == task.generate_script(ActionMode.APPLY).strip()
+    assert cache.get(task, ActionMode.APPLY) is script
+    assert len(cache) == 1
+
+
+def test_key_depends_on_body_and_mode_only(engine: Engine):
+    task = engine.task_groups[0].tasks[0]
+    renamed = task.model_copy(update={"name": "Renamed", "mode": ActionMode.SKIP})
+    changed = task.model_copy(update={"description": "Changed"})
+
+    assert script_key(task, ActionMode.APPLY) == script_key(renamed, ActionMode.APPLY)
+    assert script_key(task, ActionMode.APPLY) != script_key(task, ActionMode.REVERT)
+    assert script_key(task, ActionMode.APPLY) != script_key(changed, ActionMode.APPLY)
+
+
+def test_cache_evicts_least_recently_used(engine: Engine):
+    cache = ScriptCache(max_size=2)
+    first, second, third = [t for group in engine.task_groups for t in group.tasks][:3]
+
+    cache.get(first, ActionMode.APPLY)
+    cache.get(second, ActionMode.APPLY)
+    cache.get(first, ActionMode.APPLY)
+    cache.get(third, ActionMode.APPLY)
+
+    cached_keys = set(cache._scripts)  # noqa: SLF001
+    assert cached_keys == {
+        script_key(first, ActionMode.APPLY),
+        script_key(third, ActionMode.APPLY),
+    }
+
+
+def test_cache_persists_to_disk(engine: Engine, tmp_path: Path):
+    path = tmp_path / "cache.json"
+    cache = ScriptCache(path=path)
+    engine.script_cache = cache
+    task_runs = engine.plan(reverse=False)
+
+    reloaded = ScriptCache(path=path)
+    assert len(reloaded) == len(cache) == len([e for e in task_runs if e.executable])
+
+    engine.script_cache = reloaded
+    assert [e.script for e in engine.plan(reverse=False)] == [
+        e.script for e in task_runs
+    ]
+
+
+def test_unreadable_cache_file_is_ignored(tmp_path: Path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+
+    assert len(ScriptCache(path=path)) == 0
@@ -0,0 +1,45 @@
+import pytest
+
+from winconfig.engine import Engine
+from winconfig.engine.selection import TaskSelection
+from winconfig.exceptions import DefinitionGroupNotFoundError
+
+
+def test_empty_selection_selects_everything(engine: Engine):
+    keys = engine.select(TaskSelection())
+
+    assert not TaskSelection()
+    assert keys == [task.key for group in engine.task_groups for task in group.tasks]
+
+
+def test_groups_and_name_globs(engine: Engine):
+    keys = engine.select(TaskSelection(groups=["Taskbar"], names=["Hide*"]))
+
+    assert keys == [
+        ("Taskbar", "HideSearch"),
+        ("Taskbar", "HideTaskView"),
+        ("Taskbar", "HideWidgets"),
+    ]
+
+
+def test_tags_narrow_groups(engine: Engine):
+    privacy = engine.select(TaskSelection(tags=["privacy"]))
+    start_menu = engine.select(TaskSelection(groups=["StartMenu"], tags=["privacy"]))
+
+    assert ("StartMenu", "DisableBingSearch") in privacy
+    assert ("FileExplorer", "HideRecentFiles") in privacy
+    assert start_menu == [key for key in privacy if key[0] == "StartMenu"]
+    assert engine.select(TaskSelection(tags=["unknown"])) == []
+
+
+def test_unknown_group(engine: Engine):
+    with pytest.raises(DefinitionGroupNotFoundError):
+        engine.select(TaskSelection(groups=["Unknown"]))
+
+
+def test_selection_builds_only_selected_tasks(engine: Engine):
+    keys = engine.select(TaskSelection(groups=["Taskbar"], names=["HideSearch"]))
+    task_runs = engine.plan(reverse=False, tasks=keys)
+
+    assert [task_run.task.key for task_run in task_runs] == keys
+    assert list(engine._tasks) == keys  # noqa: SLF001
@@ -0,0 +1,80 @@
+import io
+
+import pytest
+
+from tests.conftest import FakeExecutor
+from winconfig.config.definition import SchtaskDefinition, ServiceDefinition
+from winconfig.engine import Engine
+from winconfig.engine.registry import InMemoryRegistry, PowershellRegistryReader
+from winconfig.engine.snapshot import (
+    SnapshotFormat,
+    SnapshotRequest,
+    definition_items,
+    load_snapshot,
+    read_snapshot,
+    snapshot_format,
+)
+from winconfig.protocol.state_codes import EXIST, NOT_EXIST, UNREADABLE
+
+PERSONALIZE_PATH = r"HKCU\Software\Microsoft\Windows\CurrentVersion\Themes\Personalize"
+
+
+@pytest.mark.parametrize("fmt", ["json", "yaml"])
+def test_snapshot_reads_each_key_once(
+    engine: Engine, fake_executor: FakeExecutor, fmt: SnapshotFormat
+):
+    registry = InMemoryRegistry(
+        {PERSONALIZE_PATH.lower(): {"systemuseslighttheme": "0"}}
+    )
+    stream = io.StringIO()
+    count = engine.snapshot(stream, fmt, registry_reader=registry)
+    items = load_snapshot(stream.getvalue(), fmt)
+    request = SnapshotRequest(definition_items(engine.config.definition_config))
+
+    assert count == len(items) == len(request)
+    assert registry.reads == len(request.registry_entries)
+    assert len(fake_executor.scripts) == (1 if request.others else 0)
+
+    personalize = [item for item in items if item.path == PERSONALIZE_PATH]
+    assert personalize[0].kind == "registry_key"
+    assert personalize[0].value == EXIST
+    values = {item.name: item.value for item in personalize[1:]}
+    assert values == {"SystemUsesLightTheme": "0", "AppsUseLightTheme": NOT_EXIST}
+
+
+def test_unreadable_states_are_recorded_apart():
+    items = [
+        ServiceDefinition(name="WSearch", old_startup="Manual", new_startup="Disabled"),
+        ServiceDefinition(name="Missing", old_startup="Manual", new_startup="Disabled"),
+        SchtaskDefinition(
+            full_path=r"\Microsoft\Broken", old_state="Enabled", new_state="Disabled"
+        ),
+    ]
+    executor = FakeExecutor(outputs={'"WSearch"': "Manual", '"Missing"': NOT_EXIST})
+    snapshot = read_snapshot(items, InMemoryRegistry(), executor)
+
+    assert {item.path: item.value for item in snapshot} == {
+        "WSearch": "Manual",
+        "Missing": NOT_EXIST,
+        r"\Microsoft\Broken": UNREADABLE,
+    }
+
+
+def test_empty_snapshot_round_trips():
+    assert load_snapshot("[]\n", "json") == []
+    assert load_snapshot("[]\n", "yaml") == []
+
+
+def test_snapshot_format_follows_extension():
+    assert snapshot_format("snapshot.JSON") == "json"
+    assert snapshot_format("snapshot.yaml") == "yaml"
+    assert snapshot_format(None) == "yaml"
+
+
+def test_powershell_reader_batches_keys(fake_executor: FakeExecutor):
+    reader = PowershellRegistryReader(fake_executor, keys_per_invocation=2)
+    paths = [rf"HKCU\Software\Key{i}" for i in range(5)]
+    results = dict(reader.read_keys(paths))
+
+    assert len(fake_executor.scripts) == 3
+    assert results == {path: {} for path in paths}
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import yaml
+
+from tests.conftest import SAMPLE_CONFIG_PATH
+from winconfig.config.action import ActionMode
+from winconfig.engine import Engine
+
+
+def test_task_groups_are_built_once(engine: Engine):
+    task_groups = engine.task_groups
+
+    assert engine.task_groups is task_groups
+    task = task_groups[0].tasks[0]
+    assert engine.task(task.group_name, task.name) is task
+
+
+def test_tasks_share_definition_bodies(engine: Engine):
+    task = engine.task("Taskbar", "HideSearch")
+    definition_body = engine.config.definition_config.root["Taskbar"]["HideSearch"]
+
+    assert task.registries is definition_body.registries
+    assert task.script is definition_body.script
+
+
+def test_set_mode_updates_task_in_place(engine: Engine):
+    task = engine.task("Taskbar", "HideSearch")
+    engine.set_mode("Taskbar", "HideSearch", ActionMode.SKIP)
+
+    assert engine.task("Taskbar", "HideSearch") is task
+    assert task.mode == ActionMode.SKIP
+    assert engine.config.action_config.root["Taskbar"]["HideSearch"] == ActionMode.SKIP
+    assert "Taskbar > HideSearch" not in [
+        e.task.full_name for e in engine.plan(reverse=False) if e.executable
+    ]
+
+
+def test_reload_rebuilds_tasks(engine: Engine, tmp_path: Path):
+    task_groups = engine.task_groups
+    override = tmp_path / "override.yaml"
+    override.write_text(
+        yaml.safe_dump({"Actions": {"Taskbar": {"HideSearch": "revert"}}})
+    )
+    engine.reload(override)
+
+    assert engine.task_groups is not task_groups
+    assert engine.task("Taskbar", "HideSearch").mode == ActionMode.REVERT
+    assert Engine(SAMPLE_CONFIG_PATH).task("Taskbar", "HideSearch").mode == (
+        ActionMode.APPLY
+    )
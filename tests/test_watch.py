@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+import yaml
+
+from tests.conftest import FakeExecutor
+from winconfig.engine import Engine
+from winconfig.engine.watch import ConfigWatch
+
+
+@pytest.fixture
+def config_watch(
+    sample_config_path: Path, recording_executor_factory: Callable[[], FakeExecutor]
+) -> ConfigWatch:
+    return ConfigWatch(
+        Engine(sample_config_path, executor_factory=recording_executor_factory),
+        [sample_config_path],
+    )
+
+
+def edit(path: Path, edit_config: Callable[[dict], None]) -> None:
+    config = yaml.safe_load(path.read_text())
+    edit_config(config)
+    stat = path.stat()
+    path.write_text(yaml.safe_dump(config, sort_keys=False))
+    # a write within the mtime granularity must still be noticed
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_mode_change_runs_only_that_task(
+    config_watch: ConfigWatch, sample_config_path: Path, executors: list[FakeExecutor]
+):
+    def revert_hide_search(config: dict) -> None:
+        config["Actions"]["Taskbar"]["HideSearch"] = "revert"
+
+    edit(sample_config_path, revert_hide_search)
+
+    assert config_watch.apply_changes() == {("Taskbar", "HideSearch")}
+    assert len(executors[0].scripts) == 1
+    assert "SearchboxTaskbarMode" in executors[0].scripts[0]
+
+
+def test_definition_change_is_detected(
+    config_watch: ConfigWatch, sample_config_path: Path, executors: list[FakeExecutor]
+):
+    def change_definition(config: dict) -> None:
+        group_name, group = next(iter(config["Definitions"].items()))
+        name, body = next(iter(group.items()))
+        body["description"] = "changed"
+        config["Actions"].setdefault(group_name, {})[name] = "apply"
+
+    edit(sample_config_path, change_definition)
+    changed = config_watch.apply_changes()
+
+    assert len(changed) == 1
+    assert executors
+
+
+def test_unchanged_tasks_do_not_run(
+    config_watch: ConfigWatch, sample_config_path: Path, executors: list[FakeExecutor]
+):
+    edit(sample_config_path, lambda _: None)
+
+    assert config_watch.apply_changes() == set()
+    assert not executors
+
+
+def test_invalid_edit_keeps_watching(
+    config_watch: ConfigWatch, sample_config_path: Path, executors: list[FakeExecutor]
+):
+    def add_unknown_task(config: dict) -> None:
+        config["Actions"]["Taskbar"]["NoSuchTask"] = "apply"
+
+    def revert_hide_search(config: dict) -> None:
+        del config["Actions"]["Taskbar"]["NoSuchTask"]
+        config["Actions"]["Taskbar"]["HideSearch"] = "revert"
+
+    edit(sample_config_path, add_unknown_task)
+    assert config_watch.apply_changes() == set()
+
+    edit(sample_config_path, revert_hide_search)
+    assert config_watch.apply_changes() == {("Taskbar", "HideSearch")}
+    assert len(executors) == 1
+
+
+def test_failed_tasks_run_again_on_next_change(
+    config_watch: ConfigWatch,
+    sample_config_path: Path,
+    executors: list[FakeExecutor],
+    failing: list[str],
+):
+    def revert_hide_search_and_task_view(config: dict) -> None:
+        config["Actions"]["Taskbar"]["HideSearch"] = "revert"
+        config["Actions"]["Taskbar"]["HideTaskView"] = "revert"
+
+    def revert_hide_widgets(config: dict) -> None:
+        config["Actions"]["Taskbar"]["HideWidgets"] = "revert"
+
+    failing.append("SearchboxTaskbarMode")
+    edit(sample_config_path, revert_hide_search_and_task_view)
+    config_watch.apply_changes()
+    assert len(executors[0].scripts) == 1
+
+    failing.clear()
+    edit(sample_config_path, revert_hide_widgets)
+
+    assert config_watch.apply_changes() == {
+        ("Taskbar", "HideSearch"),
+        ("Taskbar", "HideTaskView"),
+        ("Taskbar", "HideWidgets"),
+    }
+    assert len(executors[0].scripts) == 4
+
+    edit(sample_config_path, lambda _: None)
+    assert config_watch.apply_changes() == set()
+
+
+def wait_for_scripts(executors: list[FakeExecutor], count: int) -> None:
+    deadline = time.monotonic() + 5
+    while sum(len(e.scripts) for e in executors) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_watch_reuses_one_executor(
+    config_watch: ConfigWatch, sample_config_path: Path, executors: list[FakeExecutor]
+):
+    # the first run applies every task before watching
+    count = sum(e.executable for e in config_watch.engine.plan(reverse=False))
+    config_watch.interval = 0.01
+    thread = threading.Thread(target=config_watch.watch)
+    thread.start()
+    try:
+        wait_for_scripts(executors, count)
+        for mode in ("revert", "apply"):
+
+            def set_mode(config: dict, mode: str = mode) -> None:
+                config["Actions"]["Taskbar"]["HideSearch"] = mode
+
+            edit(sample_config_path, set_mode)
+            count += 1
+            wait_for_scripts(executors, count)
+    finally:
+        config_watch.stop()
+        thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert len(executors) == 1